@@ -6,192 +6,97 @@ Created on Mon May 14 17:29:16 2018
 """
 from __future__ import division
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+import pathway_inputs
+
+paths = ['Path66','Path46','Path61','Path42','Path24','Path45']
+# paths with a minimum flow; Path46 is renamed to its SCE share
+lines = ['Path66','Path46_SCE','Path61','Path42']
+export_paths = ['Path42','Path24','Path45','Path66']
+zones = ['PGE_valley','SCE']
+# daily hydropower -> zonal hydropower
+hydro_factor = np.array([0.837,0.8016])
+
+
+def hourly(profile,daily):
+
+    # (years x 365) daily amounts spread with a (365 x 24) profile -> (years x 8760)
+    return (profile[None,:365,:]*daily[:,:,None]).reshape(len(daily),-1)
+
+
+def transform(inputs,years):
+
+    # exchange and hydropower time series of several synthetic years at once,
+    # as (years x days x columns) and (years x hours x columns) arrays
+    flows = pathway_inputs.block(inputs,'pathflows',years,365,[p + '_sim' for p in paths])
+
+    # select dispatchable imports (positive flow days); Path42 imports are
+    # flows in the negative direction, Path46 is mapped to its SCE share
+    imports = np.maximum(flows,0)
+    imports[:,:,3] = np.maximum(-flows[:,:,3],0)
+    imports[:,:,1] = np.where(flows[:,:,1] < 0,0,flows[:,:,1]*.404 + 424)
+
+    # split into minimum flows and dispatchable (daily)
+    mins = inputs['CA_import_mins'][lines].values[:365]
+    imp = imports[:,:,:4]
+    covered = mins >= imp
+    path_mins = np.where(covered,imp,mins)
+    imports[:,:,:4] = np.where(covered,0,np.maximum(0,imp-mins))
 
-def exchange(year,scenario):
-    
-    filename = 'Synthetic_demand_pathflows/Load_Path_Sim_' + scenario + '.csv'    
-    df_data = pd.read_csv(filename,header=0)
-    c = ['Path66_sim','Path46_sim','Path61_sim','Path42_sim','Path24_sim','Path45_sim']
-    df_data = df_data[c]
-    paths = ['Path66','Path46','Path61','Path42','Path24','Path45']
-    df_data.columns = paths
-    df_data = df_data.loc[year*365:year*365+364,:]
-    
-    # select dispatchable imports (positve flow days)
-    imports = df_data
-    imports = imports.reset_index()
-    
-    for p in paths:
-        for i in range(0,len(imports)):     
-            
-            if p == 'Path42':
-                if imports.loc[i,p] >= 0:
-                    imports.loc[i,p] = 0
-                else:
-                    imports.loc[i,p] = -imports.loc[i,p]
-            
-            elif p == 'Path46':
-                if imports.loc[i,p] < 0:
-                    imports.loc[i,p] = 0
-                else:
-                    imports.loc[i,p] = imports.loc[i,p]*.404 + 424
-            
-            else:
-                if imports.loc[i,p] < 0:
-                    imports.loc[i,p] = 0
-                    
-                    
-    imports.rename(columns={'Path46':'Path46_SCE'}, inplace=True)
-    
-    filename = 'Path_setup/CA_imports_' + scenario + '.csv'
-    imports.to_csv(filename)
-    
-    # convert to minimum flow time series and dispatchable (daily)
-    df_mins = pd.read_excel('Path_setup/CA_imports_minflow_profiles.xlsx',header=0)
-    lines = ['Path66','Path46_SCE','Path61','Path42']
-    
-    for i in range(0,len(df_data)):
-        for L in lines:
-            
-            if df_mins.loc[i,L] >= imports.loc[i,L]:
-                df_mins.loc[i,L] = imports.loc[i,L]
-                imports.loc[i,L] = 0
-            
-            else:
-                imports.loc[i,L] = np.max((0,imports.loc[i,L]-df_mins.loc[i,L]))
-    
-    dispatchable_imports = imports*24
-    filename = 'Path_setup/CA_dispatchable_imports_' + scenario + '.csv'
-    dispatchable_imports.to_csv(filename)
-    
-    df_data = imports.copy(deep=True)
-    
     # hourly minimum flow for paths
-    hourly = np.zeros((8760,len(lines)))
-    
-    for i in range(0,365):
-        for L in lines:
-            index = lines.index(L)
-            
-            hourly[i*24:i*24+24,index] = np.min((df_mins.loc[i,L], df_data.loc[i,L]))
-            
-    H = pd.DataFrame(hourly)
-    H.columns = ['Path66','Path46_SCE','Path61','Path42']
-    filename = 'Path_setup/CA_path_mins_' + scenario + '.csv'
-    H.to_csv(filename)
-    
-    # hourly exports
-    filename = 'Synthetic_demand_pathflows/Load_Path_Sim_' + scenario + '.csv'
-    df_data = pd.read_csv(filename,header=0)
-    c = ['Path66_sim','Path46_sim','Path61_sim','Path42_sim','Path24_sim','Path45_sim']
-    df_data = df_data[c]
-    df_data.columns = [paths]
-    
-    df_data = df_data.loc[year*365:year*365+364,:]
-    df_data = df_data.reset_index()
-    
-    e = np.zeros((8760,4))
-    
-    #Path 42
-    path_profiles = pd.read_excel('Path_setup/CA_path_export_profiles.xlsx',sheet_name='Path42',header=None)
-    pp = path_profiles.values
-    
-    for i in range(0,len(df_data)):
-        if df_data.loc[i,'Path42'].values > 0:
-            e[i*24:i*24+24,0] = pp[i,:]*df_data.loc[i,'Path42'].values
-    
-    #Path 24
-    path_profiles = pd.read_excel('Path_setup/CA_path_export_profiles.xlsx',sheet_name='Path24',header=None)
-    pp = path_profiles.values
-    
-    for i in range(0,len(df_data)):
-        if df_data.loc[i,'Path24'].values < 0:
-            e[i*24:i*24+24,1] = pp[i,:]*df_data.loc[i,'Path24'].values*-1
-    
-    #Path 45
-    path_profiles = pd.read_excel('Path_setup/CA_path_export_profiles.xlsx',sheet_name='Path45',header=None)
-    pp = path_profiles.values
-    
-    for i in range(0,len(df_data)):
-        if df_data.loc[i,'Path45'].values < 0:
-            e[i*24:i*24+24,2] = pp[i,:]*df_data.loc[i,'Path45'].values*-1  
-            
-    #Path 66
-    path_profiles = pd.read_excel('Path_setup/CA_path_export_profiles.xlsx',sheet_name='Path66',header=None)
-    pp = path_profiles.values
-    
-    for i in range(0,len(df_data)):
-        if df_data.loc[i,'Path66'].values < 0:
-            e[i*24:i*24+24,2] = pp[i,:]*df_data.loc[i,'Path66'].values*-1  
-    
-    e = e*24
-    
-    exports = pd.DataFrame(e) 
-    exports.columns = ['Path42','Path24','Path45','Path66']
-    filename = 'Path_setup/CA_exports_' + scenario + '.csv'
-    exports.to_csv(filename)
-    
-    
-    
-    ##########################3
-    ##########################
-    
-    # HYDRO
-    
-    # convert to minimum flow time series and dispatchable (daily)
-    
-    df_data = pd.read_excel('CA_hydropower/CA_hydro_daily.xlsx',header=0,index_col=0)
-    dhydro = df_data.loc[year*365:year*365+364,:]
-    dhydro = dhydro.reset_index(drop=True)
-    dhydro=dhydro.values
-    for i in range(0,len(dhydro)):
-        for j in range(0,2):
-            if dhydro[i,j] < 0:
-                dhydro[i,j] = 0
-    PGE_ALL=dhydro[:,0]/0.837
-    SCE_all=dhydro[:,1]/0.8016       
-    dhydro=pd.DataFrame()
-    dhydro['PGE_valley']=PGE_ALL
-    dhydro['SCE']=SCE_all
-    zones = ['PGE_valley','SCE']
-    df_mins = pd.read_excel('Hydro_setup/Minimum_hydro_profiles.xlsx',header=0)
-    
-    for i in range(0,len(dhydro)):
-        for z in zones:
-            
-            if df_mins.loc[i,z]*24 >= dhydro.loc[i,z]:
-                df_mins.loc[i,z] = np.max((0,dhydro.loc[i,z]/24))
-                dhydro.loc[i,z] = 0
-            
-            else:
-                dhydro.loc[i,z] = np.max((0,dhydro.loc[i,z]-df_mins.loc[i,z]*24))
-    
-    dhydro.to_csv('Hydro_setup/CA_dispatchable_hydro.csv')
-    
+    path_mins = np.repeat(np.minimum(path_mins,imports[:,:,:4]),24,axis=1)
+
+    # hourly exports; Path66 exports replace Path45 on the days they occur
+    pp = dict((p,inputs['CA_export_profiles'][p].values) for p in export_paths)
+    x = dict((p,flows[:,:,paths.index(p)]) for p in paths)
+    exports = np.zeros((len(years),8760,4))
+    exports[:,:,0] = hourly(pp['Path42'],np.where(x['Path42'] > 0,x['Path42'],0))
+    exports[:,:,1] = hourly(pp['Path24'],np.where(x['Path24'] < 0,-x['Path24'],0))
+    exports[:,:,2] = np.where(np.repeat(x['Path66'] < 0,24,axis=1),
+                              hourly(pp['Path66'],-x['Path66']),
+                              hourly(pp['Path45'],np.where(x['Path45'] < 0,-x['Path45'],0)))
+    exports = exports*24
+
+    # hydropower: minimum flows and dispatchable (daily)
+    raw = pathway_inputs.block(inputs,'CA_hydro',years,365)[:,:,:2]
+    hydro = np.maximum(raw,0)/hydro_factor
+    mins = inputs['hydro_mins'][zones].values[:365]
+    covered = mins*24 >= hydro
+    hydro_mins = np.where(covered,np.maximum(0,hydro/24),mins)
+    dispatchable_hydro = np.where(covered,0,np.maximum(0,hydro-mins*24))
+
     # hourly minimum flow for hydro
-    hourly = np.zeros((8760,len(zones)))
-    
-    df_data = pd.read_excel('CA_hydropower/CA_hydro_daily.xlsx',header=0,index_col=0)
-    hydro = df_data.loc[year*365:year*365+364,:].values
-    PGE_ALL=hydro[:,0]/0.837
-    SCE_all=hydro[:,1]/0.8016
-    hydro=pd.DataFrame()
-    hydro['PGE_valley']=PGE_ALL
-    hydro['SCE']=SCE_all
-    zones = ['PGE_valley','SCE']
-    
-    for i in range(0,365):
-        for z in zones:
-            index = zones.index(z)
-            
-            h = np.max((0,hydro.loc[i,z]))
-            
-            hourly[i*24:i*24+24,index] = np.min((df_mins.loc[i,z],h))
-            
-    H = pd.DataFrame(hourly)
-    H.columns = zones
-    H.to_csv('Hydro_setup/CA_hydro_mins.csv')
+    hydro_mins = np.repeat(np.minimum(hydro_mins,np.maximum(0,raw/hydro_factor)),24,axis=1)
+
+    return {'imports': imports*24,
+            'path_mins': path_mins,
+            'exports': exports,
+            'hydro': dispatchable_hydro,
+            'hydro_mins': hydro_mins}
+
+
+def frames(series,k):
+
+    # year k of transform() as DataFrames laid out like the Path_setup and
+    # Hydro_setup csv files
+    return {'imports': pd.DataFrame(series['imports'][k],columns=['Path66','Path46_SCE','Path61','Path42','Path24','Path45']),
+            'path_mins': pd.DataFrame(series['path_mins'][k],columns=lines),
+            'exports': pd.DataFrame(series['exports'][k],columns=export_paths),
+            'hydro': pd.DataFrame(series['hydro'][k],columns=zones),
+            'hydro_mins': pd.DataFrame(series['hydro_mins'][k],columns=zones)}
+
+
+def exchange(year,scenario,inputs=None):
+
+    # single year, written to the csv files read by CA_data_setup
+    if inputs is None:
+        inputs = pathway_inputs.load(scenario)
+
+    f = frames(transform(inputs,[year]),0)
+    f['imports'].to_csv('Path_setup/CA_dispatchable_imports_' + scenario + '.csv')
+    f['path_mins'].to_csv('Path_setup/CA_path_mins_' + scenario + '.csv')
+    f['exports'].to_csv('Path_setup/CA_exports_' + scenario + '.csv')
+    f['hydro'].to_csv('Hydro_setup/CA_dispatchable_hydro.csv')
+    f['hydro_mins'].to_csv('Hydro_setup/CA_hydro_mins.csv')
 
     return None
@@ -8,9 +8,13 @@ Created on Mon May 27 11:13:15 2019
 from __future__ import division
 import pandas as pd 
 import numpy as np
+import sys
+sys.path.append('../UCED')
+import instrument
 #from datetime import datetime
 #import matplotlib.pyplot as plt
     
+@instrument.timed('CA_hydropower.hydro')
 def hydro(sim_years):
         
     #########################################################################
@@ -103,6 +107,8 @@ def hydro(sim_years):
     SCE_dams = list(SCE_names.loc[:,'Big_Creek_1 ':])
     SCE_No_Data_Dams=[SCE_dams[7],SCE_dams[8],SCE_dams[12]]
     
+    instrument.checkpoint('inputs')
+
     #Simulate all the PGE inflow dams
     check_unused = []
     PGE_name_list = []
@@ -413,6 +419,8 @@ def hydro(sim_years):
                 M_PGE = np.column_stack((M_PGE,est_power))
             
     
+    instrument.checkpoint('PGE dams')
+
     ##Simulate all the SCE inflow dams
     for name in SCE_dams:
         est_power = []
@@ -573,6 +581,8 @@ def hydro(sim_years):
                 M_SCE = np.column_stack((M_SCE,est_power))
     
     
+    instrument.checkpoint('SCE dams')
+
     df_PGE = pd.DataFrame(M_PGE)
     df_PGE.columns = PGE_name_list
     df_PGE.to_excel('PGE_output.xlsx')
@@ -13,7 +13,11 @@ Created on Wed Mar 13 08:58:04 2019
 
 import numpy as np
 import pandas as pd
+import sys
+sys.path.append('../UCED')
+import instrument
 
+@instrument.timed('FCRPS_New.simulate')
 def simulate(sim_years):
 
     def ismember(A,B):
@@ -440,6 +444,8 @@ def simulate(sim_years):
     FCDend_LIB = np.zeros((no_years,1))
     
     
+    instrument.checkpoint('inputs')
+
     ###########
     #Daily Loop
     ###########
@@ -3161,6 +3167,8 @@ def simulate(sim_years):
     
     
     
+    instrument.checkpoint('daily loop')
+
     ############
     #Data Output
     ############
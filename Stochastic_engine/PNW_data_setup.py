@@ -7,512 +7,161 @@ Created on Tue Mar  5 16:37:53 2019
 
 import pandas as pd
 import numpy as np
+import hashlib
+import sys
+sys.path.append('../UCED')
+import model_bundle
+import run_job
+import pathway_inputs
+import setup_series
 from pandas import ExcelWriter
 
-def setup(year,scenario,PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff):
+def setup(year,scenario,PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff,inputs=None,exchange=None,series=None,dat=False):
+
+    # inputs: pathway_inputs.load(scenario), shared by all years of a pathway
+    if inputs is None:
+        inputs = pathway_inputs.load(scenario)
+
+    # exchange: PNW_exchange_time_series.frames() of this year, otherwise read
+    # from the csv files written by PNW_exchange_time_series.exchange
+    if exchange is None:
+        exchange = {'hydro': pd.read_csv('Hydro_setup/PNW_dispatchable_hydro.csv',header=0),
+                    'imports': pd.read_csv('Path_setup/PNW_dispatchable_imports_' + scenario + '.csv',header=0),
+                    'exports': pd.read_csv('Path_setup/PNW_exports_' + scenario + '.csv',header=0),
+                    'path_mins': pd.read_csv('Path_setup/PNW_path_mins_' + scenario + '.csv',header=0),
+                    'hydro_mins': pd.read_csv('Hydro_setup/PNW_hydro_mins.csv',header=0)}
+
+    # series: setup_series.frames() of this year (load, reserves, wind, solar,
+    # must run, gas prices), otherwise built here
+    if series is None:
+        series = setup_series.frames(setup_series.transform(inputs,'PNW',scenario,[year]),0)
+
+    # dat = True also writes data.dat/dataLP.dat next to the bundle, for debugging
 
     #read generator parameters into DataFrame
     df_gen = pd.read_csv('PNW_data_file/generators.csv',header=0)
 
-    zone = ['PNW']
-    ##time series of load for each zone
-    filename = 'Synthetic_demand_pathflows/Sim_hourly_load_' + scenario + '.csv'
-    df_load = pd.read_csv(filename,header=0)
-    df_load = df_load[zone]
-    df_load = df_load.loc[year*8760:year*8760+8759,:]
-    df_load = df_load.reset_index(drop=True)
-
-    ##time series of operational reserves for each zone
-    rv= df_load.values
-    reserves = np.zeros((len(rv),1))
-    for i in range(0,len(rv)):
-            reserves[i] = np.sum(rv[i,:])*.04
-    df_reserves = pd.DataFrame(reserves)
-    df_reserves.columns = ['reserves']
-    
     ##daily hydropower availability
-    df_hydro = pd.read_csv('Hydro_setup/PNW_dispatchable_hydro.csv',header=0)
-
-    ##time series of wind generation for each zone
-    df_wind = pd.read_csv('Synthetic_wind_power/wind_power_sim.csv',header=0)
-    header = scenario + '_PNW'
-    df_wind = df_wind.loc[:,header]
-    df_wind = df_wind.loc[year*8760:year*8760+8759]
-    df_wind = df_wind.reset_index(drop=True)
-
-    ##time series solar for each TAC
-    df_solar = pd.read_csv('Synthetic_solar_power/solar_power_sim.csv',header=0)
-    header = scenario + '_PNW'
-    df_solar = df_solar.loc[:,header]
-    df_solar = df_solar.loc[year*8760:year*8760+8759]
-    df_solar = df_solar.reset_index(drop=True)
+    df_hydro = exchange['hydro']
 
     ##daily time series of dispatchable imports by path
-    filename = 'Path_setup/PNW_dispatchable_imports_' + scenario + '.csv'
-    df_imports = pd.read_csv(filename,header=0)
+    df_imports = exchange['imports']
     
     ##hourly time series of exports by zone
-    filename = 'Path_setup/PNW_exports_' + scenario + '.csv'
-    df_exports = pd.read_csv(filename,header=0)
-
-    #must run resources (LFG,ag_waste,nuclear)
-    df_must = pd.read_csv('PNW_data_file/must_run.csv',header=0)
-
-    #natural gas prices
-    df_ng = pd.read_excel('Gas_prices/NG.xlsx', header=0)
-    df_ng = df_ng[zone]
-    df_ng = df_ng.loc[year*365:year*365+364,:]
-    df_ng = df_ng.reset_index()
+    df_exports = exchange['exports']
 
     #imports hourly minimum flows
-    filename = 'Path_setup/PNW_path_mins_' + scenario + '.csv'
-    df_PNW_import_mins = pd.read_csv(filename, header=0)
+    df_PNW_import_mins = exchange['path_mins']
 
     #california hydro hourly minimum flows
-    df_PNW_hydro_mins = pd.read_csv('Hydro_setup/PNW_hydro_mins.csv', header=0)
+    df_PNW_hydro_mins = exchange['hydro_mins']
 
     #list zones
     zones = ['PNW']
 
-    # must run generation
-    must_run_PNW = np.ones((len(df_load),1))*(df_must.loc[0,'PNW'])
-    df_total_must_run =pd.DataFrame(must_run_PNW)
-    df_total_must_run.columns = ['PNW']
-
-
-     ############
-    #  sets    #
-    ############
-    #write data.dat file
+    #write the model year directory
     import os
-    from shutil import copy
     from pathlib import Path
     
     
     path=str(Path.cwd().parent) +str (Path('/UCED/LR/' + str(scenario) + '/PNW' + str(year)))
     os.makedirs(path,exist_ok=True)
 
-    generators_file='PNW_data_file/generators.csv'
-    dispatch_file='../UCED/PNW_dispatch.py'
-    dispatchLP_file='../UCED/PNW_dispatchLP.py'
-    wrapper_file='../UCED/PNW_wrapper.py'
-    simulation_file='../UCED/PNW_simulation.py'
-    emission_cal_file='../UCED/PNW_emission_calculation.py'
-    emission_gen_file = '../UCED/PNW_emissions_generator.csv'
-    
-    copy(dispatch_file,path)
-    copy(wrapper_file,path)
-    copy(simulation_file,path)
-    copy(emission_cal_file,path)
-    copy(dispatchLP_file,path)
-    copy(generators_file,path)
-    copy(emission_gen_file,path)
-
-    filename = path + '/data.dat'
-    with open(filename, 'w') as f:
-
-        # generator sets by zone
-        for z in zones:
-            # zone string
-            z_int = zones.index(z)
-            f.write('set Zone5Generators :=\n')
-            # pull relevant generators
-            for gen in range(0,len(df_gen)):
-                if df_gen.loc[gen,'zone'] == z:
-                    unit_name = df_gen.loc[gen,'name']
-                    unit_name = unit_name.replace(' ','_')
-                    f.write(unit_name + ' ')
-            f.write(';\n\n')
-            
-         # battery sets by zone
-        for z in zones:
-            f.write('set Zone5Battery :=\n')
-            unit_name = 'battery5'
-            f.write(unit_name + ' ')
-            f.write(';\n\n')
-
-        # WECC imports
-        f.write('set WECCImports :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'imports':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-
-        # generator sets by type
-        # coal
-        f.write('set Coal :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'coal':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        #nuc
-        f.write('set Nuclear :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'nuc':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # oil
-        f.write('set Oil :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'oil':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Pumped Storage
-        f.write('set PSH :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'psh':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Slack
-        f.write('set Slack :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'slack':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Hydro
-        f.write('set Hydro :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'hydro':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Ramping
-        f.write('set Ramping :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'hydro' or df_gen.loc[gen,'typ'] == 'imports':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-
-        # gas generator sets by zone and type
-        for z in zones:
-            # zone string
-            z_int = zones.index(z)
-
-            # Natural Gas
-            # find relevant generators
-            trigger = 0
-            for gen in range(0,len(df_gen)):
-                if df_gen.loc[gen,'zone'] == z and (df_gen.loc[gen,'typ'] == 'ngcc' or df_gen.loc[gen,'typ'] == 'ngct' or df_gen.loc[gen,'typ'] == 'ngst'):
-                    trigger = 1
-            if trigger > 0:
-                # pull relevant generators
-                f.write('set Gas :=\n')
-                for gen in range(0,len(df_gen)):
-                    if df_gen.loc[gen,'zone'] == z and (df_gen.loc[gen,'typ'] == 'ngcc' or df_gen.loc[gen,'typ'] == 'ngct' or df_gen.loc[gen,'typ'] == 'ngst'):
-                        unit_name = df_gen.loc[gen,'name']
-                        unit_name = unit_name.replace(' ','_')
-                        f.write(unit_name + ' ')
-                f.write(';\n\n')
-
-
-        # zones
-        f.write('set zones :=\n')
-        for z in zones:
-            f.write(z + ' ')
-        f.write(';\n\n')
-
-    ################
-    #  parameters  #
-    ################
-
-        # simulation details
-        SimHours = 8760
-        f.write('param SimHours := %d;' % SimHours)
-        f.write('\n')
-        f.write('param SimDays:= %d;' % int(SimHours/24))
-        f.write('\n\n')
-        HorizonHours = 48
-        f.write('param HorizonHours := %d;' % HorizonHours)
-        f.write('\n\n')
-        HorizonDays = int(HorizonHours/24)
-        f.write('param HorizonDays := %d;' % HorizonDays)
-        f.write('\n\n')
-
-
-    # create parameter matrix for generators
-        f.write('param:' + '\t')
-        for c in df_gen.columns:
-            if c != 'name':
-                f.write(c + '\t')
-        f.write(':=\n\n')
-        for i in range(0,len(df_gen)):
-            for c in df_gen.columns:
-                if c == 'name':
-                    unit_name = df_gen.loc[i,'name']
-                    unit_name = unit_name.replace(' ','_')
-                    f.write(unit_name + '\t')
-                else:
-                    f.write(str((df_gen.loc[i,c])) + '\t')
-            f.write('\n')
-
-        f.write(';\n\n')
-        
-        # create parameter matrix for batteries
-        
-        f.write('param:' + '\t' + 'bat_cap' + '\t' + 'bat_RoC' + '\t' + 'bat_RoD' + '\t' + 'bat_eff' + ':=\n\n')
-        f.write('battery5' + '\t' + str(PNW_bat_cap) + '\t' + str(bat_RoC_coeff*PNW_bat_cap) + '\t' + str(bat_RoD_coeff*PNW_bat_cap) + '\t' + str(bat_eff) + '\n')
-        f.write(';\n\n')
-
-        # times series data
-        # zonal (hourly)
-        f.write('param:' + '\t' + 'SimDemand' + '\t' + 'SimWind' \
-        + '\t' + 'SimSolar' + '\t' + 'SimMustRun:=' + '\n')
-        for z in zones:
-            for h in range(0,len(df_load)):
-                f.write(z + '\t' + str(h+1) + '\t' + str(df_load.loc[h,z])\
-                + '\t' + str(df_wind[h]) + '\t' + str(df_solar[h])\
-                + '\t' + str(df_total_must_run.loc[h,z]) + '\n')
-        f.write(';\n\n')
-
-        # zonal (daily)
-        f.write('param:' + '\t' + 'SimGasPrice:=' + '\n')
-        for z in zones:
-            for d in range(0,int(SimHours/24)):
-                f.write(z + '\t' + str(d+1) + '\t' + str(df_ng.loc[d,z]) + '\n')
-        f.write(';\n\n')
-
-        #system wide (daily)
-        f.write('param:' + '\t' + 'SimPath66_imports' + '\t' + 'SimPath65_imports' + '\t' + 'SimPath3_imports' + '\t' + 'SimPath8_imports' + '\t' + 'SimPath14_imports' + '\t' + 'SimPNW_hydro:=' + '\n')
-        for d in range(0,len(df_imports)):
-                f.write(str(d+1) + '\t' + str(df_imports.loc[d,'Path66']) + '\t' + str(df_imports.loc[d,'Path65']) + '\t' + str(df_imports.loc[d,'Path3']) + '\t' + str(df_imports.loc[d,'Path8']) + '\t' + str(df_imports.loc[d,'Path14']) + '\t' + str(df_hydro.loc[d,'PNW']) + '\n')
-        f.write(';\n\n')
-
-
-        #system wide (hourly)
-        f.write('param:' + '\t' + 'SimPath66_exports' + '\t' + 'SimPath65_exports' + '\t' + 'SimPath3_exports' + '\t' + 'SimPath8_exports' + '\t' + 'SimPath14_exports' + '\t' + 'SimReserves' + '\t' + 'SimPNW_hydro_minflow' + '\t' + 'SimPath3_imports_minflow' + '\t' + 'SimPath8_imports_minflow' + '\t' + 'SimPath65_imports_minflow' + '\t' + 'SimPath66_imports_minflow' + '\t' + 'SimPath14_imports_minflow:=' + '\n')
-        for h in range(0,len(df_load)):
-                f.write(str(h+1) + '\t' + str(df_exports.loc[h,'Path66']) + '\t' + str(df_exports.loc[h,'Path65']) + '\t' + str(df_exports.loc[h,'Path3']) + '\t' + str(df_exports.loc[h,'Path8']) + '\t' + str(df_exports.loc[h,'Path14']) + '\t' + str(df_reserves.loc[h,'reserves'])  + '\t' + str(df_PNW_hydro_mins.loc[h,'PNW']) + '\t' + str(df_PNW_import_mins.loc[h,'Path3']) + '\t' + str(df_PNW_import_mins.loc[h,'Path8']) + '\t' + str(df_PNW_import_mins.loc[h,'Path65']) + '\t' + str(df_PNW_import_mins.loc[h,'Path66']) + '\t' + str(df_PNW_import_mins.loc[h,'Path14']) + '\n')
-        f.write(';\n\n')
-        
-        
-        ########################3
-        
-    filename = path + '/dataLP.dat'
-    with open(filename, 'w') as f:
-
-        # generator sets by zone
-        for z in zones:
-            # zone string
-            z_int = zones.index(z)
-            f.write('set Zone5Generators :=\n')
-            # pull relevant generators
-            for gen in range(0,len(df_gen)):
-                if df_gen.loc[gen,'zone'] == z:
-                    unit_name = df_gen.loc[gen,'name']
-                    unit_name = unit_name.replace(' ','_')
-                    f.write(unit_name + ' ')
-            f.write(';\n\n')
-            
-
-        # WECC imports
-        f.write('set WECCImports :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'imports':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-
-        # generator sets by type
-        # coal
-        f.write('set Coal :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'coal':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        #nuc
-        f.write('set Nuclear :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'nuc':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # oil
-        f.write('set Oil :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'oil':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Pumped Storage
-        f.write('set PSH :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'psh':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Slack
-        f.write('set Slack :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'slack':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Hydro
-        f.write('set Hydro :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'hydro':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-        # Ramping
-        f.write('set Ramping :=\n')
-        # pull relevant generators
-        for gen in range(0,len(df_gen)):
-            if df_gen.loc[gen,'typ'] == 'hydro' or df_gen.loc[gen,'typ'] == 'imports':
-                unit_name = df_gen.loc[gen,'name']
-                unit_name = unit_name.replace(' ','_')
-                f.write(unit_name + ' ')
-        f.write(';\n\n')
-
-
-        # gas generator sets by zone and type
-        for z in zones:
-            # zone string
-            z_int = zones.index(z)
-
-            # Natural Gas
-            # find relevant generators
-            trigger = 0
-            for gen in range(0,len(df_gen)):
-                if df_gen.loc[gen,'zone'] == z and (df_gen.loc[gen,'typ'] == 'ngcc' or df_gen.loc[gen,'typ'] == 'ngct' or df_gen.loc[gen,'typ'] == 'ngst'):
-                    trigger = 1
-            if trigger > 0:
-                # pull relevant generators
-                f.write('set Gas :=\n')
-                for gen in range(0,len(df_gen)):
-                    if df_gen.loc[gen,'zone'] == z and (df_gen.loc[gen,'typ'] == 'ngcc' or df_gen.loc[gen,'typ'] == 'ngct' or df_gen.loc[gen,'typ'] == 'ngst'):
-                        unit_name = df_gen.loc[gen,'name']
-                        unit_name = unit_name.replace(' ','_')
-                        f.write(unit_name + ' ')
-                f.write(';\n\n')
-
-
-        # zones
-        f.write('set zones :=\n')
-        for z in zones:
-            f.write(z + ' ')
-        f.write(';\n\n')
+    ############
+    #  sets    #
+    ############
+    # every set and parameter of the UC/ED model goes into one binary bundle
+    # (model.npz + model.json, see UCED/model_bundle.py); dataLP.dat is the same
+    # without the battery
+    SimHours = 8760
+    SimDays = int(SimHours/24)
+    HorizonHours = 48
+    HorizonDays = int(HorizonHours/24)
+
+    # everything that is not a time series identifies the fleet
+    fleet = df_gen.to_csv() + str([PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff,HorizonHours])
+    fleet = hashlib.sha1(fleet.encode()).hexdigest()
+
+    b = model_bundle.new(fleet)
+
+    names = df_gen['name'].str.replace(' ','_').values
+    typ = df_gen['typ'].values
+    gas = np.isin(typ,['ngcc','ngct','ngst']) & (df_gen['zone'].values == 'PNW')
+
+    # generator sets
+    model_bundle.add_set(b,'Zone5Generators',names[df_gen['zone'].values == 'PNW'])
+    model_bundle.add_set(b,'Zone5Battery',['battery5'],uc_only=True)
+    model_bundle.add_set(b,'WECCImports',names[typ == 'imports'])
+
+    # generator sets by type
+    model_bundle.add_set(b,'Coal',names[typ == 'coal'])
+    model_bundle.add_set(b,'Nuclear',names[typ == 'nuc'])
+    model_bundle.add_set(b,'Oil',names[typ == 'oil'])
+    model_bundle.add_set(b,'PSH',names[typ == 'psh'])
+    model_bundle.add_set(b,'Slack',names[typ == 'slack'])
+    model_bundle.add_set(b,'Hydro',names[typ == 'hydro'])
+    model_bundle.add_set(b,'Ramping',names[(typ == 'hydro') | (typ == 'imports')])
+    if gas.any():
+        model_bundle.add_set(b,'Gas',names[gas])
+
+    model_bundle.add_set(b,'zones',zones)
 
     ################
     #  parameters  #
     ################
 
-        # simulation details
-        SimHours = 8760
-        f.write('param SimHours := %d;' % SimHours)
-        f.write('\n')
-        f.write('param SimDays:= %d;' % int(SimHours/24))
-        f.write('\n\n')
-        HorizonHours = 48
-        f.write('param HorizonHours := %d;' % HorizonHours)
-        f.write('\n\n')
-        HorizonDays = int(HorizonHours/24)
-        f.write('param HorizonDays := %d;' % HorizonDays)
-        f.write('\n\n')
-
-
-    # create parameter matrix for generators
-        f.write('param:' + '\t')
-        for c in df_gen.columns:
-            if c != 'name':
-                f.write(c + '\t')
-        f.write(':=\n\n')
-        for i in range(0,len(df_gen)):
-            for c in df_gen.columns:
-                if c == 'name':
-                    unit_name = df_gen.loc[i,'name']
-                    unit_name = unit_name.replace(' ','_')
-                    f.write(unit_name + '\t')
-                else:
-                    f.write(str((df_gen.loc[i,c])) + '\t')
-            f.write('\n')
-
-        f.write(';\n\n')
-        
-
-        # times series data
-        # zonal (hourly)
-        f.write('param:' + '\t' + 'SimDemand' + '\t' + 'SimWind' \
-        + '\t' + 'SimSolar' + '\t' + 'SimMustRun:=' + '\n')
-        for z in zones:
-            for h in range(0,len(df_load)):
-                f.write(z + '\t' + str(h+1) + '\t' + str(df_load.loc[h,z])\
-                + '\t' + str(df_wind[h]) + '\t' + str(df_solar[h])\
-                + '\t' + str(df_total_must_run.loc[h,z]) + '\n')
-        f.write(';\n\n')
-
-        # zonal (daily)
-        f.write('param:' + '\t' + 'SimGasPrice:=' + '\n')
-        for z in zones:
-            for d in range(0,int(SimHours/24)):
-                f.write(z + '\t' + str(d+1) + '\t' + str(df_ng.loc[d,z]) + '\n')
-        f.write(';\n\n')
-
-        #system wide (daily)
-        f.write('param:' + '\t' + 'SimPath66_imports' + '\t' + 'SimPath65_imports' + '\t' + 'SimPath3_imports' + '\t' + 'SimPath8_imports' + '\t' + 'SimPath14_imports' + '\t' + 'SimPNW_hydro:=' + '\n')
-        for d in range(0,len(df_imports)):
-                f.write(str(d+1) + '\t' + str(df_imports.loc[d,'Path66']) + '\t' + str(df_imports.loc[d,'Path65']) + '\t' + str(df_imports.loc[d,'Path3']) + '\t' + str(df_imports.loc[d,'Path8']) + '\t' + str(df_imports.loc[d,'Path14']) + '\t' + str(df_hydro.loc[d,'PNW']) + '\n')
-        f.write(';\n\n')
-
-
-        #system wide (hourly)
-        f.write('param:' + '\t' + 'SimPath66_exports' + '\t' + 'SimPath65_exports' + '\t' + 'SimPath3_exports' + '\t' + 'SimPath8_exports' + '\t' + 'SimPath14_exports' + '\t' + 'SimReserves' + '\t' + 'SimPNW_hydro_minflow' + '\t' + 'SimPath3_imports_minflow' + '\t' + 'SimPath8_imports_minflow' + '\t' + 'SimPath65_imports_minflow' + '\t' + 'SimPath66_imports_minflow' + '\t' + 'SimPath14_imports_minflow:=' + '\n')
-        for h in range(0,len(df_load)):
-                f.write(str(h+1) + '\t' + str(df_exports.loc[h,'Path66']) + '\t' + str(df_exports.loc[h,'Path65']) + '\t' + str(df_exports.loc[h,'Path3']) + '\t' + str(df_exports.loc[h,'Path8']) + '\t' + str(df_exports.loc[h,'Path14']) + '\t' + str(df_reserves.loc[h,'reserves'])  + '\t' + str(df_PNW_hydro_mins.loc[h,'PNW']) + '\t' + str(df_PNW_import_mins.loc[h,'Path3']) + '\t' + str(df_PNW_import_mins.loc[h,'Path8']) + '\t' + str(df_PNW_import_mins.loc[h,'Path65']) + '\t' + str(df_PNW_import_mins.loc[h,'Path66']) + '\t' + str(df_PNW_import_mins.loc[h,'Path14']) + '\n')
-        f.write(';\n\n')
-
+    # simulation details
+    model_bundle.add_scalar(b,'SimHours',SimHours)
+    model_bundle.add_scalar(b,'SimDays',SimDays)
+    model_bundle.add_scalar(b,'HorizonHours',HorizonHours)
+    model_bundle.add_scalar(b,'HorizonDays',HorizonDays)
+
+    model_bundle.add_index(b,'zones',zones)
+    model_bundle.add_index(b,'generators',names)
+    model_bundle.add_index(b,'batteries',['battery5'])
+
+    # generators
+    for c in df_gen.columns:
+        if c != 'name':
+            model_bundle.add_param(b,c,df_gen[c].values,['generators'])
+
+    # battery
+    model_bundle.add_param(b,'bat_cap',[PNW_bat_cap],['batteries'],uc_only=True)
+    model_bundle.add_param(b,'bat_RoC',[bat_RoC_coeff*PNW_bat_cap],['batteries'],uc_only=True)
+    model_bundle.add_param(b,'bat_RoD',[bat_RoD_coeff*PNW_bat_cap],['batteries'],uc_only=True)
+    model_bundle.add_param(b,'bat_eff',[bat_eff],['batteries'],uc_only=True)
+
+    # times series data (setup_series, hours/days x zones)
+    # zonal (hourly)
+    model_bundle.add_param(b,'SimDemand',series['load'].T,['zones',1])
+    model_bundle.add_param(b,'SimWind',series['wind'].T,['zones',1])
+    model_bundle.add_param(b,'SimSolar',series['solar'].T,['zones',1])
+    model_bundle.add_param(b,'SimMustRun',series['must_run'].T,['zones',1])
+
+    # zonal (daily)
+    model_bundle.add_param(b,'SimGasPrice',series['ng'][:SimDays].T,['zones',1])
+
+    # system wide (daily)
+    for p in ['Path66','Path65','Path3','Path8','Path14']:
+        model_bundle.add_param(b,'Sim' + p + '_imports',df_imports[p].values[:SimDays],[1])
+    model_bundle.add_param(b,'SimPNW_hydro',df_hydro['PNW'].values[:SimDays],[1])
+
+    # system wide (hourly)
+    for p in ['Path66','Path65','Path3','Path8','Path14']:
+        model_bundle.add_param(b,'Sim' + p + '_exports',df_exports[p].values[:SimHours],[1])
+    model_bundle.add_param(b,'SimReserves',series['reserves'][:SimHours],[1])
+    model_bundle.add_param(b,'SimPNW_hydro_minflow',df_PNW_hydro_mins['PNW'].values[:SimHours],[1])
+    for p in ['Path3','Path8','Path65','Path66','Path14']:
+        model_bundle.add_param(b,'Sim' + p + '_imports_minflow',df_PNW_import_mins[p].values[:SimHours],[1])
+
+    model_bundle.save(path,b)
+
+    # the job directory only holds the model inputs and a manifest (job.json);
+    # model code and static tables stay in the UCED folder (see UCED/run_job.py)
+    run_job.write(path,'PNW',scenario,year,SimDays)
+
+    # text copies of the bundle, for debugging
+    if dat:
+        model_bundle.export_dat(path)
 
     return None
@@ -5,146 +5,86 @@ Created on Mon May 14 17:29:16 2018
 """
 from __future__ import division
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
+import pathway_inputs
+
+paths = ['Path3','Path8','Path14','Path65','Path66']
+#SCRIPT ASSUMPTION: NEGATIVE = EXPORT. revert sign when needed
+reversed_paths = ['Path3','Path65','Path66']
+
+
+def hourly(profile,daily):
+
+    # (years x 365) daily amounts spread with a (365 x 24) profile -> (years x 8760)
+    return (profile[None,:365,:]*daily[:,:,None]).reshape(len(daily),-1)
+
+
+def transform(inputs,years):
+
+    # exchange and hydropower time series of several synthetic years at once,
+    # as (years x days x columns) and (years x hours x columns) arrays
+    flows = pathway_inputs.block(inputs,'pathflows',years,365,[p + '_sim' for p in paths])
+    sign = np.array([-1 if p in reversed_paths else 1 for p in paths])
+
+    # select dispatchable imports
+    imports = np.maximum(flows*sign,0)
+
+    # split into minimum flows and dispatchable (daily)
+    mins = inputs['PNW_import_mins'][paths].values[:365]
+    covered = mins >= imports
+    path_mins = np.where(covered,imports,mins)
+    imports = np.where(covered,0,np.maximum(0,imports-mins))
 
-def exchange(year,scenario):
-
-    filename = 'Synthetic_demand_pathflows/Load_Path_Sim_' + scenario + '.csv' 
-    df_data = pd.read_csv(filename,header=0)
-    c = ['Path3_sim','Path8_sim','Path14_sim','Path65_sim','Path66_sim']
-    df_data = df_data[c]
-    paths = ['Path3','Path8','Path14','Path65','Path66']
-    df_data.columns = paths
-    df_data = df_data.loc[year*365:year*365+364,:]
-    
-    # select dispatchable imports 
-    imports = df_data
-    imports = imports.reset_index()
-    
-    for p in paths:
-        for i in range(0,len(imports)):     
-            
-            if p=='Path3' or p=='Path65' or p=='Path66':   #SCRIPT ASSUMPTION: NEGATIVE = EXPORT. revert sign when needed
-                if imports.loc[i,p] >= 0:
-                    imports.loc[i,p] = 0
-                else:
-                    imports.loc[i,p] = -imports.loc[i,p]
-            
-            else:
-                if imports.loc[i,p] < 0:
-                    imports.loc[i,p] = 0
-    
-    filename = 'Path_setup/PNW_imports_' + scenario + '.csv'
-    imports.to_csv(filename)
-    
-    # convert to minimum flow time series and dispatchable (daily)
-    df_mins = pd.read_excel('Path_setup/PNW_imports_minflow_profiles.xlsx',header=0)
-    lines = ['Path3','Path8','Path14','Path65','Path66']
-    
-    for i in range(0,len(df_data)):
-        for L in lines:
-            
-            if df_mins.loc[i,L] >= imports.loc[i,L]:
-                df_mins.loc[i,L] = imports.loc[i,L]
-                imports.loc[i,L] = 0
-            
-            else:
-                imports.loc[i,L] = np.max((0,imports.loc[i,L]-df_mins.loc[i,L]))
-    
-    dispatchable_imports = imports*24
-    filename = 'Path_setup/PNW_dispatchable_imports_' + scenario + '.csv'
-    dispatchable_imports.to_csv(filename)
-    
-    df_data = imports.copy(deep=True)
-    
     # hourly minimum flow for paths
-    hourly = np.zeros((8760,len(lines)))
-    
-    for i in range(0,365):
-        for L in lines:
-            index = lines.index(L)
-            
-            hourly[i*24:i*24+24,index] = np.min((df_mins.loc[i,L], df_data.loc[i,L]))
-            
-    H = pd.DataFrame(hourly)
-    H.columns = ['Path3','Path8','Path14','Path65','Path66']
-    filename = 'Path_setup/PNW_path_mins_' + scenario + '.csv'
-    H.to_csv(filename)
-    
-    # hourly exports
-    filename = 'Synthetic_demand_pathflows/Load_Path_Sim_' + scenario + '.csv'
-    df_data = pd.read_csv(filename,header=0)
-    c = ['Path3_sim','Path8_sim','Path14_sim','Path65_sim','Path66_sim']
-    df_data = df_data[c]
-    df_data.columns = [paths]
-    df_data = df_data.loc[year*365:year*365+364,:]
-    df_data = df_data.reset_index(drop=True)
-    
-    e = np.zeros((8760,5))
-    
-    for p in paths:
-        
-        path_profiles = pd.read_excel('Path_setup/PNW_path_export_profiles.xlsx',sheet_name=p,header=None)
-        
-        p_index = paths.index(p)
-        pp = path_profiles.values
-        
-        if p=='Path3' or p=='Path65' or p=='Path66':   #SCRIPT ASSUMPTION: NEGATIVE = EXPORT. revert sign when needed
-                for j in range(0,len(df_data)):
-                    df_data.loc[j,p]=df_data.loc[j,p]*-1
-                    
-        for i in range(0,len(df_data)):
-            if df_data.loc[i,p].values < 0:
-                e[i*24:i*24+24,p_index] = pp[i,:]*-df_data.loc[i,p].values
-    
-    e = e*24
-    for i in range(0,len(e)):
-        if e[i,3] > 3800:
-            e[i,3] = 3800
-    exports = pd.DataFrame(e) 
-    exports.columns = ['Path3','Path8','Path14','Path65','Path66']
-    filename = 'Path_setup/PNW_exports_' + scenario + '.csv'
-    exports.to_csv(filename)
-    
-    
-    ##########################
-    ##########################
-    
-    # HYDRO
-    
-    # convert to minimum flow time series and dispatchable (daily)
-    
-    df_data = pd.read_excel('PNW_hydro/PNW_hydro_daily.xlsx',header=0)
-    hydro = df_data.loc[year*365:year*365+364,'PNW']
-    hydro = hydro.reset_index()
-    df_mins = pd.read_excel('Hydro_setup/Minimum_hydro_profiles.xlsx',header=0)
-       
-    for i in range(0,len(hydro)):
-    
-        if df_mins.loc[i,'PNW']*24 >= hydro.loc[i,'PNW']:
-            df_mins.loc[i,'PNW'] = hydro.loc[i,'PNW']/24
-            hydro.loc[i,'PNW'] = 0
-        
-        else:
-            hydro.loc[i,'PNW'] = np.max((0,hydro.loc[i,'PNW']-df_mins.loc[i,'PNW']*24))
-    
-    dispatchable_hydro = hydro
-    dispatchable_hydro.to_csv('Hydro_setup/PNW_dispatchable_hydro.csv')
-    
+    path_mins = np.repeat(np.minimum(path_mins,imports),24,axis=1)
+
+    # hourly exports, Path65 capped at 3800
+    exports = np.zeros((len(years),8760,len(paths)))
+    for k,p in enumerate(paths):
+        x = flows[:,:,k]*sign[k]
+        exports[:,:,k] = hourly(inputs['PNW_export_profiles'][p].values,np.where(x < 0,-x,0))
+    exports = exports*24
+    exports[:,:,3] = np.where(exports[:,:,3] > 3800,3800,exports[:,:,3])
+
+    # hydropower: minimum flows and dispatchable (daily)
+    hydro = pathway_inputs.block(inputs,'PNW_hydro',years,365,['PNW'])
+    mins = inputs['hydro_mins'][['PNW']].values[:365]
+    covered = mins*24 >= hydro
+    hydro_mins = np.where(covered,hydro/24,mins)
+    dispatchable_hydro = np.where(covered,0,np.maximum(0,hydro-mins*24))
+
     # hourly minimum flow for hydro
-    hourly = np.zeros((8760,1))
-    
-    df_data = pd.read_excel('PNW_hydro/PNW_hydro_daily.xlsx',header=0)
-    hydro = df_data.loc[year*365:year*365+364,'PNW']
-    hydro = hydro.reset_index()
-        
-    for i in range(0,365):
-            
-        hourly[i*24:i*24+24] = np.min((df_mins.loc[i,'PNW'],hydro.loc[i,'PNW']))
-            
-    H = pd.DataFrame(hourly)
-    H.columns = ['PNW']
-    H.to_csv('Hydro_setup/PNW_hydro_mins.csv')
+    hydro_mins = np.repeat(np.minimum(hydro_mins,hydro),24,axis=1)
+
+    return {'imports': imports*24,
+            'path_mins': path_mins,
+            'exports': exports,
+            'hydro': dispatchable_hydro,
+            'hydro_mins': hydro_mins}
+
+
+def frames(series,k):
+
+    # year k of transform() as DataFrames laid out like the Path_setup and
+    # Hydro_setup csv files
+    return {'imports': pd.DataFrame(series['imports'][k],columns=paths),
+            'path_mins': pd.DataFrame(series['path_mins'][k],columns=paths),
+            'exports': pd.DataFrame(series['exports'][k],columns=paths),
+            'hydro': pd.DataFrame(series['hydro'][k],columns=['PNW']),
+            'hydro_mins': pd.DataFrame(series['hydro_mins'][k],columns=['PNW'])}
+
+
+def exchange(year,scenario,inputs=None):
+
+    # single year, written to the csv files read by PNW_data_setup
+    if inputs is None:
+        inputs = pathway_inputs.load(scenario)
+
+    f = frames(transform(inputs,[year]),0)
+    f['imports'].to_csv('Path_setup/PNW_dispatchable_imports_' + scenario + '.csv')
+    f['path_mins'].to_csv('Path_setup/PNW_path_mins_' + scenario + '.csv')
+    f['exports'].to_csv('Path_setup/PNW_exports_' + scenario + '.csv')
+    f['hydro'].to_csv('Hydro_setup/PNW_dispatchable_hydro.csv')
+    f['hydro_mins'].to_csv('Hydro_setup/PNW_hydro_mins.csv')
 
     return None
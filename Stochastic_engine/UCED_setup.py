@@ -33,74 +33,175 @@ Created on Wed Oct  3 21:29:55 2018
 # Default is that a random year from the synthetic record is selected to be run
 # through the UC/ED model.
 
+import os
+import time
+import multiprocessing
 import pandas as pd
 import numpy as np
+import pathway_inputs
+import CA_exchange_time_series
+import PNW_exchange_time_series
+import setup_series
+import CA_data_setup
+import PNW_data_setup
+import setup_cache
+import run_job
 
-def model_setup(pathway,model_year):
+# per system: exchange/hydro transforms and data setup
+systems = {'CA': (CA_exchange_time_series,CA_data_setup),
+           'PNW': (PNW_exchange_time_series,PNW_data_setup)}
+
+# read-only state of the year workers (see prepare); prepared once by the
+# parent and handed to the workers by init
+shared = None
+
+
+def prepare(pathway,model_year,force=False):
+
+    scenario = pathway + '_' + str(model_year)
+
+    # synthetic records of the pathway, read once (memory-mapped) and sliced
+    # for every year below
+    inputs = pathway_inputs.load(scenario)
 
     # Run the following lines if you want to select a random year from the synthetic record
     #to be run through the UC/ED model.
-    df_sim = pd.read_excel('CA_hydropower/CA_hydro_daily.xlsx')
-    sim_years = len(df_sim)/365
+    sim_years = pathway_inputs.years(inputs)
     # year = np.random.uniform(0,1,1)*sim_years
     # year = int(np.floor(year))
-    scenario = pathway + '_' + str(model_year)
-    
-    import scenario_chooser
-    [CAISO_wind_cap,CAISO_solar_cap,CAISO_bat_cap,PNW_wind_cap,PNW_solar_cap,PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff,ev_df,identifier] = scenario_chooser.choose(pathway,model_year)
-
-    
-#    for i in range(0,1):   
-    for i in range(0,int(sim_years)):
-        year=int(i)
-    
-        ############################################################################
-        #                          CA TIME SERIES SETUP
-    
-        # Calculates "minimum flows" for zonal hydropower production and imports,
-        # dispatchable imports and hydropower, and hourly export demand
-    
-        import CA_exchange_time_series
-        CA_exchange_time_series.exchange(year,scenario)
-    
-        ############################################################################
-        #                          PNW TIME SERIES SETUP
-    
-        # Note: In future versions this can be set up differently to coordinate hourly
-        # Export time series (PNW-->CAISO) with records of dispatched imports from the
-        # CAISO market model.
-    
-    
-        import PNW_exchange_time_series
-        PNW_exchange_time_series.exchange(year,scenario)
-    
-    
-        ############################################################################
-        #                          UC/ED Data File Setup
-    
-        # CALIFORNIA
-        # hist = 1 if looking at historical nuclear power production; facilitates use of
-        # monthly nuclear power generation data from EIA. Note that if hist = 0
-        # the model assumes that nuclear power plants in California have been retired.
-        
-        import CA_data_setup
-        CA_data_setup.setup(year,scenario,CAISO_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff)
-    
-    
-        # PACIFIC NORTHWEST
-        import PNW_data_setup
-        PNW_data_setup.setup(year,scenario,PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff)
-        
-        
-        
-#        import CA_data_setup2
-#        CA_data_setup2.setup(year,scenario,CAISO_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff)
-    
-    
-#        # PACIFIC NORTHWEST
-#        import PNW_data_setup2
-#        PNW_data_setup2.setup(year,scenario,PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff)
-    
-        print(i)
-    
-    return None
\ No newline at end of file
+
+    ############################################################################
+    #                     CA AND PNW TIME SERIES SETUP
+
+    # Calculates "minimum flows" for zonal hydropower production and imports,
+    # dispatchable imports and hydropower, and hourly export demand, for all
+    # years at once
+
+    # Note: In future versions this can be set up differently to coordinate hourly
+    # Export time series (PNW-->CAISO) with records of dispatched imports from the
+    # CAISO market model.
+    exchange = {'CA': CA_exchange_time_series.transform(inputs,range(0,int(sim_years))),
+                'PNW': PNW_exchange_time_series.transform(inputs,range(0,int(sim_years)))}
+
+    # load, reserves, wind, solar, must run and gas prices of all years
+    series = {'CA': setup_series.transform(inputs,'CA',scenario,range(0,int(sim_years))),
+              'PNW': setup_series.transform(inputs,'PNW',scenario,range(0,int(sim_years)))}
+
+    import scenario_table
+    [CAISO_wind_cap,CAISO_solar_cap,CAISO_bat_cap,PNW_wind_cap,PNW_solar_cap,PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff,ev_df,identifier] = scenario_table.lookup(pathway,model_year)
+    params = {'CA': [CAISO_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff],
+              'PNW': [PNW_bat_cap,bat_RoC_coeff,bat_RoD_coeff,bat_eff]}
+
+    return {'pathway': pathway,'model_year': model_year,'scenario': scenario,'force': force,
+            'inputs': inputs,'sim_years': int(sim_years),'exchange': exchange,'series': series,'params': params,
+            'index': True}
+
+
+def init(state):
+
+    # worker initializer; the state prepared by the parent is inherited where
+    # processes are forked and pickled once per worker where they are spawned,
+    # so workers never reload the inputs or rewrite shared files
+    global shared
+    shared = dict(state)
+    # the setup cache index is updated once by the parent
+    shared['index'] = False
+
+    return None
+
+
+def setup_year(i):
+
+    # UC/ED data setup of synthetic year i, both systems; returns the year,
+    # its time, what was done per system (fresh/linked/built) and the new
+    # setup cache entries
+    start = time.time()
+    s = shared
+    scenario = s['scenario']
+    year = int(i)
+    done = {}
+    keys = {}
+
+    ############################################################################
+    #                          UC/ED Data File Setup
+
+    # CALIFORNIA, then PACIFIC NORTHWEST
+    # hist = 1 if looking at historical nuclear power production; facilitates use of
+    # monthly nuclear power generation data from EIA. Note that if hist = 0
+    # the model assumes that nuclear power plants in California have been retired.
+    for system in ['CA','PNW']:
+        transform,data_setup = systems[system]
+        frames = transform.frames(s['exchange'][system],i)
+        year_series = setup_series.frames(s['series'][system],i)
+        params = s['params'][system]
+        path = setup_cache.year_path(system,scenario,year)
+        key = setup_cache.key(system,scenario,year,params,s['inputs'],frames)
+
+        # model year directories whose inputs have not changed since they were
+        # written are skipped (see setup_cache.py); force = True rebuilds them all
+        if not s['force'] and setup_cache.fresh(path,key):
+            done[system] = 'fresh'
+            continue
+        if not s['force'] and setup_cache.link(key,path):
+            run_job.write(path,system,scenario,year)
+            done[system] = 'linked'
+        else:
+            setup_cache.detach(path)
+            data_setup.setup(year,scenario,*params,inputs=s['inputs'],exchange=frames,series=year_series)
+            done[system] = 'built'
+        setup_cache.mark(path,key,index=s['index'])
+        keys[key] = path
+
+    return year,time.time()-start,done,keys
+
+
+def report(scenario,results,elapsed):
+
+    # per year timing, written next to the model year directories
+    df = pd.DataFrame([[year,done.get('CA','fresh'),done.get('PNW','fresh'),seconds] for year,seconds,done,keys in results],
+                      columns=['year','CA','PNW','seconds']).sort_values('year')
+    folder = os.path.dirname(setup_cache.year_path('CA',scenario,0))
+    os.makedirs(folder,exist_ok=True)
+    filename = os.path.join(folder,'setup_report.csv')
+    df.to_csv(filename,index=False)
+
+    counts = pd.concat([df['CA'],df['PNW']]).value_counts()
+    print(scenario + ': ' + str(len(df)) + ' years in ' + str(round(elapsed,1)) + ' s (' +
+          ', '.join([str(counts[k]) + ' ' + k for k in counts.index]) + '), ' +
+          str(round(df['seconds'].mean(),2)) + ' s per year, slowest year ' +
+          str(int(df.loc[df['seconds'].idxmax(),'year'])) + ' (' + str(round(df['seconds'].max(),2)) + ' s)')
+
+    return df
+
+
+def model_setup(pathway,model_year,force=False,processes=1):
+
+    # processes > 1 (None = all cores) sets up years in a pool of worker
+    # processes; every year is written to its own directory, so the output
+    # does not depend on the order in which years finish
+    global shared
+    start = time.time()
+    shared = prepare(pathway,model_year,force)
+    scenario = shared['scenario']
+
+    # must_run_hourly.csv is the same for every year; written here, once
+    setup_series.write('CA',shared['series']['CA'])
+    years = range(0,shared['sim_years'])
+
+    results = []
+    if processes == 1:
+        for i in years:
+            results.append(setup_year(i))
+            print(i)
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        with ctx.Pool(processes,initializer=init,initargs=(shared,)) as pool:
+            for r in pool.imap_unordered(setup_year,years):
+                results.append(r)
+                print(str(r[0]) + ' (' + str(len(results)) + '/' + str(len(years)) + ')')
+        setup_cache.add_index(dict((k,p) for r in results for k,p in r[3].items()))
+
+    report(scenario,results,time.time()-start)
+
+    return None
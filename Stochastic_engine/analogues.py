@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:08:47 2026
+
+@author: jdkern
+
+Analogue selection: for every query row (a synthetic year's feature vector,
+e.g. annual HDD and CDD of each city) the closest candidate row (a copula
+sample or a historical year) by L1 distance. Distances are computed a block
+of query rows at a time against all candidates, so memory stays bounded
+whatever the number of years; a KD-tree (scipy) can be used instead for
+large candidate sets in few dimensions.
+
+Ties go to the last of the equally close candidates, as in the original
+loops (RMSE <= Best_RMSE). Without replacement, queries are served in order
+and each takes the closest candidate not already taken.
+
+    year_list,distance = analogues.nearest(HDD_CDD,Sim_HDD_CDD)
+"""
+
+import numpy as np
+
+# distance entries (query rows x candidates x features) per block
+block_size = 2**22
+
+
+def distances(X,Y):
+
+    # L1 distances (len(X) x len(Y))
+    return np.sum(np.abs(X[:,None,:]-Y[None,:,:]),axis=2)
+
+
+def blocks(X,Y):
+
+    # (first row, distances) of consecutive blocks of query rows
+    rows = max(1,int(block_size/max(1,Y.shape[0]*Y.shape[1])))
+    for start in range(0,len(X),rows):
+        yield start,distances(X[start:start+rows],Y)
+
+
+def last_argmin(D):
+
+    # column of the last minimum of each row
+    return D.shape[1]-1-np.argmin(D[:,::-1],axis=1)
+
+
+def brute(X,Y,replace):
+
+    index = np.zeros(len(X),dtype=int)
+    distance = np.zeros(len(X))
+    taken = np.zeros(len(Y),dtype=bool)
+    for start,D in blocks(X,Y):
+        if replace:
+            k = last_argmin(D)
+            index[start:start+len(D)] = k
+            distance[start:start+len(D)] = D[np.arange(len(D)),k]
+            continue
+        for r in range(0,len(D)):
+            d = np.where(taken,np.inf,D[r])
+            k = len(d)-1-np.argmin(d[::-1])
+            taken[k] = True
+            index[start+r],distance[start+r] = k,d[k]
+
+    return index,distance
+
+
+def kdtree(X,Y,replace):
+
+    from scipy.spatial import cKDTree
+    tree = cKDTree(Y)
+    if replace:
+        distance,index = tree.query(X,k=1,p=1)
+        return index.astype(int),distance
+
+    index = np.zeros(len(X),dtype=int)
+    distance = np.zeros(len(X))
+    taken = np.zeros(len(Y),dtype=bool)
+    for r in range(0,len(X)):
+        # widen the search until a free candidate turns up
+        k = 8
+        while True:
+            d,i = tree.query(X[r],k=min(k,len(Y)),p=1)
+            d,i = np.atleast_1d(d),np.atleast_1d(i)
+            free = np.flatnonzero(~taken[i])
+            if len(free) > 0 or k >= len(Y):
+                break
+            k = k*4
+        taken[i[free[0]]] = True
+        index[r],distance[r] = i[free[0]],d[free[0]]
+
+    return index,distance
+
+
+def nearest(X,Y,replace=True,method='blocked'):
+
+    # index of the closest row of Y for every row of X and its distance;
+    # method 'blocked' (exact, legacy ties) or 'kdtree' (exact distances,
+    # ties in any order)
+    X = np.atleast_2d(np.asarray(X,dtype=float))
+    Y = np.atleast_2d(np.asarray(Y,dtype=float))
+    if not replace and len(X) > len(Y):
+        raise ValueError('without replacement, ' + str(len(X)) + ' queries need as many candidates (' + str(len(Y)) + ')')
+
+    if method == 'kdtree':
+        return kdtree(X,Y,replace)
+    return brute(X,Y,replace)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:08:15 2026
+
+@author: jdkern
+
+Heating (HDD) and cooling (CDD) degree days of daily temperature records
+(days x cities, Fahrenheit) and their annual totals, as array operations over
+all days and cities. Used by the synthetic streamflow scripts for both the
+historical and the synthetic temperatures.
+
+    HDD,CDD = degree_days.daily(T)
+    annual_HDD,annual_CDD = degree_days.annual(HDD),degree_days.annual(CDD)
+"""
+
+import numpy as np
+
+# base temperature (F)
+base = 65
+
+
+def daily(T,base=base):
+
+    # daily degree days, same shape as T
+    T = np.asarray(T,dtype=float)
+
+    return np.maximum(0,base-T),np.maximum(0,T-base)
+
+
+def annual(x,days=365):
+
+    # totals of each complete year of a daily record (days x fields); a
+    # trailing partial year is left out
+    x = np.asarray(x,dtype=float)
+    years = int(len(x)/days)
+
+    return x[:years*days].reshape((years,days) + x.shape[1:]).sum(axis=1)
+
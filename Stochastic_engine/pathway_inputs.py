@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:48 2026
+
+@author: jdkern
+
+Synthetic inputs of one pathway (scenario), loaded once for all simulated
+years. The long multi-century records (load, path flows, wind, solar, natural
+gas prices, daily hydropower) are converted to .npy files in Pathway_cache the
+first time they are read and memory-mapped afterwards, so each model year only
+touches its own 8760 (or 365) rows. A cached file is rebuilt whenever its
+source is newer.
+
+Setups running side by side share the cache: each record is checked, built
+and opened under a lock file (POSIX only), and both of its files are written
+under unique temporary names before being moved into place.
+"""
+
+import os
+import json
+import tempfile
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+cache = 'Pathway_cache'
+
+def sources(scenario):
+
+    # hourly and daily records, name -> (file, read options)
+    return {'load': ('Synthetic_demand_pathflows/Sim_hourly_load_' + scenario + '.csv',{}),
+            'pathflows': ('Synthetic_demand_pathflows/Load_Path_Sim_' + scenario + '.csv',{}),
+            'wind': ('Synthetic_wind_power/wind_power_sim.csv',{}),
+            'solar': ('Synthetic_solar_power/solar_power_sim.csv',{}),
+            'ng': ('Gas_prices/NG.xlsx',{}),
+            'CA_hydro': ('CA_hydropower/CA_hydro_daily.xlsx',{'index_col': 0}),
+            'PNW_hydro': ('PNW_hydro/PNW_hydro_daily.xlsx',{})}
+
+# small daily profiles (365 rows) kept as DataFrames, name -> (file, sheet);
+# sheet None reads every sheet into a dict
+profiles = {'CA_import_mins': ('Path_setup/CA_imports_minflow_profiles.xlsx',0),
+            'PNW_import_mins': ('Path_setup/PNW_imports_minflow_profiles.xlsx',0),
+            'hydro_mins': ('Hydro_setup/Minimum_hydro_profiles.xlsx',0),
+            'CA_export_profiles': ('Path_setup/CA_path_export_profiles.xlsx',None),
+            'PNW_export_profiles': ('Path_setup/PNW_path_export_profiles.xlsx',None)}
+
+
+def read(filename,options):
+
+    if filename.endswith('.csv'):
+        return pd.read_csv(filename,header=0,**options)
+    return pd.read_excel(filename,header=0,**options)
+
+
+@contextmanager
+def locked(filename):
+
+    # exclusive lock on filename + '.lock', released when the file is closed;
+    # no lock where fcntl is missing (Windows)
+    f = open(filename + '.lock','a')
+    try:
+        if fcntl is not None:
+            fcntl.flock(f,fcntl.LOCK_EX)
+        yield
+    finally:
+        f.close()
+
+
+def publish(filename,write,mode):
+
+    # write(f) to a unique temporary file next to filename, then move it into
+    # place
+    handle,tmp = tempfile.mkstemp(dir=os.path.dirname(filename),suffix='.tmp')
+    try:
+        with os.fdopen(handle,mode) as f:
+            write(f)
+        os.replace(tmp,filename)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+    return None
+
+
+def cached(filename,options={}):
+
+    # numeric columns of a csv/xlsx file as a read-only memory map
+    base = os.path.join(cache,filename.replace('/','__'))
+    values_file = base + '.npy'
+    columns_file = base + '.json'
+    os.makedirs(cache,exist_ok=True)
+
+    # the values and the column list are rebuilt and read under one lock, so
+    # a reader never pairs one build's values with another build's columns
+    with locked(base):
+        if not os.path.exists(values_file) or os.path.getmtime(values_file) < os.path.getmtime(filename):
+            df = read(filename,options).select_dtypes(include=[np.number])
+            publish(values_file,lambda f: np.save(f,df.values.astype(float)),'wb')
+            publish(columns_file,lambda f: json.dump([str(c) for c in df.columns],f),'w')
+
+        with open(columns_file) as f:
+            columns = json.load(f)
+        values = np.load(values_file,mmap_mode='r')
+
+    return values,columns
+
+
+def load(scenario):
+
+    # every synthetic input of a pathway; records are (array, columns) pairs
+    inputs = {}
+    for name,(filename,options) in sources(scenario).items():
+        inputs[name] = cached(filename,options)
+    for name,(filename,sheet) in profiles.items():
+        if sheet is None:
+            inputs[name] = pd.read_excel(filename,sheet_name=None,header=None)
+        else:
+            inputs[name] = pd.read_excel(filename,header=0)
+
+    return inputs
+
+
+def years(inputs):
+
+    # number of complete synthetic years in the record
+    return int(len(inputs['CA_hydro'][0])/365)
+
+
+def frame(inputs,name,first,n,columns=None):
+
+    # rows first..first+n-1 of a record as a DataFrame, indexed like the
+    # matching .loc slice of the source file
+    values,names = inputs[name]
+    if columns is None:
+        columns = names
+    block = np.array(values[first:first+n][:,[names.index(c) for c in columns]])
+
+    return pd.DataFrame(block,index=np.arange(first,first+len(block)),columns=columns)
+
+
+def block(inputs,name,years,n,columns=None):
+
+    # (years x n x columns) array, n rows (365 days or 8760 hours) per year
+    values,names = inputs[name]
+    if columns is None:
+        columns = names
+    rows = (np.asarray(years)[:,None]*n + np.arange(n)).ravel()
+    values = values[rows][:,[names.index(c) for c in columns]]
+
+    return values.reshape(len(years),n,len(columns))
+
+
+def profile(inputs,name):
+
+    # private copy of a daily profile table (the setups modify them in place)
+    return inputs[name].copy(deep=True)
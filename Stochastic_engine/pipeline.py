@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:00:58 2026
+
+@author: jdkern
+
+Stochastic engine as a pipeline of stages (weather, streamflow, ORCA, CA
+hydropower, Willamette, FCRPS, wind, solar, scenario parameters, demand and
+path flows, gas prices, UC/ED setup of each pathway/year). Every stage
+declares the files it reads and writes, the code it runs and the parameters it
+depends on; the graph between stages follows from which stage writes which
+file.
+
+A stage is run when one of its outputs is missing or its signature (hash of
+its input files, code and parameters) differs from the last run, recorded in
+pipeline_state.json. Files are rehashed only when their size or modification
+time changes. Since downstream stages hash the files upstream stages write, a
+rerun that produces the same outputs stops there: changing a battery
+coefficient reruns the scenario parameters and the UC/ED setups, but not the
+hydropower models.
+
+Time, peak memory and bytes read/written by each stage (and by the
+checkpoints inside the models, see UCED/instrument.py) go to
+pipeline_report.json.
+
+Synthetic weather and streamflows are 'manual' stages, only run when asked
+for (as they were commented out of stochastic_engine.py).
+
+    python pipeline.py                         # everything that is stale
+    python pipeline.py setup:MID_2020          # one pathway/year and what it needs
+    python pipeline.py --dry-run               # list stale stages
+    python pipeline.py wind --force wind
+    python pipeline.py --adopt                 # record existing outputs as up to date
+"""
+
+import os
+import json
+import time
+import hashlib
+import runpy
+import argparse
+import sys
+sys.path.append('../UCED')
+import instrument
+
+state_file = 'pipeline_state.json'
+# timing, peak memory and io of the stages of the last run (see UCED/instrument.py)
+report_file = 'pipeline_report.json'
+
+pathways = ['MID','EV','BAT','LOWRECOST','HIGHRECOST']
+yrs = [2020,2025,2030,2035,2040,2045,2050]
+
+
+############################################################################
+# stage functions
+
+def weather(stoch_years):
+
+    # synthetic weather (wind speed and temperature) records
+    import synthetic_temp_wind_v3
+    synthetic_temp_wind_v3.synthetic(stoch_years)
+
+
+def streamflow():
+
+    # synthetic streamflow records (a script, run as such)
+    runpy.run_path('synthetic_streamflow_v2.py',run_name='__main__')
+
+
+def orca(sim_years):
+
+    # ORCA, California storage dam releases
+    import main
+    main.sim(sim_years)
+
+
+def ca_hydro(sim_years):
+
+    import CA_hydropower
+    CA_hydropower.hydro(sim_years)
+
+
+def willamette(sim_years):
+
+    import Willamette_launch
+    Willamette_launch.launch(sim_years)
+
+
+def fcrps(sim_years):
+
+    # Federal Columbia River Power System Model (mass balance in Python)
+    import ICF_calc_new
+    ICF_calc_new.calc(sim_years)
+    import FCRPS_New
+    FCRPS_New.simulate(sim_years)
+
+
+def wind(sim_years):
+
+    # hourly wind power production for the BPA and CAISO zones
+    import wind_speed2_wind_power
+    wind_speed2_wind_power.wind_sim(sim_years)
+
+
+def solar(sim_years):
+
+    # hourly solar power production for the CAISO zone
+    import solar_production_simulation2
+    solar_production_simulation2.solar_sim(sim_years)
+
+
+def scenario_parameters():
+
+    # scenario_parameters.csv and EV_load.csv (a script, run as such)
+    runpy.run_path('scenario_param_generator.py',run_name='__main__')
+
+
+def demand():
+
+    # daily peak and hourly electricity demand for each zone and daily flows
+    # along each WECC path, for every pathway/year (a script, run as such)
+    runpy.run_path('demand_pathflows_efficient.py',run_name='__main__')
+
+
+def gas_prices(sim_years):
+
+    # NOTE: NEED SCRIPT HERE TO SIMULATE STOCHASTIC NATURAL GAS PRICES
+    # *OR*
+    # ESTIMATE STATIC GAS PRICES FOR EACH ZONE
+    import numpy as np
+    import pandas as pd
+    ng = np.ones((sim_years*365,5))*np.array([4.47,4.47,4.66,4.66,5.13])
+    NG = pd.DataFrame(ng)
+    NG.columns = ['SCE','SDGE','PGE_valley','PGE_bay','PNW']
+    NG.to_excel('Gas_prices/NG.xlsx')
+
+
+def setup(pathway,year,processes=1):
+
+    # UC/ED model year directories of one pathway/year
+    import UCED_setup
+    UCED_setup.model_setup(pathway,year,processes=processes)
+
+
+############################################################################
+# stages
+
+def capacities(names):
+
+    # scenario parameters of every pathway/year a stage depends on
+    import scenario_table
+    out = {}
+    for p in pathways:
+        for y in yrs:
+            values = scenario_table.lookup(p,y)
+            out[p + '_' + str(y)] = [float(values[scenario_table.row_names.index(n)]) for n in names]
+    return out
+
+
+def stages(stoch_years=103,sim_years=100,processes=1):
+
+    # stages in a valid order; a stage is a dict with name, run (no
+    # arguments), inputs, outputs, code, params (no arguments, returns
+    # something json serialisable) and manual
+    scenarios = [p + '_' + str(y) for p in pathways for y in yrs]
+    s = []
+
+    s.append({'name': 'weather','run': lambda: weather(stoch_years),'manual': True,
+              'inputs': ['Historical_weather_analysis/WIND_TEMP_res.csv','Historical_weather_analysis/Covariance_Calculation.csv'],
+              'outputs': ['Synthetic_weather/synthetic_weather.hdf5'],
+              'code': ['synthetic_temp_wind_v3.py','var_simulation.py','weather_store.py'],
+              'params': lambda: stoch_years})
+
+    s.append({'name': 'streamflow','run': streamflow,'manual': True,
+              'inputs': ['Synthetic_weather/synthetic_weather.hdf5'],
+              'outputs': ['Synthetic_streamflows/synthetic_streamflows_FCRPS.csv','Synthetic_streamflows/synthetic_streamflows_TDA.csv',
+                          'Synthetic_streamflows/synthetic_discharge_Hoover.csv','Synthetic_streamflows/synthetic_streamflows_CA.csv',
+                          'Synthetic_streamflows/synthetic_streamflows_Willamette.csv','cord/data/input/forecast_flows.csv'],
+              'code': ['synthetic_streamflow_v2.py','degree_days.py','analogues.py']})
+
+    s.append({'name': 'orca','run': lambda: orca(sim_years),
+              'inputs': ['cord/data/input/forecast_flows.csv','cord/data/input/runtime_params.ini','cord/scenarios/scenarios_main.json'],
+              'outputs': ['ORCA_output.csv'],
+              'code': ['main.py'],
+              'params': lambda: sim_years})
+
+    s.append({'name': 'ca_hydro','run': lambda: ca_hydro(sim_years),
+              'inputs': ['Synthetic_streamflows/synthetic_streamflows_CA.csv','ORCA_output.csv'],
+              'outputs': ['CA_hydropower/CA_hydro_daily.xlsx'],
+              'code': ['CA_hydropower.py'],
+              'params': lambda: sim_years})
+
+    s.append({'name': 'willamette','run': lambda: willamette(sim_years),
+              'inputs': ['Synthetic_streamflows/synthetic_streamflows_Willamette.csv'],
+              'outputs': ['Willamette/Output/WillametteDAMS_hydropower.xlsx'],
+              'code': ['Willamette_launch.py','Willamette/Willamette_outer.py','Willamette/Willamette_model.py'],
+              'params': lambda: sim_years})
+
+    s.append({'name': 'fcrps','run': lambda: fcrps(sim_years),
+              'inputs': ['Synthetic_streamflows/synthetic_streamflows_FCRPS.csv','Synthetic_streamflows/synthetic_streamflows_TDA.csv',
+                         'Willamette/Output/WillametteDAMS_hydropower.xlsx'],
+              'outputs': ['PNW_hydro/PNW_hydro_daily.xlsx','PNW_hydro/FCRPS/Path_dams.csv'],
+              'code': ['ICF_calc_new.py','FCRPS_New.py'],
+              'params': lambda: sim_years})
+
+    s.append({'name': 'wind','run': lambda: wind(sim_years),
+              'inputs': ['Synthetic_weather/synthetic_weather.hdf5'],
+              'outputs': ['Synthetic_wind_power/wind_power_sim.csv'],
+              'code': ['wind_speed2_wind_power.py'],
+              'params': lambda: [sim_years,capacities(['CAISO_wind_cap','PNW_wind_cap'])]})
+
+    s.append({'name': 'solar','run': lambda: solar(sim_years),
+              'inputs': ['Synthetic_weather/synthetic_weather.hdf5'],
+              'outputs': ['Synthetic_solar_power/solar_power_sim.csv'],
+              'code': ['solar_production_simulation2.py'],
+              'params': lambda: [sim_years,capacities(['CAISO_solar_cap','PNW_solar_cap'])]})
+
+    s.append({'name': 'scenario_parameters','run': scenario_parameters,
+              'inputs': ['cap_wind_solar.csv','reeds_gen_totals.csv','fractions.csv','ev_prof.csv','mwpervehicle.csv'],
+              'outputs': ['scenario_parameters.csv','EV_load.csv'],
+              'code': ['scenario_chooser.py','scenario_table.py','scenario_param_generator.py']})
+
+    s.append({'name': 'demand','run': demand,
+              'inputs': ['EV_load.csv','PNW_hydro/FCRPS/Path_dams.csv','Synthetic_wind_power/wind_power_sim.csv',
+                         'Synthetic_streamflows/synthetic_discharge_Hoover.csv','Synthetic_weather/synthetic_weather.hdf5'],
+              'outputs': ['Synthetic_demand_pathflows/Load_Path_Sim_' + x + '.csv' for x in scenarios] +
+                         ['Synthetic_demand_pathflows/Sim_hourly_load_' + x + '.csv' for x in scenarios],
+              'code': ['demand_pathflows_efficient.py','PNW_demand_scaling.py']})
+
+    s.append({'name': 'gas_prices','run': lambda: gas_prices(sim_years),
+              'inputs': [],
+              'outputs': ['Gas_prices/NG.xlsx'],
+              'code': [],
+              'params': lambda: sim_years})
+
+    for p in pathways:
+        for y in yrs:
+            s.append(setup_stage(p,y,processes))
+
+    return s
+
+
+def setup_stage(pathway,year,processes):
+
+    # UC/ED setup of one pathway/year; of the scenario table it only uses the
+    # battery parameters (wind and solar capacities reach it through the wind
+    # and solar power files, which are inputs)
+    import pathway_inputs
+    import setup_cache
+    scenario = pathway + '_' + str(year)
+    inputs = [f for f,options in pathway_inputs.sources(scenario).values()]
+    inputs += [f for f,sheet in pathway_inputs.profiles.values()]
+    code = ['UCED_setup.py','scenario_table.py']
+    for system in ['CA','PNW']:
+        inputs += setup_cache.depends[system]['tables']
+        code += setup_cache.depends[system]['code']
+
+    def params():
+        import scenario_table
+        values = scenario_table.lookup(pathway,year)
+        # CA and PNW battery capacity, charge and discharge rate coefficients
+        # and efficiency, the four values each system's setup takes
+        return [float(values[k]) for k in [2,5,6,7,8]]
+
+    return {'name': 'setup:' + scenario,
+            'run': lambda: setup(pathway,year,processes),
+            'inputs': sorted(set(inputs)),
+            'outputs': ['../UCED/LR/' + scenario + '/setup_report.csv'],
+            'code': sorted(set(code)),
+            'params': params}
+
+
+############################################################################
+# state
+
+def load_state():
+
+    if not os.path.exists(state_file):
+        return {'files': {},'stages': {}}
+    with open(state_file) as f:
+        return json.load(f)
+
+
+def save_state(state):
+
+    with open(state_file + '.tmp','w') as f:
+        json.dump(state,f,indent=1)
+    os.replace(state_file + '.tmp',state_file)
+
+    return None
+
+
+def file_hash(filename,state):
+
+    # content hash, reused while size and modification time are unchanged
+    if not os.path.exists(filename):
+        return None
+    st = os.stat(filename)
+    stamp = [st.st_size,st.st_mtime_ns]
+    known = state['files'].get(filename)
+    if known is not None and known[0] == stamp:
+        return known[1]
+
+    h = hashlib.sha1()
+    with open(filename,'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20),b''):
+            h.update(chunk)
+    state['files'][filename] = [stamp,h.hexdigest()]
+
+    return h.hexdigest()
+
+
+def signature(stage,state):
+
+    h = hashlib.sha1()
+    for filename in stage['inputs'] + stage['code']:
+        h.update((filename + ':' + str(file_hash(filename,state)) + '\n').encode())
+    if stage.get('params') is not None:
+        h.update(json.dumps(stage['params'](),sort_keys=True).encode())
+
+    return h.hexdigest()
+
+
+############################################################################
+# running
+
+def needed(graph,targets):
+
+    # names of the targets and every stage upstream of them
+    producer = dict((f,st['name']) for st in graph for f in st['outputs'])
+    by_name = dict((st['name'],st) for st in graph)
+    out = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name in out:
+            continue
+        if name not in by_name:
+            raise ValueError('unknown stage ' + name)
+        out.add(name)
+        for f in by_name[name]['inputs']:
+            if f in producer and producer[f] != name:
+                todo.append(producer[f])
+
+    return out
+
+
+def run(targets=None,force=(),dry_run=False,stoch_years=103,sim_years=100,processes=1,adopt=False):
+
+    # runs the stale stages among the targets (default: all non-manual
+    # stages) and their upstream stages; manual stages only run when named
+    # in targets or force. adopt = True records the current signatures of
+    # stages whose outputs exist without running them (first use on a
+    # directory with results)
+    graph = stages(stoch_years,sim_years,processes)
+    if targets is None:
+        targets = [st['name'] for st in graph if not st.get('manual')]
+    selected = needed(graph,list(targets) + list(force))
+    asked = set(targets) | set(force)
+
+    state = load_state()
+    report = []
+    for st in graph:
+        name = st['name']
+        if name not in selected or (st.get('manual') and name not in asked):
+            continue
+
+        sig = signature(st,state)
+        missing = [f for f in st['outputs'] if not os.path.exists(f)]
+        if name in force:
+            reason = 'forced'
+        elif missing:
+            reason = 'missing ' + missing[0]
+        elif state['stages'].get(name) != sig:
+            reason = 'changed'
+        else:
+            report.append((name,'up to date',0.0))
+            continue
+
+        if adopt and not missing:
+            state['stages'][name] = sig
+            report.append((name,'adopted',0.0))
+            continue
+        if dry_run:
+            report.append((name,'stale (' + reason + ')',0.0))
+            continue
+
+        print(name + ': ' + reason)
+        start = time.time()
+        with instrument.stage(name):
+            st['run']()
+        state['stages'][name] = sig
+        save_state(state)
+        report.append((name,'ran (' + reason + ')',time.time()-start))
+
+    save_state(state)
+    instrument.report(report_file,extra=[{'stage': name,'status': status} for name,status,seconds in report])
+    for name,status,seconds in report:
+        print('%-28s %-40s %8.1f s' % (name,status,seconds))
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the stale stages of the stochastic engine')
+    parser.add_argument('targets',nargs='*',help='stages to bring up to date (default: all)')
+    parser.add_argument('--force',action='append',default=[],help='stage to rerun regardless of its state')
+    parser.add_argument('--dry-run',action='store_true',help='only list stale stages')
+    parser.add_argument('--sim-years',type=int,default=100)
+    parser.add_argument('--stoch-years',type=int,default=103)
+    parser.add_argument('--adopt',action='store_true',help='record existing outputs as up to date')
+    parser.add_argument('--processes',type=int,default=1,help='worker processes of the UC/ED setup')
+    args = parser.parse_args()
+    run(args.targets or None,args.force,args.dry_run,args.stoch_years,args.sim_years,args.processes,args.adopt)
@@ -22,22 +22,13 @@ import numpy as np
 
 def choose(pathway, year):
 
-#scenario = 'EV'
-#year=2045
-    scenario = pathway
+    #looked up in the compiled table of all pathways and years (scenario_table.py)
+    import scenario_table
+    return scenario_table.lookup(pathway,year)
+
+
+def read_sources():
 
-    #identifier for outputting scenario parameters to excel file to be read elsewhere
-    identifier = pd.DataFrame([scenario, str(year)])
-    
-    #Specify battery rate of charge, rate of discharge, and efficiency (hard coded here)
-    bat_RoC_coeff = 0.2 #fraction of capacity (multiplied by capacities in setup file)
-    bat_RoD_coeff = 0.8 #fraction of capacity (multiplied by capacities in setup file)
-    bat_eff = 0.85
-    
-    #Specify total average annual load for CA and PNW, in order to calculate additional load due to EVs as a fraction of total load (MW)
-    CA_hist_load = 25865.58304
-    PNW_hist_load = 16994.26555
-    
     #Read csv of ReEDS output data into a dataframe indexed by scenario, state, year, and plant type
     #Includes only outputs of wind, solar, and storage capacity (in case storage capacity is needed later)
     data = pd.read_csv('cap_wind_solar.csv', index_col = ['Scenario','State','Type','Year'])
@@ -65,6 +56,37 @@ def choose(pathway, year):
     #Read CSV of 24 hour EV charging profile
     EV_prof = pd.read_csv('ev_prof.csv', index_col = ['Scenario','Year','Region'])
     MW_per_vehicle_hourly = pd.read_csv('mwpervehicle.csv')
+
+    return {'sums': sums,'gen_totals': gen_totals,'frac': frac,'EV_prof': EV_prof,'MW_per_vehicle_hourly': MW_per_vehicle_hourly}
+
+
+def compute(pathway, year, sources=None):
+
+#scenario = 'EV'
+#year=2045
+    scenario = pathway
+
+    #identifier for outputting scenario parameters to excel file to be read elsewhere
+    identifier = pd.DataFrame([scenario, str(year)])
+    
+    #Specify battery rate of charge, rate of discharge, and efficiency (hard coded here)
+    bat_RoC_coeff = 0.2 #fraction of capacity (multiplied by capacities in setup file)
+    bat_RoD_coeff = 0.8 #fraction of capacity (multiplied by capacities in setup file)
+    bat_eff = 0.85
+    
+    #Specify total average annual load for CA and PNW, in order to calculate additional load due to EVs as a fraction of total load (MW)
+    CA_hist_load = 25865.58304
+    PNW_hist_load = 16994.26555
+    
+    #ReEDS tables, read once per call unless passed in (see scenario_table)
+    if sources is None:
+        sources = read_sources()
+    sums = sources['sums']
+    gen_totals = sources['gen_totals']
+    frac = sources['frac']
+    EV_prof = sources['EV_prof']
+    MW_per_vehicle_hourly = sources['MW_per_vehicle_hourly']
+    
     EV_frac = np.zeros((24,2))
     
     #Retrieve capacity fractions directly from sums dataframe if year is even
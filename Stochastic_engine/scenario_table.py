@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:57:41 2026
+
+@author: jdkern
+
+Compiled scenario parameters. scenario_chooser.compute is evaluated once for
+every pathway and year in the ReEDS tables (2020-2050), reading the tables a
+single time, and the capacities, battery coefficients and 24 hour EV profiles
+are kept in Pathway_cache/scenario_table.npz. The table is rebuilt when one of
+the source files or scenario_chooser.py changes. lookup() returns the same
+list as the old scenario_chooser.choose.
+"""
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import scenario_chooser
+import pathway_inputs
+
+filename = os.path.join(pathway_inputs.cache,'scenario_table.npz')
+sources = ['cap_wind_solar.csv','reeds_gen_totals.csv','fractions.csv','ev_prof.csv','mwpervehicle.csv','scenario_chooser.py']
+
+row_names = ['CAISO_wind_cap','CAISO_solar_cap','CAISO_bat_cap','PNW_wind_cap','PNW_solar_cap','PNW_bat_cap','bat_RoC_coeff','bat_RoD_coeff','bat_eff']
+ev_columns = ['CAISO 24H EV Load','PNW 24H EV Load']
+hours = ['Hour ' + str(x) for x in range(1,25)]
+
+# table of the current process
+table = None
+
+
+def key():
+
+    h = hashlib.sha1()
+    for name in sources:
+        with open(name,'rb') as f:
+            h.update(f.read())
+
+    return h.hexdigest()
+
+
+def build():
+
+    # every pathway/year combination of the ReEDS tables
+    tables = scenario_chooser.read_sources()
+    years = np.arange(2020,2051)
+    pathways = sorted(set(tables['sums'].index.get_level_values('Scenario')))
+
+    keys = []
+    params = []
+    ev = []
+    for pathway in pathways:
+        for year in years:
+            out = scenario_chooser.compute(pathway,int(year),tables)
+            keys.append(pathway + '_' + str(year))
+            params.append([float(x) for x in out[:9]])
+            ev.append(out[9][ev_columns].values)
+
+    return {'key': np.array(key()),
+            'keys': np.array(keys),
+            'params': np.array(params),
+            'ev': np.array(ev)}
+
+
+def load():
+
+    # compiled table, rebuilt when stale
+    global table
+    if table is not None:
+        return table
+
+    k = key()
+    if os.path.exists(filename):
+        with np.load(filename) as data:
+            t = dict((name,data[name]) for name in data.files)
+        if str(t['key']) == k:
+            table = t
+    if table is None:
+        table = build()
+        os.makedirs(pathway_inputs.cache,exist_ok=True)
+        tmp = filename[:-4] + '.tmp.npz'
+        np.savez(tmp,**table)
+        os.replace(tmp,filename)
+    table['row'] = dict((name,i) for i,name in enumerate(table['keys'].tolist()))
+
+    return table
+
+
+def lookup(pathway,year):
+
+    # [CAISO_wind_cap,...,bat_eff,ev_df,identifier] as scenario_chooser.choose
+    t = load()
+    i = t['row'].get(pathway + '_' + str(year))
+    if i is None:
+        return scenario_chooser.compute(pathway,year)
+
+    ev_df = pd.DataFrame(t['ev'][i],index=hours,columns=ev_columns)
+    identifier = pd.DataFrame([pathway,str(year)])
+
+    return t['params'][i].tolist() + [ev_df,identifier]
+
+
+def parameters(pathways,years):
+
+    # scenario parameters (row_names x pathway_year) and 24 hour EV profiles
+    # (one CAISO and one BPA column per pathway_year)
+    t = load()
+    rows = [t['row'][p + '_' + str(y)] for p in pathways for y in years]
+    columns = [p + '_' + str(y) for p in pathways for y in years]
+    param_output = pd.DataFrame(t['params'][rows].T,index=row_names,columns=columns)
+
+    ev = t['ev'][rows]
+    ev_output = pd.DataFrame(ev.transpose(1,0,2).reshape(24,-1),
+                             columns=[c + '_' + r for c in columns for r in ['CAISO','BPA']])
+
+    return param_output,ev_output
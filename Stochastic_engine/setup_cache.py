@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:54:48 2026
+
+@author: jdkern
+
+Content-addressed cache for the UC/ED model year directories written by
+CA_data_setup/PNW_data_setup. Each directory is keyed by a hash of everything
+it is built from: the generator and system tables, the scenario parameters,
+the year slice of the synthetic records and exchange series, and the setup
+code (model code is not part of a directory, see UCED/run_job.py). A
+directory whose stored key still matches is skipped; when another directory
+with the same key already exists, its model inputs are hard-linked instead of
+being written again.
+"""
+
+import os
+import json
+import hashlib
+import shutil
+import numpy as np
+from pathlib import Path
+import pathway_inputs
+
+key_file = 'setup.key'
+index_file = str(Path.cwd().parent) + str(Path('/UCED/LR/setup_cache.json'))
+
+# what a model year directory depends on besides its time series
+depends = {'CA': {'tables': ['CA_data_file/generators.csv','CA_data_file/paths.csv','CA_data_file/wind_caps.xlsx',
+                             'CA_data_file/solar_caps.xlsx','CA_data_file/must_run.xlsx'],
+                  'code': ['CA_data_setup.py','CA_exchange_time_series.py','setup_series.py','pathway_inputs.py',
+                           '../UCED/model_bundle.py','../UCED/run_job.py'],
+                  'zones': ['PGE_valley','PGE_bay','SCE','SDGE'],
+                  'column': '_CAISO'},
+           'PNW': {'tables': ['PNW_data_file/generators.csv','PNW_data_file/must_run.csv'],
+                   'code': ['PNW_data_setup.py','PNW_exchange_time_series.py','setup_series.py','pathway_inputs.py',
+                            '../UCED/model_bundle.py','../UCED/run_job.py'],
+                   'zones': ['PNW'],
+                   'column': '_PNW'}}
+
+
+def year_path(system,scenario,year):
+
+    return str(Path.cwd().parent) + str(Path('/UCED/LR/' + str(scenario) + '/' + system + str(year)))
+
+
+def key(system,scenario,year,params,inputs,exchange):
+
+    # hash of the inputs of one model year directory; params are the scenario
+    # parameters passed to the setup, exchange the frames of this year
+    d = depends[system]
+    h = hashlib.sha1()
+    for filename in d['tables'] + d['code']:
+        if os.path.exists(filename):
+            with open(filename,'rb') as f:
+                h.update(f.read())
+    h.update(repr([float(p) for p in params]).encode())
+
+    # year slice of the synthetic records, only the columns this system reads
+    for name,n,columns in [('load',8760,d['zones']),
+                           ('wind',8760,[scenario + d['column']]),
+                           ('solar',8760,[scenario + d['column']]),
+                           ('ng',365,d['zones'])]:
+        block = pathway_inputs.block(inputs,name,[year],n,columns)
+        h.update(np.ascontiguousarray(block,dtype=float).tobytes())
+    for name in sorted(exchange):
+        h.update(np.ascontiguousarray(exchange[name].values,dtype=float).tobytes())
+
+    return h.hexdigest()
+
+
+def fresh(path,k):
+
+    # directory already built from the same inputs
+    filename = os.path.join(path,key_file)
+    if not os.path.exists(filename):
+        return False
+    with open(filename) as f:
+        return f.read().strip() == k
+
+
+def mark(path,k,index=True):
+
+    # written last, so an interrupted setup is redone next time; worker
+    # processes leave the index to their parent (index = False)
+    with open(os.path.join(path,key_file),'w') as f:
+        f.write(k)
+
+    if index:
+        add_index({k: path})
+
+    return None
+
+
+def add_index(entries):
+
+    # {key: directory} added to the index of built directories
+    if not entries:
+        return None
+    index = load_index()
+    index.update(entries)
+    with open(index_file + '.tmp','w') as f:
+        json.dump(index,f,indent=1)
+    os.replace(index_file + '.tmp',index_file)
+
+    return None
+
+
+def load_index():
+
+    if not os.path.exists(index_file):
+        return {}
+    with open(index_file) as f:
+        return json.load(f)
+
+
+# model inputs written by the setup (the job manifest and simulation results
+# belong to one directory only)
+outputs = ['model.npz','model.json','data.dat','dataLP.dat']
+
+
+def link(k,path):
+
+    # hard-link the model inputs of an identical directory into path; False
+    # if there is none
+    source = load_index().get(k)
+    if source is None or source == path or not fresh(source,k):
+        return False
+
+    os.makedirs(path,exist_ok=True)
+    for name in outputs:
+        if not os.path.isfile(os.path.join(source,name)):
+            continue
+        target = os.path.join(path,name)
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(os.path.join(source,name),target)
+        except OSError:
+            shutil.copy2(os.path.join(source,name),target)
+
+    return True
+
+
+def detach(path):
+
+    # remove hard-linked setup files before a directory is rebuilt, so the
+    # directories sharing them are not overwritten too
+    for name in outputs:
+        filename = os.path.join(path,name)
+        if os.path.isfile(filename) and os.stat(filename).st_nlink > 1:
+            os.remove(filename)
+
+    return None
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:59:30 2026
+
+@author: jdkern
+
+Zonal time series of the UC/ED model years (load, operating reserves, wind,
+solar, must run generation and natural gas prices), built for several
+synthetic years at once from pathway_inputs. CA_data_setup and PNW_data_setup
+take one year of it (frames); must_run_hourly.csv, which is the same for every
+year, is written once per pathway by write().
+"""
+
+import numpy as np
+import pandas as pd
+import pathway_inputs
+
+# zones, wind/solar column suffix and tables of each system; without a
+# capacity table the single zone takes the whole system record
+systems = {'CA': {'zones': ['PGE_valley','PGE_bay','SCE','SDGE'],
+                  'column': '_CAISO',
+                  'wind_caps': 'CA_data_file/wind_caps.xlsx',
+                  'solar_caps': 'CA_data_file/solar_caps.xlsx',
+                  'must_run': 'CA_data_file/must_run.xlsx',
+                  'must_run_hourly': 'CA_data_file/must_run_hourly.csv'},
+           'PNW': {'zones': ['PNW'],
+                   'column': '_PNW',
+                   'wind_caps': None,
+                   'solar_caps': None,
+                   'must_run': 'PNW_data_file/must_run.csv',
+                   'must_run_hourly': None}}
+
+# operating reserves, fraction of system load
+reserve_factor = .04
+
+
+def table(filename):
+
+    if filename.endswith('.csv'):
+        return pd.read_csv(filename,header=0)
+    return pd.read_excel(filename,header=0)
+
+
+def shares(system,name):
+
+    # zonal shares of the system wind or solar record
+    s = systems[system]
+    if s[name] is None:
+        return np.ones(len(s['zones']))
+    return table(s[name]).loc[0,s['zones']].values.astype(float)
+
+
+def must_run(system):
+
+    # hourly must run generation (LFG, ag_waste, nuclear) by zone, 8760 x zones
+    s = systems[system]
+    return np.tile(table(s['must_run']).loc[0,s['zones']].values.astype(float),(8760,1))
+
+
+def transform(inputs,system,scenario,years):
+
+    # (years x hours x zones) and (years x days x zones) arrays; must_run is
+    # the same every year
+    s = systems[system]
+    zones = s['zones']
+    header = scenario + s['column']
+
+    load = pathway_inputs.block(inputs,'load',years,8760,zones)
+
+    return {'load': load,
+            'reserves': load.sum(axis=2)*reserve_factor,
+            'wind': pathway_inputs.block(inputs,'wind',years,8760,[header])*shares(system,'wind_caps'),
+            'solar': pathway_inputs.block(inputs,'solar',years,8760,[header])*shares(system,'solar_caps'),
+            'must_run': must_run(system),
+            'ng': pathway_inputs.block(inputs,'ng',years,365,zones)}
+
+
+def frames(series,k):
+
+    # year k of transform()
+    return dict((name,v if name == 'must_run' else v[k]) for name,v in series.items())
+
+
+def write(system,series):
+
+    # hourly must run file of the system, if it has one
+    filename = systems[system]['must_run_hourly']
+    if filename is not None:
+        pd.DataFrame(series['must_run'],columns=systems[system]['zones']).to_csv(filename)
+
+    return None
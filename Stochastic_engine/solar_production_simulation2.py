@@ -12,6 +12,7 @@ from statsmodels.tsa.arima_model import ARMA
 from datetime import datetime
 from datetime import timedelta
 import scenario_chooser
+import weather_store
 
 def solar_sim(sim_years):
 
@@ -120,8 +121,7 @@ def solar_sim(sim_years):
         locals()[name].fit(x,y)
     #        print(locals()[name].score(x,y))
         
-    Syn_irr=pd.read_csv('Synthetic_weather/synthetic_irradiance_data.csv',header=0,index_col=0)
-    Syn_irr = Syn_irr.loc[0:365*sim_years-1,:]
+    Syn_irr = weather_store.read('irradiance',days=slice(0,365*sim_years))
     
     Normal_Starting=datetime(1900,1,1)
     
@@ -292,8 +292,7 @@ def solar_sim(sim_years):
         locals()[name].fit(x,y)
     #        print(locals()[name].score(x,y))
         
-    Syn_irr=pd.read_csv('Synthetic_weather/synthetic_irradiance_data.csv',header=0,index_col=0)
-    Syn_irr = Syn_irr.loc[0:365*sim_years-1,:]
+    Syn_irr = weather_store.read('irradiance',days=slice(0,365*sim_years))
     
     Normal_Starting=datetime(1900,1,1)
     
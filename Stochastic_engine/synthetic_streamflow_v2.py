@@ -10,8 +10,11 @@ from datetime import datetime
 #from sklearn import linear_model
 import pandas as pd
 import numpy as np
+import degree_days
+import analogues
 #import scipy.stats as st
 import statsmodels.distributions.empirical_distribution as edis
+import weather_store
 #import seaborn as sns; sns.set(color_codes=True)
 #import matplotlib.pyplot as plt
 #########################################################################
@@ -36,13 +39,11 @@ julian=calender[:,2]
 ###############################
 # Synthetic HDD CDD calculation
 
-# Simulation data
-sim_weather=pd.read_csv('Synthetic_weather/synthetic_weather_data.csv',header=0)
-
-
+# Simulation data, temperature fields only
+cities = ['SALEM_T','EUGENE_T','SEATTLE_T','BOISE_T','PORTLAND_T','SPOKANE_T','FRESNO_T','LOS ANGELES_T','SAN DIEGO_T','SACRAMENTO_T','SAN JOSE_T','SAN FRANCISCO_T','TUCSON_T','PHOENIX_T','LAS VEGAS_T']
+sim_weather=weather_store.read('weather',cities)
 
 # Load temperature data only
-cities = ['SALEM_T','EUGENE_T','SEATTLE_T','BOISE_T','PORTLAND_T','SPOKANE_T','FRESNO_T','LOS ANGELES_T','SAN DIEGO_T','SACRAMENTO_T','SAN JOSE_T','SAN FRANCISCO_T','TUCSON_T','PHOENIX_T','LAS VEGAS_T']
 sim_temperature=sim_weather[cities]
 
 # Convert temperatures to Fahrenheit 
@@ -54,23 +55,12 @@ sim_temperature=sim_temperature.values
 num_cities = len(cities)
 num_sim_days = len(sim_temperature)
 
-HDD_sim = np.zeros((num_sim_days,num_cities))
-CDD_sim = np.zeros((num_sim_days,num_cities))
-
 # calculate daily records of heating (HDD) and cooling (CDD) degree days
-for i in range(0,num_sim_days):
-    for j in range(0,num_cities):
-        HDD_sim[i,j] = np.max((0,65-sim_temperature[i,j]))
-        CDD_sim[i,j] = np.max((0,sim_temperature[i,j] - 65))        
+HDD_sim,CDD_sim = degree_days.daily(sim_temperature[:,:num_cities])
 
 # calculate annual totals of heating and cooling degree days for each city
-annual_HDD_sim=np.zeros((int(len(HDD_sim)/365),num_cities))
-annual_CDD_sim=np.zeros((int(len(CDD_sim)/365),num_cities))
-
-for i in range(0,int(len(HDD_sim)/365)):
-    for j in range(0,num_cities):
-        annual_HDD_sim[i,j]=np.sum(HDD_sim[0+(i*365):365+(i*365),j])
-        annual_CDD_sim[i,j]=np.sum(CDD_sim[0+(i*365):365+(i*365),j])
+annual_HDD_sim=degree_days.annual(HDD_sim)
+annual_CDD_sim=degree_days.annual(CDD_sim)
         
    
 ########################################################################
@@ -79,23 +69,12 @@ for i in range(0,int(len(HDD_sim)/365)):
 num_cities = len(cities)
 num_days = len(his_temp_matrix)
 
-# daily records
-HDD = np.zeros((num_days,num_cities))
-CDD = np.zeros((num_days,num_cities))
-
-for i in range(0,num_days):
-    for j in range(0,num_cities):
-        HDD[i,j] = np.max((0,65-his_temp_matrix[i,j+1]))
-        CDD[i,j] = np.max((0,his_temp_matrix[i,j+1] - 65))
+# daily records (first column is the date)
+HDD,CDD = degree_days.daily(his_temp_matrix[:,1:num_cities+1])
 
 # annual sums
-annual_HDD=np.zeros((int(len(HDD)/365),num_cities))
-annual_CDD=np.zeros((int(len(CDD)/365),num_cities))
-
-for i in range(0,int(len(HDD)/365)):
-    for j in range(0,num_cities):
-        annual_HDD[i,j]=np.sum(HDD[0+(i*365):365+(i*365),j])
-        annual_CDD[i,j]=np.sum(CDD[0+(i*365):365+(i*365),j])
+annual_HDD=degree_days.annual(HDD)
+annual_CDD=degree_days.annual(CDD)
         
 ###########################################################################################
 #This section is used for calculating total hydro 
@@ -222,21 +201,8 @@ Sim_HDD=Sim_HDD_CDD[:,:15]
 
 HDD_CDD=np.column_stack((annual_HDD_sim,annual_CDD_sim))
 
-year_list=np.zeros(int(num_sim_days/365))
-Best_RMSE = 9999999999
-CHECK=np.zeros((sim_years,runs))
-
-for i in range(0,sim_years):
-    for j in range(0,runs):
-        RMSE = (np.sum(np.abs(HDD_CDD[i,:]-Sim_HDD_CDD[j,:])))
-        CHECK[i,j]=RMSE
-        if RMSE <= Best_RMSE:
-            year_list[i] = j
-            Best_RMSE=RMSE
-            
-        else:
-            pass
-    Best_RMSE = 9999999999
+# copula sample closest to each synthetic year's HDD and CDD totals
+year_list,year_distance = analogues.nearest(HDD_CDD,Sim_HDD_CDD)
 
 
 
@@ -422,21 +388,7 @@ for i in range(0,sim_years):
 
 # select historical year with most similar spring and summer temperatures
 # to new simulated years
-year_list=np.zeros(sim_years)
-Best_RMSE = 9999999999
-CHECK=np.zeros((sim_years,hist_years))
-
-for i in range(0,sim_years):
-    for j in range(0,hist_years):
-        RMSE = (np.sum(np.abs(monthly_sim_T[3:8,i]-monthly_hist_T[3:8,j])))
-        CHECK[i,j]=RMSE
-        if RMSE <= Best_RMSE:
-            year_list[i] = j
-            Best_RMSE=RMSE
-            
-        else:
-            pass
-    Best_RMSE = 9999999999
+year_list,year_distance = analogues.nearest(monthly_sim_T[3:8,:].T,monthly_hist_T[3:8,:].T)
 
 ################################################################################
 #Generate streamflow 
@@ -10,6 +10,8 @@ from datetime import datetime
 from sklearn import linear_model
 import pandas as pd
 import numpy as np
+import degree_days
+import analogues
 import scipy.stats as st
 
 #########################################################################
@@ -52,23 +54,12 @@ sim_temperature=sim_temperature.values
 num_cities = len(cities)
 num_sim_days = len(sim_temperature)
 
-HDD_sim = np.zeros((num_sim_days,num_cities))
-CDD_sim = np.zeros((num_sim_days,num_cities))
-
 # calculate daily records of heating (HDD) and cooling (CDD) degree days
-for i in range(0,num_sim_days):
-    for j in range(0,num_cities):
-        HDD_sim[i,j] = np.max((0,65-sim_temperature[i,j]))
-        CDD_sim[i,j] = np.max((0,sim_temperature[i,j] - 65))        
+HDD_sim,CDD_sim = degree_days.daily(sim_temperature[:,:num_cities])
 
 # calculate annual totals of heating and cooling degree days for each city
-annual_HDD_sim=np.zeros((int(len(HDD_sim)/365),num_cities))
-annual_CDD_sim=np.zeros((int(len(CDD_sim)/365),num_cities))
-
-for i in range(0,int(len(HDD_sim)/365)):
-    for j in range(0,num_cities):
-        annual_HDD_sim[i,j]=np.sum(HDD_sim[0+(i*365):365+(i*365),j])
-        annual_CDD_sim[i,j]=np.sum(CDD_sim[0+(i*365):365+(i*365),j])
+annual_HDD_sim=degree_days.annual(HDD_sim)
+annual_CDD_sim=degree_days.annual(CDD_sim)
         
    
 ########################################################################
@@ -77,23 +68,12 @@ for i in range(0,int(len(HDD_sim)/365)):
 num_cities = len(cities)
 num_days = len(his_temp_matrix)
 
-# daily records
-HDD = np.zeros((num_days,num_cities))
-CDD = np.zeros((num_days,num_cities))
-
-for i in range(0,num_days):
-    for j in range(0,num_cities):
-        HDD[i,j] = np.max((0,65-his_temp_matrix[i,j+1]))
-        CDD[i,j] = np.max((0,his_temp_matrix[i,j+1] - 65))
+# daily records (first column is the date)
+HDD,CDD = degree_days.daily(his_temp_matrix[:,1:num_cities+1])
 
 # annual sums
-annual_HDD=np.zeros((int(len(HDD)/365),num_cities))
-annual_CDD=np.zeros((int(len(CDD)/365),num_cities))
-
-for i in range(0,int(len(HDD)/365)):
-    for j in range(0,num_cities):
-        annual_HDD[i,j]=np.sum(HDD[0+(i*365):365+(i*365),j])
-        annual_CDD[i,j]=np.sum(CDD[0+(i*365):365+(i*365),j])
+annual_HDD=degree_days.annual(HDD)
+annual_CDD=degree_days.annual(CDD)
         
 ###########################################################################################
 #This section is used for calculating total hydro 
@@ -401,21 +381,7 @@ for i in range(0,sim_years):
 
 # select historical year with most similar spring and summer temperatures
 # to new simulated years
-year_list=np.zeros(sim_years)
-Best_RMSE = 9999999999
-CHECK=np.zeros((sim_years,hist_years))
-
-for i in range(0,sim_years):
-    for j in range(0,hist_years):
-        RMSE = (np.sum(np.abs(monthly_sim_T[3:8,i]-monthly_hist_T[3:8,j])))
-        CHECK[i,j]=RMSE
-        if RMSE <= Best_RMSE:
-            year_list[i] = j
-            Best_RMSE=RMSE
-            
-        else:
-            pass
-    Best_RMSE = 9999999999
+year_list,year_distance = analogues.nearest(monthly_sim_T[3:8,:].T,monthly_hist_T[3:8,:].T)
 
 ################################################################################
 #Generate streamflow 
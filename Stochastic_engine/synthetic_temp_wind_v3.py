@@ -11,296 +11,351 @@ import statsmodels.tsa.vector_ar.var_model as var_model
 import pandas as pd
 import numpy as np
 import random
+import os
+import multiprocessing
 from copy import deepcopy
+import var_simulation
+import weather_store
 
-def synthetic(sim_years):
 #########################################################################
-# This purpose of this script is to use daily temperature and wind profiles, and 
+# This purpose of this script is to use daily temperature and wind profiles, and
 # a covariance matrix that describes statistical dependencies
-# in daily temperature and wind speeds across the 17 National 
+# in daily temperature and wind speeds across the 17 National
 # Climatic Data Center GHN monitoring stations, to creat synthetic records of
 # temperature and wind speed at each station.
 
-# a vector autoregressive model is used to produce cross-correlated residuals 
+# a vector autoregressive model is used to produce cross-correlated residuals
 # and these are layered on top of average daily profiles to arrive at new
 # synthetic records
+
+# synthetic() writes one realization drawn from the global random state, as
+# before, streamed into the columnar weather store (weather_store.py);
+# ensemble() writes any number of realizations, one store file each,
+# realization k drawn from its own stream (child k of SeedSequence(seed)), so
+# it is the same whether it is generated alone or in a batch, in one process
+# or a pool
 #########################################################################
 
-# need to generate 2 additional years of data (FCRPS model will cut first 
-# and last)
-    sim_years = sim_years+3
-    sim_years2= 2* sim_years
-    # read historical time series of daily wind and temperature residuals and 
+# fitted models and profiles of this process (see fit)
+models = None
+
+# even columns temperature, odd columns wind speed
+temp = np.arange(0,34,2)
+wind = np.arange(1,34,2)
+
+
+def fit():
+
+    # read historical time series of daily wind and temperature residuals and
     # covariance matrix
     Residuals=pd.read_csv('Historical_weather_analysis/WIND_TEMP_res.csv')
     Covariance=pd.read_csv('Historical_weather_analysis/Covariance_Calculation.csv')
-    
+
     Solar_Residuals=pd.read_csv('Historical_weather_analysis/res_irr.csv')
     Solar_R=Solar_Residuals.loc[:,'Site1':]
     # pull residual data and convert to numerical form
     R = Residuals.loc[:,'SALEM_T':].values
-    
+
     R=np.column_stack((R,Solar_R))
-    
+
     # there are a few remaining NaNs. We just set those to zero.
     for i in np.argwhere(np.isnan(R)):
         R[i]=0
-        
+
     # establish vector-autoregressive (VAR) model for residuals. Optimal lag was
     # found via AIC to be 1
     model = VAR(R)
     results = model.fit(1)
-    
-    # coefficients of VAR model estimated via least squares regression
-    p = results.params
-    
+
+    # coefficients of VAR model estimated via least squares regression; the
+    # original unrolled expression only carried the first 41 fields as lagged
+    # terms, which is kept so the same records are produced
+    intercept,coefs = var_simulation.coefficients(results.params,1)
+    coefs[0][:,41:] = 0
+
     # use the last values recorded from the historical record as
     # "seeds" (first values) for the VAR model
-    y_seeds = R[-1]
-    
-    
+    y_seeds = deepcopy(R[-1])
+
     #Add 5 to shift the entire distribution and take log
     R=np.log(R+5)
     # pull covariance data out and convert to numerical form
     C=np.cov(np.transpose(R))
-    
+
+    m = {'var1': (intercept,coefs),'seeds1': y_seeds,'mean1': np.mean(R,axis=0).tolist(),'cov1': C}
+
     # average temperature and wind speed profiles
     Ave=pd.read_csv('Historical_weather_analysis/WIND_TEMP_ave.csv',header =0)
-    Ave_TW = Ave.loc[0:364,'SALEM_T':].values
-    
+    m['Ave_TW'] = Ave.loc[0:364,'SALEM_T':].values
+
     # records of standard deviation for each calender day
     Std=pd.read_csv('Historical_weather_analysis/WIND_TEMP_std.csv',header =0)
-    Std_TW = Std.loc[0:364,'SALEM_T':].values
-    
+    m['Std_TW'] = Std.loc[0:364,'SALEM_T':].values
+
     #T_res=pd.read_csv('Temp_res.csv')
     T_ave=pd.read_csv('Historical_weather_analysis/Temp_ave.csv',header=0)
-    Ave_T = T_ave.loc[0:364,'SALEM_T':].values
+    m['Ave_T'] = T_ave.loc[0:364,'SALEM_T':].values
     T_std=pd.read_csv('Historical_weather_analysis/Temp_Std.csv',header=0)
-    Std_T = T_std.loc[0:364,'SALEM_T':].values
+    m['Std_T'] = T_std.loc[0:364,'SALEM_T':].values
     T_res=pd.read_csv('Historical_weather_analysis/Temp_res.csv')
-    
+
     Solar_ave=pd.read_csv('Historical_weather_analysis/ave_irr.csv')
-    S_ave=Solar_ave.loc[:,'Site1':].values
+    m['S_ave'] = Solar_ave.loc[:,'Site1':].values[:365]
     Solar_std=pd.read_csv('Historical_weather_analysis/std_irr.csv')
-    S_std=Solar_std.loc[:,'Site1':].values
-    
-    
+    m['S_std'] = Solar_std.loc[:,'Site1':].values[:365]
+
     Clear_sky=pd.read_csv('Historical_weather_analysis/clear_sky.csv',header=0,index_col=0)
-    Clear_sky=Clear_sky.values
-    # number of simulation days
-    
-    sim_days=sim_years2*365
-    
-    # number of fields (Temps, Wind) to calculate -- two for each station
-    fields = len(C)
-    
-    # a row of random normal samples
-    E_term=np.mean(R,axis=0)
-    
-    # a row of random normal samples for each day of the simulation period
-    E  = np.random.multivariate_normal(E_term.tolist(),C,sim_days)
-    
-    E= np.exp(E)-5
-    
-    # placeholder for simulated residuals
-    sim_residuals = np.zeros((sim_days,fields))
-    
-    # calculate residuals for each day in the simulated record
-    for i in range(0,sim_days):
-        
-        # generate new residual
-        for j in range(1,fields+1):
-            name='y' + str(j)
-            locals()[name] = p[0,j-1] + p[1,j-1]*y_seeds[0]+ p[2,j-1]*y_seeds[1]+ p[3,j-1]*y_seeds[2]+ p[4,j-1]*y_seeds[3]+ p[5,j-1]*y_seeds[4]+ p[6,j-1]*y_seeds[5]+ p[7,j-1]*y_seeds[6]+ p[8,j-1]*y_seeds[7]+ p[9,j-1]*y_seeds[8]+ p[10,j-1]*y_seeds[9]+ p[11,j-1]*y_seeds[10]+ p[12,j-1]*y_seeds[11]+ p[13,j-1]*y_seeds[12]+  p[14,j-1]*y_seeds[13]+ p[15,j-1]*y_seeds[14]+ p[16,j-1]*y_seeds[15]+ p[17,j-1]*y_seeds[16]+ p[18,j-1]*y_seeds[17]+ p[19,j-1]*y_seeds[18]+ p[20,j-1]*y_seeds[19]+ p[21,j-1]*y_seeds[20]+ p[22,j-1]*y_seeds[21]+ p[23,j-1]*y_seeds[22]+ p[24,j-1]*y_seeds[23]+ p[25,j-1]*y_seeds[24]+ p[26,j-1]*y_seeds[25]+ p[27,j-1]*y_seeds[26]+ p[28,j-1]*y_seeds[27]+ p[29,j-1]*y_seeds[28]+ p[30,j-1]*y_seeds[29]+ p[31,j-1]*y_seeds[30]+ p[32,j-1]*y_seeds[31]+ p[33,j-1]*y_seeds[32]+ p[34,j-1]*y_seeds[33] + p[35,j-1]*y_seeds[34]+ p[36,j-1]*y_seeds[35]+ p[37,j-1]*y_seeds[36]+ p[38,j-1]*y_seeds[37]+ p[39,j-1]*y_seeds[38]+ p[40,j-1]*y_seeds[39]+ p[41,j-1]*y_seeds[40]+ E[i,j-1]
-        
-        # pass new residual to the next day as a "seed"
-        for j in range(1,fields+1):
-            name='y' + str(j)
-            y_seeds[j-1]=locals()[name]
-        
-        # simulated residuals
-        for j in range(1,fields+1):
-            name='y' + str(j)
-            sim_residuals[i,j-1] = locals()[name]
-            
-    ################################################
-    # The next step is to simulate each field using the residuals simulated above
-    # and average profiles
-    
-    # synthetic weather as sum of residuals and average profiles, re-seasoned
-    sim_weather=np.zeros((sim_days,fields-10))
-    n=0
-    
-    # for each simulated day
-    for i in range(0,sim_days):
-        for j in range(0,fields-10):
-            if j in range(1,34,2):
-            # adjust simulated residuals so they're unit (=1) standard deviation, re-season, and add back 
-            # mean profile
-                sim_weather[i,j]=(sim_residuals[i,j]*(1/np.std(sim_residuals[:,j]))*Std_TW[n,j]) +Ave_TW[n,j]
-            else:
-                sim_weather[i,j]=(sim_residuals[i,j]*(1/np.std(sim_residuals[:,j]))*Std_T[n,int(j/2)]) +Ave_T[n,int(j/2)]
-            
-            #impose logical constraints on wind speeds
-            if j%2==0:
-                pass
-            else:
-                sim_weather[i,j] = np.max((sim_weather[i,j],0))
-        n=n+1
-        if n >= 365:
-            n=0
-    
-    n=0
-    sim_irr=np.zeros((sim_days,10))
-    for i in range(0,sim_days):
-        for j in range(0,10):
-            sim_irr[i,j]=(sim_residuals[i,j+34]*(1/np.std(sim_residuals[:,j+34]))*S_std[n,j]) +S_ave[n,j]
-        n=n+1
-        if n >= 365:
-            n=0
-            
-    # check for any NaN values
+    m['Clear_sky'] = Clear_sky.values
+
     ############################################################################
     #New_Temp_Model
     #################################################################################
-    
 
-    
     R = T_res.loc[:,'SALEM_T':].values
-    Cov=np.cov(R,rowvar=0)
-    
+    m['cov2'] = np.cov(R,rowvar=0)
+
     # found via AIC to be 1
     model = VAR(R)
     results = model.fit(1)
-    
-    # coefficients of VAR model estimated via least squares regression
-    p = results.params
-    y_seeds = deepcopy(R[-1])
-    
-    C=Cov
-     # number of simulation days
+
+    # coefficients of VAR model estimated via least squares regression; the
+    # original stepped the fields one by one, each seeing the new values of
+    # the fields before it, reproduced with the equivalent simultaneous form
+    intercept,coefs = var_simulation.coefficients(results.params,1)
+    intercept,coefs,_ = var_simulation.sequential(intercept,coefs,np.zeros((0,len(intercept))))
+    m['var2'] = (intercept,coefs)
+    m['raw2'] = var_simulation.coefficients(results.params,1)
+    m['seeds2'] = deepcopy(R[-1])
+
+    #convert to dataframe, send to csv
+    m['headers'] = list(Residuals)[1:]
+    m['headers2'] = list(Solar_Residuals)[1:]
+
+    return m
+
+
+def draws(m,sim_years,rng=None):
+
+    # random inputs of one realization, from a numpy Generator or, if rng is
+    # None, from the global np.random and random states (in the order of the
+    # original script)
+    sim_years2= 2* sim_years
+    if rng is None:
+        # a row of random normal samples for each day of the simulation period
+        E  = np.random.multivariate_normal(m['mean1'],m['cov1'],sim_years2*365)
+        E2 = np.random.multivariate_normal(np.zeros(17),m['cov2'],sim_years*365)
+        picks = np.array([random.randint(0,10) for i in range(0,sim_years)])
+    else:
+        E  = rng.multivariate_normal(m['mean1'],m['cov1'],sim_years2*365)
+        E2 = rng.multivariate_normal(np.zeros(17),m['cov2'],sim_years*365)
+        picks = rng.integers(0,11,sim_years)
+
+    E= np.exp(E)-5
+
+    # the second model added each day's shock twice
+    intercept,coefs = m['raw2']
+    E2 = var_simulation.sequential(intercept,coefs,2*E2)[2]
+
+    return {'E': E,'E2': E2,'picks': picks}
+
+
+def records(m,sim_years,sim_residuals,sim_residuals2,picks):
+
+    # re-seasoned records of one realization from its simulated residuals and
+    # the year of the first record matched to each year of the second
+    sim_years2= 2* sim_years
     sim_days=sim_years*365
-    
-    # number of fields (Temps, Wind) to calculate -- two for each station
-    fields = len(C)
-    
-    # a row of random normal samples
-    E_term=np.mean(R,axis=0)
-    
-    # a row of random normal samples for each day of the simulation period
-    E  = np.random.multivariate_normal(np.zeros(17),C,sim_days)
-    
-    sim_residuals = np.zeros((sim_days,fields))
-    
-    for i in range(0,sim_days):
-        
-    
-        # generate new residual
-        for j in range(1,fields+1):
-            
-            y = p[0,j-1] + p[1,j-1]*y_seeds[0]+ p[2,j-1]*y_seeds[1]+ p[3,j-1]*y_seeds[2]+ p[4,j-1]*y_seeds[3] + E[i,j-1]+ p[5,j-1]*y_seeds[4]+ p[6,j-1]*y_seeds[5]+ p[7,j-1]*y_seeds[6]+ p[8,j-1]*y_seeds[7]+ p[9,j-1]*y_seeds[8]+ p[10,j-1]*y_seeds[9]+ p[11,j-1]*y_seeds[10]+ p[12,j-1]*y_seeds[11]+ p[13,j-1]*y_seeds[12]+  p[14,j-1]*y_seeds[13]+ p[15,j-1]*y_seeds[14]+ p[16,j-1]*y_seeds[15]+ p[17,j-1]* y_seeds[16] + E[i,j-1]
-        
-        # pass new residual to the next day as a "seed"
-     
-       
-            y_seeds[j-1]=y
-        
-        # simulated residuals
-    
-            sim_residuals[i,j-1] = y
-    
-        
-        
-        
+
+    ################################################
+    # The next step is to simulate each field using the residuals simulated above
+    # and average profiles
+
+    # synthetic weather as sum of residuals and average profiles, re-seasoned:
+    # adjust simulated residuals so they're unit (=1) standard deviation, re-season, and add back
+    # mean profile
+    z = var_simulation.standardize(sim_residuals)
+    sim_weather=np.zeros((sim_years2*365,34))
+    sim_weather[:,wind] = var_simulation.reseason(z[:,wind],m['Ave_TW'][:,wind],m['Std_TW'][:,wind])
+    sim_weather[:,temp] = var_simulation.reseason(z[:,temp],m['Ave_T'],m['Std_T'])
+
+    #impose logical constraints on wind speeds
+    sim_weather[:,wind] = np.maximum(sim_weather[:,wind],0)
+
+    sim_irr = var_simulation.reseason(z[:,34:44],m['S_ave'],m['S_std'])
+
+    # wind speeds of the first record, new temperatures re-seasoned
     sim_weather2=np.zeros((sim_days,34))
-    n=0
-    
-    # for each simulated day
-    for i in range(0,sim_days):
-        for j in range(0,34):
-            if j in range(1,34,2):
-            # adjust simulated residuals so they're unit (=1) standard deviation, re-season, and add back 
-            # mean profile
-                sim_weather2[i,j]=sim_weather[i,j]
-            else:
-                sim_weather2[i,j]=(sim_residuals[i,int(j/2)]*(1/np.std(sim_residuals[:,int(j/2)]))*Std_T[n,int(j/2)]) +Ave_T[n,int(j/2)]
-            
-            #impose logical constraints on wind speeds
-            if j%2==0:
-                pass
-            else:
-                sim_weather2[i,j] = np.max((sim_weather2[i,j],0))
-        n=n+1
-        if n >= 365:
-            n=0
-            
+    sim_weather2[:,wind] = sim_weather[:sim_days,wind]
+    sim_weather2[:,temp] = var_simulation.reseason(var_simulation.standardize(sim_residuals2),m['Ave_T'],m['Std_T'])
+
 ################################################################################################################
 #Find the best match between those 2 differnet synthetic sets
     New_T=sim_weather2[:,range(0,34,2)]
     Old_T=sim_weather[:,range(0,34,2)]
-    
+
     New_T=np.reshape(New_T,(sim_years,17,365))
     Old_T=np.reshape(Old_T,(sim_years2,17,365))
-    
+
     New_T_ave=np.mean(New_T,axis=1)
     Old_T_ave=np.mean(Old_T,axis=1)
-    
-    
-    
-    year_list=np.zeros(int(sim_years))
-    Best_RMSE = np.inf
-    CHECK=np.zeros((sim_years,sim_years2))
-    
-    for i in range(0,sim_years):
-        for j in range(0,sim_years2):
-            RMSE = (np.sum(np.abs(New_T_ave[i,:]-Old_T_ave[j,:])))
-            CHECK[i,j]=RMSE
-            if RMSE <= Best_RMSE:
-                year_list[i] = j
-                Best_RMSE=RMSE
-
-            else:
-                pass
-        Best_RMSE = np.inf     
+
+    # distance between every pair of years; each year takes one of its 11
+    # closest matches at random
+    CHECK = np.sum(np.abs(New_T_ave[:,None,:]-Old_T_ave[None,:,:]),axis=2)
     K=np.argsort(CHECK)
-    for i in range(0,sim_years):
-        rand=random.randint(0,10)
-        year_list[i]=K[i,rand]
+    year_list = K[np.arange(sim_years),picks]
+
+    sim_irr[sim_irr<0]=0
+
+    return {'sim_weather': sim_weather,'sim_weather2': sim_weather2,'sim_irr': sim_irr,
+            'year_list': year_list.astype(int)}
+
+
+def blocks(m,r,years=25):
+
+    # final weather and irradiance of records(), 'years' years at a time
+    year_list = r['year_list']
+    for y in range(0,len(year_list),years):
 ################################################################################################################
 #Orgnize data
-    sim_weather3=np.zeros((sim_days,34))
-    for i in range(0,sim_years):
-        sim_weather3[i*365:i*365+365,range(0,34,2)]=sim_weather2[i*365:i*365+365,range(0,34,2)]
-        sim_weather3[i*365:i*365+365,range(1,34,2)]=sim_weather[int(year_list[i])*365:int(year_list[i])*365+365,range(1,34,2)]
-    
-    
-    sim_irr2=np.zeros((sim_days,10))
-    sim_irr[sim_irr<0]=0
-    for i in range(0,sim_years):
-        sim_irr2[i*365:i*365+365,:]=Clear_sky-sim_irr[int(year_list[i])*365:int(year_list[i])*365+365,:]
-    
-    sim_irr2[sim_irr2<0]=0
-#
-    
-    #convert to dataframe, send to csv        
-    H = list(Residuals)
-    headers = H[1:]  
-
-    H2 = list(Solar_Residuals)
-    headers2 = H2[1:]        
-#    df_sim = pd.DataFrame(sim_weather)
-#    df_sim.columns = headers    
-#    df_sim.to_csv('Synthetic_weather/synthetic_weather_data_1.csv')
-    
-    df_sim2 = pd.DataFrame(sim_weather3)
-    df_sim2.columns = headers    
-    df_sim2.to_csv('Synthetic_weather/synthetic_weather_data.csv')
-    
-    df_sim_irr=pd.DataFrame(sim_irr2)
-    df_sim_irr.columns=headers2
-    df_sim_irr.to_csv('Synthetic_weather/synthetic_irradiance_data.csv')
-    
+        chunk = year_list[y:y+years]
+        rows = (chunk[:,None]*365 + np.arange(365)).ravel()
+        days = slice(y*365,(y+len(chunk))*365)
+        sim_weather3=np.zeros((len(rows),34))
+        sim_weather3[:,temp]=r['sim_weather2'][days,temp]
+        sim_weather3[:,wind]=r['sim_weather'][rows][:,wind]
+
+        sim_irr2=np.tile(m['Clear_sky'],(len(chunk),1))-r['sim_irr'][rows]
+
+        sim_irr2[sim_irr2<0]=0
+
+        yield sim_weather3,sim_irr2
+
+
+def weather(m,sim_years,sim_residuals,sim_residuals2,picks):
+
+    # synthetic weather and irradiance of one realization, whole records
+    r = records(m,sim_years,sim_residuals,sim_residuals2,picks)
+    out = list(blocks(m,r))
+
+    return np.vstack([b[0] for b in out]),np.vstack([b[1] for b in out])
+
+
+def residuals(m,sim_years,rngs):
+
+    # one realization per rng (None = global random state); the VAR models
+    # are stepped for all of them at once
+    d = [draws(m,sim_years,rng) for rng in rngs]
+    intercept,coefs = m['var1']
+    res = var_simulation.simulate(intercept,coefs,m['seeds1'],np.stack([x['E'] for x in d]))
+    intercept,coefs = m['var2']
+    res2 = var_simulation.simulate(intercept,coefs,m['seeds2'],np.stack([x['E2'] for x in d]))
+
+    return [(res[k],res2[k],d[k]['picks']) for k in range(0,len(d))]
+
+
+def realizations(m,sim_years,rngs):
+
+    return [weather(m,sim_years,*x) for x in residuals(m,sim_years,rngs)]
+
+
+def store(m,r,sim_years,filename=weather_store.filename):
+
+    # records() streamed into a weather store file a block of years at a time
+    layout = {'weather': m['headers'],'irradiance': m['headers2']}
+    with weather_store.writer(layout,sim_years*365,filename) as write:
+        for sim_weather3,sim_irr2 in blocks(m,r):
+            write('weather',sim_weather3)
+            write('irradiance',sim_irr2)
+
+    return None
+
+
+def synthetic(sim_years,csv=False):
+
+# need to generate 2 additional years of data (FCRPS model will cut first
+# and last)
+    global models
+    if models is None:
+        models = fit()
+    sim_years = sim_years+3
+
+    # the records are streamed into the weather store; csv=True also writes
+    # the legacy csv files from it
+    store(models,records(models,sim_years,*residuals(models,sim_years,[None])[0]),sim_years)
+
+    if csv:
+        for group in weather_store.csv_files:
+            weather_store.export_csv(group)
+
+    return None
+
+
+############################################################################
+# ensembles
+
+def stream(seed,k):
+
+    # random stream of realization k: child k of SeedSequence(seed), the
+    # same as SeedSequence(seed).spawn(n)[k] for any n > k
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed,spawn_key=(k,))))
+
+
+def init():
+
+    # pool worker initializer; forked workers inherit the fitted models
+    global models
+    if models is None:
+        models = fit()
 
     return None
-    
-    
+
+
+def member_file(folder,k):
+
+    # weather store file of realization k of an ensemble
+    return os.path.join(folder,'synthetic_weather_' + str(k) + '.hdf5')
+
+
+def batch(args):
+
+    # realizations ks of an ensemble, written to folder
+    ks,sim_years,seed,folder = args
+    init()
+    out = residuals(models,sim_years,[stream(seed,k) for k in ks])
+    for k,x in zip(ks,out):
+        store(models,records(models,sim_years,*x),sim_years,member_file(folder,k))
+
+    return ks
+
+
+def generate(n,sim_years,seed,first=0):
+
+    # realizations first..first+n-1 as a list of (weather, irradiance) arrays
+    init()
+    return realizations(models,sim_years+3,[stream(seed,k) for k in range(first,first+n)])
+
+
+def ensemble(n,sim_years,seed,first=0,size=8,processes=1,folder='Synthetic_weather/ensemble'):
+
+    # realizations first..first+n-1 written to folder as weather stores
+    # synthetic_weather_<k>.hdf5 (read with weather_store.read(...,
+    # filename=member_file(folder,k))); realizations are generated 'size' at
+    # a time (memory grows with size), batches spread over 'processes' worker
+    # processes (None = all cores)
+    init()
+    os.makedirs(folder,exist_ok=True)
+    ks = list(range(first,first+n))
+    jobs = [(ks[i:i+size],sim_years+3,seed,folder) for i in range(0,n,size)]
+
+    if processes == 1:
+        for job in jobs:
+            batch(job)
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+        with ctx.Pool(processes,initializer=init) as pool:
+            for done in pool.imap_unordered(batch,jobs):
+                print('realizations ' + str(done[0]) + '-' + str(done[-1]))
+
+    return ks
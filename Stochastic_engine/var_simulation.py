@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:03:45 2026
+
+@author: jdkern
+
+Simulation of vector autoregressive (VAR) models fitted with statsmodels, for
+any lag order and number of fields. The state of all fields is advanced with
+one matrix-vector product per day; standardization and re-seasoning of the
+simulated residuals are array operations over the whole record.
+
+    intercept,coefs = var_simulation.coefficients(results.params,1)
+    residuals = var_simulation.simulate(intercept,coefs,seeds,shocks)
+    batch = var_simulation.simulate(intercept,coefs,seeds,np.stack(shocks_of_each_realization))
+    weather = var_simulation.reseason(var_simulation.standardize(residuals),ave,std)
+"""
+
+import numpy as np
+
+
+def coefficients(params,lags):
+
+    # statsmodels VAR params (1 + lags*fields rows: constant, then the fields
+    # at lag 1, lag 2, ...) -> intercept (fields) and coefs (lags x fields x
+    # fields) with y_t = intercept + sum_l coefs[l-1] @ y_t-l
+    params = np.asarray(params)
+    k = params.shape[1]
+    coefs = np.array([params[1+l*k:1+(l+1)*k,:].T for l in range(0,lags)])
+
+    return params[0,:].copy(),coefs
+
+
+def sequential(intercept,coefs,shocks):
+
+    # equivalent simultaneous form of a lag 1 VAR stepped field by field, each
+    # field already seeing the new values of the fields before it:
+    # (I - L) y_t = c + U y_t-1 + e_t, L strictly lower and U the rest of coefs
+    A = coefs[0]
+    L = np.tril(A,-1)
+    N = np.linalg.inv(np.eye(len(A)) - L)
+
+    return N @ intercept,(N @ (A - L))[None,:,:],shocks @ N.T
+
+
+def simulate(intercept,coefs,seeds,shocks):
+
+    # (days x fields) simulated series, or (realizations x days x fields) for
+    # a batch of shocks; seeds are the last observed values (lags x fields,
+    # most recent last, or one row for lag 1) and shocks the innovations of
+    # every simulated day
+    lags,k,_ = coefs.shape
+    seeds = np.asarray(seeds,dtype=float).reshape(-1,k)[-lags:]
+    shocks = np.asarray(shocks,dtype=float)
+    batch = shocks.ndim == 3
+    if not batch:
+        shocks = shocks[None,:,:]
+    n,days,_ = shocks.shape
+
+    # y_t = intercept + B @ [y_t-1, ..., y_t-lags] + e_t, as products summed
+    # over the last axis row by row, so a realization comes out bit for bit
+    # the same alone or in a batch
+    B = np.hstack(list(coefs))[None,:,:]
+    state = np.tile(seeds[::-1].ravel(),(n,1))
+    drift = shocks + intercept
+    out = np.empty((n,days,k))
+    for i in range(0,days):
+        y = (state[:,None,:]*B).sum(axis=2) + drift[:,i]
+        out[:,i] = y
+        if lags > 1:
+            state = np.concatenate((y,state[:,:-k]),axis=1)
+        else:
+            state = y
+
+    return out if batch else out[0]
+
+
+def standardize(residuals):
+
+    # unit (=1) standard deviation per field over the whole record
+    return residuals/np.std(residuals,axis=0)
+
+
+def reseason(z,ave,std,start=0):
+
+    # daily profiles (365 x fields) of mean and standard deviation applied to
+    # standardized series, starting at day of year 'start'
+    doy = (np.arange(len(z)) + start) % len(ave)
+
+    return z*std[doy] + ave[doy]
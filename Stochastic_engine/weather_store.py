@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:07:37 2026
+
+@author: jdkern
+
+Columnar store of the synthetic weather records (Synthetic_weather/
+synthetic_weather.hdf5). Each group (weather, irradiance) holds one
+contiguous float dataset per field (SALEM_T, SALEM_W, ..., Site1, ...), so a
+reader only touches the fields it asks for, and uncompressed fields can be
+memory-mapped. The generator streams blocks of days into it (writer); the
+file appears under its final name only once it is complete.
+
+    with weather_store.writer(layout,days) as write:
+        write('weather',block)
+    T = weather_store.read('weather',['SALEM_T','BOISE_T'])
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import h5py
+from contextlib import contextmanager
+
+filename = 'Synthetic_weather/synthetic_weather.hdf5'
+
+# legacy csv copies of the groups
+csv_files = {'weather': 'Synthetic_weather/synthetic_weather_data.csv',
+             'irradiance': 'Synthetic_weather/synthetic_irradiance_data.csv'}
+
+
+@contextmanager
+def writer(layout,days,filename=filename):
+
+    # layout: group -> field names; yields write(group,block), which appends a
+    # (days x fields) block to the group
+    tmp = filename + '.tmp'
+    position = dict((group,0) for group in layout)
+    f = h5py.File(tmp,'w')
+
+    def write(group,block):
+        g = f[group]
+        start = position[group]
+        block = np.asarray(block,dtype=float)
+        for j,name in enumerate(layout[group]):
+            g[name][start:start+len(block)] = block[:,j]
+        position[group] = start + len(block)
+
+    try:
+        for group,fields in layout.items():
+            g = f.create_group(group)
+            g.attrs['fields'] = np.array(fields,dtype='S')
+            for name in fields:
+                g.create_dataset(name,shape=(days,),dtype='float')
+        yield write
+        for group in layout:
+            if position[group] != days:
+                raise ValueError(group + ': ' + str(position[group]) + ' of ' + str(days) + ' days written')
+    except BaseException:
+        f.close()
+        os.remove(tmp)
+        raise
+    f.close()
+    os.replace(tmp,filename)
+
+    return None
+
+
+def fields(group,filename=filename):
+
+    with h5py.File(filename,'r') as f:
+        return [x.decode() for x in f[group].attrs['fields']]
+
+
+def read(group,names=None,days=None,filename=filename):
+
+    # DataFrame of the named fields (all by default) and days (a slice, all
+    # by default), in the layout of the legacy csv files
+    if days is None:
+        days = slice(None)
+    with h5py.File(filename,'r') as f:
+        g = f[group]
+        if names is None:
+            names = [x.decode() for x in g.attrs['fields']]
+        return pd.DataFrame(dict((name,g[name][days]) for name in names),columns=names)
+
+
+def memmap(group,name,filename=filename):
+
+    # read-only memory map of one field; falls back to reading it when the
+    # dataset is not stored contiguously
+    with h5py.File(filename,'r') as f:
+        d = f[group][name]
+        offset = d.id.get_offset()
+        if offset is None or d.chunks is not None:
+            return d[...]
+        shape,dtype = d.shape,d.dtype
+
+    return np.memmap(filename,mode='r',dtype=dtype,shape=shape,offset=offset)
+
+
+def export_csv(group,csv_file=None,filename=filename,days=365*50):
+
+    # legacy csv copy of a group, written 'days' rows at a time
+    if csv_file is None:
+        csv_file = csv_files[group]
+    names = fields(group,filename)
+    with h5py.File(filename,'r') as f:
+        total = len(f[group][names[0]])
+    for start in range(0,total,days):
+        df = read(group,names,slice(start,start+days),filename)
+        df.index = range(start,start+len(df))
+        df.to_csv(csv_file,mode='w' if start == 0 else 'a',header=start == 0)
+
+    return None
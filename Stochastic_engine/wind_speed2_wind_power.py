@@ -14,6 +14,10 @@ import pandas as pd
 import numpy as np
 #import scipy.stats as st
 import scenario_chooser
+import weather_store
+import sys
+sys.path.append('../UCED')
+import instrument
 
 ########################################################
 # This script uses historical records of hourly wind power
@@ -25,6 +29,7 @@ import scenario_chooser
 # for each sub-zone (PG&E, SCE, SDGE in a separate script)
 ########################################################
 
+@instrument.timed('wind_speed2_wind_power.wind_sim')
 def wind_sim(sim_years):
     
     sim_years = sim_years+3
@@ -84,6 +89,8 @@ def wind_sim(sim_years):
             CAISO_daily[i,y] = np.sum(CAISO_M[y*365+i,:])
             
             
+    instrument.checkpoint('historical profiles')
+
     # Create regression models for predicting daily wind power production as a function of 
     # average daily wind speeds 
             
@@ -115,9 +122,7 @@ def wind_sim(sim_years):
     #pull relevant fields (not all meteorological stations are used in regressions)
     S = list(df_data)
     fields = S[5:]
-    df_sim = pd.read_csv('Synthetic_weather/synthetic_weather_data.csv',header=0)
-    df_sim = df_sim[fields]
-    df_sim = df_sim.loc[0:365*sim_years-1,:]
+    df_sim = weather_store.read('weather',fields,slice(0,365*sim_years))
     
     # add calender to synthetic weather data
     calender = pd.read_excel('Synthetic_wind_power/calender.xlsx',header=0)
@@ -324,6 +329,8 @@ def wind_sim(sim_years):
                 predicted_sim[i,s_index] = p
     
     
+    instrument.checkpoint('regressions')
+
     #####################################################################
     #                       Residual Analysis
     #####################################################################
@@ -383,6 +390,8 @@ def wind_sim(sim_years):
         elif combined_CAISO[i] > np.max(df_data.loc[:,'CAISO']):
             combined_CAISO[i] = np.max(df_data.loc[:,'CAISO'])
     
+    instrument.checkpoint('residuals')
+
     ############################################################################
     # Now we have to use the daily wind power production values (in daily summed 
     # capacity factors) to hourly values
@@ -487,6 +496,8 @@ def wind_sim(sim_years):
             
             dif = np.append(dif,tol)
     
+    instrument.checkpoint('hourly profiles')
+
     #iterate through each scenario
     #Scenarios: 'MID' = Mid-Case (S1), 'EV' = High EV Adoption (S2), 'BAT' = Low Battery Storage Cost (S3)
     #'LOWRECOST' = Low RE Cost / High Gas Price (S4), 'HIGHRECOST' = High RE Cost / Low Gas Price (S5)
@@ -16,6 +16,7 @@ from __future__ import division # This line is used to ensure that int or long d
 from pyomo.environ import * # This command makes the symbols used by Pyomo known to Python
 from pyomo.opt import SolverFactory
 import itertools
+import math
 
 ##Create a solver
 opt = SolverFactory('gurobi')
@@ -666,21 +667,65 @@ def SwitchCon(model,j,i):
 model.SwitchConstraint = Constraint(model.Generators,model.hh_periods,rule = SwitchCon)
 #
 #
+##Min Up/Down time
+# CompactMinUpDown = 0 (default) keeps the original pairwise form, indexed
+# only over its valid (generator,hour,hour) triples. CompactMinUpDown = 1 opts
+# in to the aggregated turn-on/turn-off window form, with one row per valid
+# (generator,hour) pair. Both allow exactly the same commitment schedules.
+model.CompactMinUpDown = Param(within=Binary,default=0)
+
+#startups in hours i < k that keep unit j on through hour k, i.e. the original
+#k < i+minu-1; rounding minu up keeps that for non-integer min up/down times
+def UpWindow(model,j,k):
+    return range(max(1,k-int(math.ceil(value(model.minu[j])))+2),k)
+
+def DownWindow(model,j,k):
+    return range(max(1,k-int(math.ceil(value(model.mind[j])))+2),k)
+
+def MinUpTriples(model):
+    if value(model.CompactMinUpDown) > 0:
+        return []
+    return [(j,i,k) for j in model.Generators for k in model.hh_periods if k < value(model.HorizonHours) for i in UpWindow(model,j,k)]
+model.MinUpTriples = Set(dimen=3,initialize=MinUpTriples)
+
+def MinDownTriples(model):
+    if value(model.CompactMinUpDown) > 0:
+        return []
+    return [(j,i,k) for j in model.Generators for k in model.hh_periods if k < value(model.HorizonHours) for i in DownWindow(model,j,k)]
+model.MinDownTriples = Set(dimen=3,initialize=MinDownTriples)
+
+def MinUpPairs(model):
+    if value(model.CompactMinUpDown) < 1:
+        return []
+    return [(j,k) for j in model.Generators for k in model.hh_periods if k < value(model.HorizonHours) and len(UpWindow(model,j,k)) > 0]
+model.MinUpPairs = Set(dimen=2,initialize=MinUpPairs)
+
+def MinDownPairs(model):
+    if value(model.CompactMinUpDown) < 1:
+        return []
+    return [(j,k) for j in model.Generators for k in model.hh_periods if k < value(model.HorizonHours) and len(DownWindow(model,j,k)) > 0]
+model.MinDownPairs = Set(dimen=2,initialize=MinDownPairs)
+
 ##Min Up time
 def MinUp(model,j,i,k):
-    if i > 0 and k > i and k < min(i+model.minu[j]-1,model.HorizonHours):
-        return model.on[j,i] - model.on[j,i-1] <= model.on[j,k]
-    else:
-        return Constraint.Skip
-model.MinimumUp = Constraint(model.Generators,model.HH_periods,model.HH_periods,rule=MinUp)
+    return model.on[j,i] - model.on[j,i-1] <= model.on[j,k]
+model.MinimumUp = Constraint(model.MinUpTriples,rule=MinUp)
+
+#a unit that started up within the window must still be on
+def MinUpWindow(model,j,k):
+    return sum(model.switch[j,i] for i in UpWindow(model,j,k)) <= model.on[j,k]
+model.MinimumUpWindow = Constraint(model.MinUpPairs,rule=MinUpWindow)
 #
 ##Min Down time
 def MinDown(model,j,i,k):
-   if i > 0 and k > i and k < min(i+model.mind[j]-1,model.HorizonHours):
-       return model.on[j,i-1] - model.on[j,i] <= 1 - model.on[j,k]
-   else:
-       return Constraint.Skip
-model.MinimumDown = Constraint(model.Generators,model.HH_periods,model.HH_periods,rule=MinDown)
+    return model.on[j,i-1] - model.on[j,i] <= 1 - model.on[j,k]
+model.MinimumDown = Constraint(model.MinDownTriples,rule=MinDown)
+
+#a unit that shut down within the window must still be off; shutdowns are
+#switch[j,i] - on[j,i] + on[j,i-1]
+def MinDownWindow(model,j,k):
+    return sum(model.switch[j,i] - model.on[j,i] + model.on[j,i-1] for i in DownWindow(model,j,k)) <= 1 - model.on[j,k]
+model.MinimumDownWindow = Constraint(model.MinDownPairs,rule=MinDownWindow)
 
 #Pumped Storage constraints
 def PSHC(model,j,i):
@@ -6,111 +6,55 @@ Created on Wed May 03 15:01:31 2017
 """
 from __future__ import division
 from sklearn import linear_model
+import os
 import pandas as pd
 import numpy as np
+import price_engine
 
 #==============================================================================
- 
-df_mwh1 = pd.read_csv('mwh_1.csv',header=0)
-df_mwh2 = pd.read_csv('mwh_2.csv',header=0)
-df_mwh3 = pd.read_csv('mwh_3.csv',header=0)
-df_gen = pd.read_csv('generators.csv',header=0)
 
-last_hour = df_mwh1['Time'].iloc[-1]
+zones = ['PGE_valley','PGE_bay','SCE','SDGE']
 
-zonal_prices = np.zeros((last_hour,4))
+def calculate(path='.'):
 
-zones = ['PGE_valley','PGE_bay','SCE','SDGE']
+    # zonal prices of the model year in 'path'
+    hourly,daily = price_engine.prices(path,zones)
+    price_engine.write(hourly,os.path.join(path,'sim_hourly_prices.xlsx'))
+    price_engine.write(daily,os.path.join(path,'sim_daily_prices.xlsx'))
+
+    #########################################################
+    #            Weight by zone and bias correct
+    #########################################################
+
+    #simulated prices
+    df_prices = pd.read_csv(os.path.join(path,'../../CAISO/prices_2010_2011.csv'),header=0)
+
+    #regression
+    X = df_prices.loc[:,:'SDGE']
+    y = df_prices.loc[:,'ICE']
+    reg = linear_model.LinearRegression(fit_intercept=False)
+    reg.fit(X,y)
+
+    SD = pd.DataFrame(reg.predict(daily.values))
+    SD.columns = ['CAISO']
+    price_engine.write(SD,os.path.join(path,'weighted_daily_prices.xlsx'))
+
+    SH = pd.DataFrame(reg.predict(hourly.values))
+    SH.columns = ['CAISO']
+    price_engine.write(SH,os.path.join(path,'weighted_hourly_prices.xlsx'))
+
+    price_engine.mark_done(path,hourly,daily)
+
+    return None
+
+
+def calculate_years(paths):
+
+    for path in paths:
+        calculate(path)
+
+    return None
 
 
-for z in zones:
-    
-    z_index = zones.index(z)
-    
-    z1 = df_mwh1.loc[df_mwh1['Zones']==z]
-    z2 = df_mwh2.loc[df_mwh1['Zones']==z]
-    z3 = df_mwh3.loc[df_mwh1['Zones']==z]
-        
-    for i in range(0,last_hour):
-    
-        h1 = z1.loc[z1['Time']==i+1]
-        h2 = z2.loc[z1['Time']==i+1]
-        h3 = z3.loc[z1['Time']==i+1]
-        
-        o1 = h1.loc[h1['Value']>0]
-        o2 = h2.loc[h2['Value']>0]
-        o3 = h3.loc[h3['Value']>0]
-
-        m1 = np.max(o1.loc[:,'$/MWh'])
-        m2 = np.max(o2.loc[:,'$/MWh'])
-        m3 = np.max(o3.loc[:,'$/MWh'])
-        
-        if np.isnan(m1) > 0:
-            m1 = 0
-        if np.isnan(m2) > 0:
-            m2 = 0
-        if np.isnan(m3) > 0:
-            m3 = 0
-
-        zonal_prices[i,z_index] = np.max((m1,m2,m3))
-        
-
-
-no_hours = last_hour
-no_days = int(no_hours/24)
-
-daily_prices = np.zeros((no_days,4))
-
-for i in range(0,no_days):
-
-    for z in zones:
-        
-        z_index = zones.index(z)
-        
-        daily_prices[i,z_index] = np.mean(zonal_prices[i*24:i*24+24,z_index])
-
-
-hourly = pd.DataFrame(zonal_prices)
-hourly.columns = zones
-hourly.to_excel('sim_hourly_prices.xlsx')
-
-daily = pd.DataFrame(daily_prices)
-daily.columns = zones
-daily.to_excel('sim_daily_prices.xlsx')
-
-#########################################################
-#            Weight by zone and bias correct
-#########################################################
-
-#simulated prices
-df_prices = pd.read_csv('../../CAISO/prices_2010_2011.csv',header=0)
-num_days = int(len(df_prices)/24)
-
-#regression
-X = df_prices.loc[:,:'SDGE']
-y = df_prices.loc[:,'ICE']
-reg = linear_model.LinearRegression(fit_intercept=False)
-reg.fit(X,y)
-
-sim_hourly = np.zeros((no_hours,1))
-sim_daily = np.zeros((no_days,1))
-
-for i in range(0,no_hours):
-    
-    s = hourly.loc[i,:'SDGE'].values
-    s = s.reshape((1,len(s)))
-    sim_hourly[i] = reg.predict(s)
-
-for i in range(0,no_days):
-    
-    s = daily.loc[i,:'SDGE'].values
-    s = s.reshape((1,len(s)))
-    sim_daily[i] = reg.predict(s)
-
-SD = pd.DataFrame(sim_daily)
-SD.columns = ['CAISO']
-SD.to_excel('weighted_daily_prices.xlsx')
-
-SH = pd.DataFrame(sim_hourly)
-SH.columns = ['CAISO']
-SH.to_excel('weighted_hourly_prices.xlsx')
+if __name__ == '__main__':
+    calculate()
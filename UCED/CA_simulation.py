@@ -27,7 +27,9 @@ CA_wrapper.sim(days)
 #                    WHOLESALE ELECTRICITY PRICES
 #
 #import CA_price_calculation
+#CA_price_calculation.calculate()
 import CA_emission_calculation
+CA_emission_calculation.calculate()
 
 # Prices in California need to be translated to a CAISO average price from
 # prices at the four zones. This is done using a regression among historical
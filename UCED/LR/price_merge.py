@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:47:48 2026
+
+@author: jdkern
+
+Merges the simulated prices of many UC/ED model years into one HDF5 store
+(prices_merged.hdf5). Model year directories are discovered in both layouts,
+LR/PNW<i> and LR/<scenario>/PNW<year> (same for CA), and each price file is
+appended to resizable datasets as it is read, keyed by scenario, year and
+time step, with the zone names stored once.
+
+Years that are already in the store are skipped. A year is only merged once
+its price tables are complete: the price calculations write them under a
+temporary name and then prices_done.json with their row counts, and the row
+counts read must match it. Directories from before that marker existed need
+a full year of rows. Anything else is left for a later run, so the merge can
+be re-run while jobs are still going.
+
+    python price_merge.py            # merge everything found under LR
+    python price_merge.py PNW hourly # one system/resolution only
+"""
+
+import os
+import re
+import sys
+import numpy as np
+import pandas as pd
+import json
+import h5py
+
+# price files written by CA_price_calculation / PNW_price_calculation
+price_files = {'hourly': ['sim_hourly_prices.csv','sim_hourly_prices.xlsx'],
+               'daily': ['sim_daily_prices.csv','sim_daily_prices.xlsx']}
+
+# written by price_engine.mark_done once the price files are complete
+done_file = 'prices_done.json'
+
+# rows of a complete year without a marker; a 365 day run records days 1-364
+full_year = {'hourly': (364*24,365*24),'daily': (364,365)}
+
+
+def discover(root='.',systems=('CA','PNW')):
+
+    # (system, scenario, year, path) of every model year directory; the old
+    # flat layout (LR/PNW<i>) gets an empty scenario
+    jobs = []
+    for system in systems:
+        pattern = re.compile('^' + system + r'(\d+)$')
+        for d in os.listdir(root):
+            path = os.path.join(root,d)
+            if not os.path.isdir(path):
+                continue
+            m = pattern.match(d)
+            if m:
+                jobs.append((system,'',int(m.group(1)),path))
+                continue
+            for y in os.listdir(path):
+                m = pattern.match(y)
+                if m and os.path.isdir(os.path.join(path,y)):
+                    jobs.append((system,d,int(m.group(1)),os.path.join(path,y)))
+
+    return sorted(jobs)
+
+
+def expected_rows(path,resolution):
+
+    # row counts a complete price file of the year may have
+    filename = os.path.join(path,done_file)
+    if os.path.exists(filename):
+        try:
+            with open(filename) as f:
+                return (int(json.load(f)[resolution]),)
+        except (ValueError,KeyError):
+            return ()
+    return full_year[resolution]
+
+
+def read_prices(path,resolution):
+
+    # (steps x zones) prices of one model year, or None if there are none yet
+    # or they are not complete
+    for name in price_files[resolution]:
+        filename = os.path.join(path,name)
+        if not os.path.exists(filename):
+            continue
+        try:
+            if name.endswith('.csv'):
+                df = pd.read_csv(filename,header=0,index_col=0)
+            else:
+                df = pd.read_excel(filename,header=0,index_col=0)
+        except Exception:
+            # most likely still being written
+            return None
+        if len(df) not in expected_rows(path,resolution):
+            return None
+        return df
+
+    return None
+
+
+def merged_keys(g):
+
+    # (scenario, year) pairs already in a group
+    if 'year' not in g:
+        return set()
+    scenario = [s.decode() if isinstance(s,bytes) else s for s in g['scenario'][:]]
+    return set(zip(scenario,g['year'][:].tolist()))
+
+
+def append(g,df,scenario,year):
+
+    # add one model year to the resizable datasets of a group
+    zones = [str(c) for c in df.columns]
+    n = len(df)
+    if 'prices' not in g:
+        g.create_dataset('prices',shape=(0,len(zones)),maxshape=(None,len(zones)),dtype='float',
+                         chunks=(8760,len(zones)),compression='gzip')
+        g.create_dataset('scenario',shape=(0,),maxshape=(None,),dtype=h5py.special_dtype(vlen=str),chunks=(8760,))
+        g.create_dataset('year',shape=(0,),maxshape=(None,),dtype='int',chunks=(8760,))
+        g.create_dataset('step',shape=(0,),maxshape=(None,),dtype='int',chunks=(8760,))
+        g.attrs['zones'] = np.array(zones,dtype='S')
+    elif [z.decode() for z in g.attrs['zones']] != zones:
+        raise ValueError('zones of %s %s do not match the store' % (scenario,year))
+
+    n0 = g['prices'].shape[0]
+    for name in ['prices','scenario','year','step']:
+        g[name].resize(n0+n,axis=0)
+    g['prices'][n0:] = df.values
+    g['scenario'][n0:] = [scenario]*n
+    g['year'][n0:] = year
+    g['step'][n0:] = np.arange(n)
+
+    return None
+
+
+def merge(root='.',store='prices_merged.hdf5',systems=('CA','PNW'),resolutions=('hourly','daily')):
+
+    # append every finished model year that is not in the store yet
+    jobs = discover(root,systems)
+    added = 0
+    with h5py.File(os.path.join(root,store),'a') as f:
+        for system in systems:
+            for res in resolutions:
+                g = f.require_group(system + '/' + res)
+                done = merged_keys(g)
+                for s,scenario,year,path in jobs:
+                    if s != system or (scenario,year) in done:
+                        continue
+                    df = read_prices(path,res)
+                    if df is None:
+                        continue
+                    append(g,df,scenario,year)
+                    done.add((scenario,year))
+                    added += 1
+                f.flush()
+
+    print('%d price files merged' % added)
+    return added
+
+
+def load(store,system,resolution):
+
+    # merged prices as a DataFrame with scenario, year and step keys
+    with h5py.File(store,'r') as f:
+        g = f[system + '/' + resolution]
+        df = pd.DataFrame(g['prices'][:],columns=[z.decode() for z in g.attrs['zones']])
+        df.insert(0,'step',g['step'][:])
+        df.insert(0,'year',g['year'][:])
+        df.insert(0,'scenario',[s.decode() if isinstance(s,bytes) else s for s in g['scenario'][:]])
+
+    return df.sort_values(['scenario','year','step'],kind='mergesort').reset_index(drop=True)
+
+
+def export_csv(store,system,resolution,filename):
+
+    # single column csv in scenario/year order, as the old merge scripts wrote
+    # (one zone) or one column per zone
+    df = load(store,system,resolution)
+    prices = df.drop(['scenario','year','step'],axis=1)
+    if prices.shape[1] == 1:
+        prices.columns = [resolution + ' prices']
+    prices.to_csv(filename)
+
+    return None
+
+
+if __name__ == '__main__':
+    systems = (sys.argv[1],) if len(sys.argv) > 1 else ('CA','PNW')
+    resolutions = (sys.argv[2],) if len(sys.argv) > 2 else ('hourly','daily')
+    merge('.',systems=systems,resolutions=resolutions)
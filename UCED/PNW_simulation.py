@@ -24,3 +24,4 @@ import PNW_wrapper
 PNW_wrapper.sim(days)
 
 import PNW_emission_calculation
+PNW_emission_calculation.calculate()
@@ -26,18 +26,31 @@ from pyomo.core import Var
 from pyomo.core import Constraint
 from pyomo.core import Param
 from operator import itemgetter
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import pyomo.environ as pyo
+import horizon
+import results_store
+import model_bundle
+import instrument
 
-def sim(days):
+@instrument.timed('PNW_wrapper.sim')
+def sim(days,solver='gurobi',threads=None,resume=False,checkpoint=30):
+
+    # every 'checkpoint' days the results so far and the carried-over state are
+    # saved to checkpoint.npz; resume = True continues from that file
+    # (checkpoint = 0 turns this off)
     
-    instance = m1.create_instance('data.dat')
-    instance2 = m2.create_instance('dataLP.dat')
+    instance,instance2 = model_bundle.instances(m1,m2)
     
     instance2.dual = pyo.Suffix(direction=pyo.Suffix.IMPORT)
-    opt = SolverFactory("gurobi")
+    opt = SolverFactory(solver)
+    
+    # solver threads, e.g. when several years run side by side on one node
+    if threads is not None:
+        opt.options['threads'] = threads
    
     
     H = instance.HorizonHours
@@ -45,35 +58,23 @@ def sim(days):
     K=range(1,H+1)
     
     
+    instrument.checkpoint('build')
+
     #Space to store results
-    mwh_1=[]
-    mwh_2=[]
-    mwh_3=[]
-    on=[]
-    switch=[]
-    srsv=[]
-    nrsv=[]
-    solar=[]
-    wind=[]
-    flow=[]
-    Generator=[]
-    Duals=[]
-    System_cost = []
-    battery_charge = []
-    battery_discharge =[]
-    battery_state = []
-    wind_curtailment = []
-    solar_curtailment = []
-    wind_curtailment_daily = []
-    solar_curtailment_daily = []
+    buffers,data,meta = results_store.allocate(instance,instance2,days,results_store.PNW_layout)
+    initial = horizon.initial_vars(instance)
 
-    df_generators = pd.read_csv('generators.csv',header=0)
+    start = 1
+    if resume and os.path.exists('checkpoint.npz'):
+        last,state = results_store.load_checkpoint('checkpoint.npz',buffers,meta)
+        horizon.restore_state(initial,state)
+        start = last + 1
     
     instance.ini_on["COLUMBIA_2"] = 1
     instance.ini_mwh_1["COLUMBIA_2"] = 300
         
     #max here can be (1,365)
-    for day in range(1,days):
+    for day in range(start,days):
         
          #load time series data
         for z in instance.zones:
@@ -112,6 +113,8 @@ def sim(days):
         PNW_result = opt.solve(instance,tee=True,symbolic_solver_labels=True)
         instance.solutions.load_from(PNW_result)
         
+        instrument.checkpoint('milp')
+
         ##################
         # record objective function
         
@@ -149,9 +152,10 @@ def sim(days):
                 st = st + instance.st_cost[j]*instance.switch[j,i].value
 
         S = gas + oil + coal + slack + psh + nuclear + st + f_gas + f_oil + f_coal 
-        System_cost.append(S)
 
         
+        instrument.checkpoint('objective')
+
         bat_ch = [] #Initializing empty charge and discharge arrays as a pre-processing step before LP
         bat_dis = []
         bat_state = []
@@ -262,330 +266,84 @@ def sim(days):
         instance2.solutions.load_from(results)   
         
         
-        print ("Duals")
-        
-        # Define curtailment as any time when wind dispatched by the model (e.g., the sum of model.wind for a given hour, zone)
-        # is less than the amount of wind that could be dispatched, (i.e .the value of SimWind for the same zone, hour).
-        # (reported on a daily basis)
+        instrument.checkpoint('lp')
 
-        #append curtailment based on difference between amount dispatched and amount that could be dispatched
-        for i in range(1,25):
-            wind_cur = instance2.HorizonWind['PNW',i].value - instance2.wind['PNW',i].value
-            solar_cur = instance2.HorizonSolar['PNW',i].value - instance2.solar['PNW',i].value
-            wind_curtailment.append(wind_cur)
-            solar_curtailment.append(solar_cur)
-    
-        for c in instance2.component_objects(Constraint, active=True):
-    #        print ("   Constraint",c)
-            cobject = getattr(instance2, str(c))
-            if str(c) == 'Bal5Constraint':
-                for index in cobject:
-                     if int(index>0 and index<25):
-    #                print ("   Constraint",c)
-                         try:
-                             Duals.append((str(c),index+((day-1)*24), instance2.dual[cobject[index]]))
-                         except KeyError:
-                             Duals.append((str(c),index+((day-1)*24),-999))
-    #            print ("      ", index, instance2.dual[cobject[index]])
+        # store the first 24 hours of the day
+        results_store.record(buffers,data,meta,day,instance,instance2,S)
 
-     
-        #The following section is for storing and sorting results
-        for v in instance.component_objects(Var, active=True):
-            varobject = getattr(instance, str(v))
-            a=str(v)
-            if a=='mwh_1':
-             
-             for index in varobject:
-                 
-               name = index[0]     
-               g = df_generators[df_generators['name']==name]
-               seg1 = g['seg1'].values
-               seg1 = seg1[0]  
-                 
-                 
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                    
-                    gas_price = instance.GasPrice['PNW'].value
-                    
-                    
-                    if index[0] in instance.Gas:
-                        marginal_cost = seg1*gas_price
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Gas',marginal_cost))                  
-                    elif index[0] in instance.Coal:
-                        marginal_cost = seg1*2
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Coal',marginal_cost))
-                    elif index[0] in instance.Oil:
-                        marginal_cost = seg1*20
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Oil',marginal_cost))
-                    elif index[0] in instance.Nuclear:
-                        marginal_cost = 10
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Nuclear',marginal_cost))
-                    elif index[0] in instance.PSH:
-                        marginal_cost = 10
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','PSH',marginal_cost))
-                    elif index[0] in instance.Slack:
-                        marginal_cost = 700
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Slack',marginal_cost))               
-                    elif index[0] in instance.Hydro:
-                        marginal_cost = 0
-                        mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Hydro',marginal_cost))                
-                        
-                
-        
-                elif index[0] in instance.WECCImports:
-                    mwh_1.append((index[0],index[1]+((day-1)*24),varobject[index].value,'WECC','imports',0))
-                      
-    
-            if a=='mwh_2':
-           
-             for index in varobject:
-                 
-               name = index[0]     
-               g = df_generators[df_generators['name']==name]
-               seg2 = g['seg2'].values
-               seg2 = seg2[0]  
+        # carry the state at the end of the day over to the next day
+        for j in instance.Generators:
+            if instance.on[j,H] == 1:
+                instance.on[j,0] = 1
+            else: 
+                instance.on[j,0] = 0
+            instance.on[j,0].fixed = True
+                       
+            if instance.mwh_1[j,H].value <=0 and instance.mwh_1[j,H].value>= -0.0001:
+                newval_1=0
+            else:
+                newval_1=instance.mwh_1[j,H].value
+            instance.mwh_1[j,0] = newval_1
+            instance.mwh_1[j,0].fixed = True
+                          
+            if instance.mwh_2[j,H].value <=0 and instance.mwh_2[j,H].value>= -0.0001:
+                newval=0
+            else:
+                newval=instance.mwh_2[j,H].value
+                                     
+            if instance.mwh_3[j,H].value <=0 and instance.mwh_3[j,H].value>= -0.0001:
+                newval2=0
+            else:
+                newval2=instance.mwh_3[j,H].value
+                                      
+                                      
+            instance.mwh_2[j,0] = newval
+            instance.mwh_2[j,0].fixed = True
+            instance.mwh_3[j,0] = newval2
+            instance.mwh_3[j,0].fixed = True 
+            if instance.switch[j,H] == 1:
+                instance.switch[j,0] = 1
+            else:
+                instance.switch[j,0] = 0
+            instance.switch[j,0].fixed = True
+          
+            if instance.srsv[j,H].value <=0 and instance.srsv[j,H].value>= -0.0001:
+                newval_srsv=0
+            else:
+                newval_srsv=instance.srsv[j,H].value
+            instance.srsv[j,0] = newval_srsv 
+            instance.srsv[j,0].fixed = True        
     
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                    
-                    gas_price = instance.GasPrice['PNW'].value
-                    
-                    if index[0] in instance.Gas:
-                        marginal_cost = seg2*gas_price
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Gas',marginal_cost))                  
-                    elif index[0] in instance.Coal:
-                        marginal_cost = seg2*2
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Coal',marginal_cost))
-                    elif index[0] in instance.Oil:
-                        marginal_cost = seg2*20
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Oil',marginal_cost))
-                    elif index[0] in instance.Nuclear:
-                        marginal_cost = 10
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Nuclear',marginal_cost))
-                    elif index[0] in instance.PSH:
-                        marginal_cost = 10
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','PSH',marginal_cost))
-                    elif index[0] in instance.Slack:
-                        marginal_cost = 700
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Slack',marginal_cost))               
-                    elif index[0] in instance.Hydro:
-                        marginal_cost = 0
-                        mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Hydro',marginal_cost))         
-                
-                elif index[0] in instance.WECCImports:
-                    mwh_2.append((index[0],index[1]+((day-1)*24),varobject[index].value,'WECC','imports',0))
-     
-            
-            if a=='mwh_3':
+            if instance.nrsv[j,H].value <=0 and instance.nrsv[j,H].value>= -0.0001:
+                newval_nrsv=0
+            else:
+                newval_nrsv=instance.nrsv[j,H].value
+            instance.nrsv[j,0] = newval_nrsv 
+            instance.nrsv[j,0].fixed = True        
                
-             for index in varobject:
-                 
-               name = index[0]     
-               g = df_generators[df_generators['name']==name]
-               seg3 = g['seg3'].values
-               seg3 = seg3[0]  
-                 
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                    
-                    gas_price = instance.GasPrice['PNW'].value
-                    
-                    if index[0] in instance.Gas:
-                        marginal_cost = seg3*gas_price
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Gas',marginal_cost))                  
-                    elif index[0] in instance.Coal:
-                        marginal_cost = seg3*2
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Coal',marginal_cost))
-                    elif index[0] in instance.Oil:
-                        marginal_cost = seg3*20
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Oil',marginal_cost))
-                    elif index[0] in instance.Nuclear:
-                        marginal_cost = 10
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Nuclear',marginal_cost))
-                    elif index[0] in instance.PSH:
-                        marginal_cost = 10
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','PSH',marginal_cost))
-                    elif index[0] in instance.Slack:
-                        marginal_cost = 700
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Slack',marginal_cost))               
-                    elif index[0] in instance.Hydro:
-                        marginal_cost = 0
-                        mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW','Hydro',marginal_cost))         
-                
-                elif index[0] in instance.WECCImports:
-                    mwh_3.append((index[0],index[1]+((day-1)*24),varobject[index].value,'WECC','imports',0))
-        
-       
-            if a=='on':
-                
-             for index in varobject:
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                 on.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-                 
-            if a == 'bat_discharge':
-                
-                for index in varobject:
-                    if int(index[1]>0 and index[1]<25):
-                        if index[0] in instance.Zone5Battery:
-                            battery_discharge.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-
-            if a == 'bat_charge':
-                
-                for index in varobject:
-                    if int(index[1]>0 and index[1]<25):
-                        if index[0] in instance.Zone5Battery:
-                            battery_charge.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-
+        for j in instance.Zone5Battery:
+                          
+            if instance.bat_SoC[j,24].value <=0 and instance.bat_SoC[j,24].value>= -0.0001:
+                newval_1=0
+            else:
+                newval_1=instance.bat_SoC[j,24].value
 
-            if a == 'bat_SoC':
-                
-                for index in varobject:
-                    if int(index[1]>0 and index[1]<25):
-                        if index[0] in instance.Zone5Battery:
-                            battery_state.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-             
-            if a=='switch':
-            
-             for index in varobject:
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                 switch.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-               
-        
-             
-            if a=='srsv':
-            
-             for index in varobject:
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                 srsv.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-              
-        
-             
-            if a=='nrsv':
-           
-             for index in varobject:
-               if int(index[1]>0 and index[1]<25):
-                if index[0] in instance.Zone5Generators:
-                 nrsv.append((index[0],index[1]+((day-1)*24),varobject[index].value,'PNW'))
-               
-             
-             
-            if a=='solar':
-               
-             for index in varobject:
-               if int(index[1]>0 and index[1]<25):
-                solar.append((index[0],index[1]+((day-1)*24),varobject[index].value))   
-             
-              
-            if a=='wind':
-               
-             for index in varobject:
-               if int(index[1]>0 and index[1]<25):
-                wind.append((index[0],index[1]+((day-1)*24),varobject[index].value))  
-                   
-            for j in instance.Generators:
-                if instance.on[j,H] == 1:
-                    instance.on[j,0] = 1
-                else: 
-                    instance.on[j,0] = 0
-                instance.on[j,0].fixed = True
-                           
-                if instance.mwh_1[j,H].value <=0 and instance.mwh_1[j,H].value>= -0.0001:
-                    newval_1=0
-                else:
-                    newval_1=instance.mwh_1[j,H].value
-                instance.mwh_1[j,0] = newval_1
-                instance.mwh_1[j,0].fixed = True
-                              
-                if instance.mwh_2[j,H].value <=0 and instance.mwh_2[j,H].value>= -0.0001:
-                    newval=0
-                else:
-                    newval=instance.mwh_2[j,H].value
-                                         
-                if instance.mwh_3[j,H].value <=0 and instance.mwh_3[j,H].value>= -0.0001:
-                    newval2=0
-                else:
-                    newval2=instance.mwh_3[j,H].value
-                                          
-                                          
-                instance.mwh_2[j,0] = newval
-                instance.mwh_2[j,0].fixed = True
-                instance.mwh_3[j,0] = newval2
-                instance.mwh_3[j,0].fixed = True 
-                if instance.switch[j,H] == 1:
-                    instance.switch[j,0] = 1
-                else:
-                    instance.switch[j,0] = 0
-                instance.switch[j,0].fixed = True
-              
-                if instance.srsv[j,H].value <=0 and instance.srsv[j,H].value>= -0.0001:
-                    newval_srsv=0
-                else:
-                    newval_srsv=instance.srsv[j,H].value
-                instance.srsv[j,0] = newval_srsv 
-                instance.srsv[j,0].fixed = True        
+            instance.bat_SoC[j,0] = newval_1
+            instance.bat_SoC[j,0].fixed = True
         
-                if instance.nrsv[j,H].value <=0 and instance.nrsv[j,H].value>= -0.0001:
-                    newval_nrsv=0
-                else:
-                    newval_nrsv=instance.nrsv[j,H].value
-                instance.nrsv[j,0] = newval_nrsv 
-                instance.nrsv[j,0].fixed = True        
-                   
-            for j in instance.Zone5Battery:
-                              
-                if instance.bat_SoC[j,24].value <=0 and instance.bat_SoC[j,24].value>= -0.0001:
-                    newval_1=0
-                else:
-                    newval_1=instance.bat_SoC[j,24].value
+        if checkpoint and day % checkpoint == 0:
+            results_store.save_checkpoint('checkpoint.npz',buffers,meta,day,horizon.initial_state(initial))
 
-                instance.bat_SoC[j,0] = newval_1
-                instance.bat_SoC[j,0].fixed = True
-            
+        instrument.checkpoint('record')
         print(day)
     
-    mwh_1_pd=pd.DataFrame(mwh_1,columns=('Generator','Time','Value','Zones','Type','$/MWh'))
-    mwh_2_pd=pd.DataFrame(mwh_2,columns=('Generator','Time','Value','Zones','Type','$/MWh'))
-    mwh_3_pd=pd.DataFrame(mwh_3,columns=('Generator','Time','Value','Zones','Type','$/MWh'))
-    on_pd=pd.DataFrame(on,columns=('Generator','Time','Value','Zones'))
-    battery_charge_pd = pd.DataFrame(battery_charge, columns=('Generator','Time','Value','Zones'))
-    battery_discharge_pd = pd.DataFrame(battery_discharge, columns=('Generator','Time','Value','Zones'))
-    battery_state_pd = pd.DataFrame(battery_state, columns=('Generator','Time','Value','Zones'))    
-    switch_pd=pd.DataFrame(switch,columns=('Generator','Time','Value','Zones'))
-    srsv_pd=pd.DataFrame(srsv,columns=('Generator','Time','Value','Zones'))
-    nrsv_pd=pd.DataFrame(nrsv,columns=('Generator','Time','Value','Zones'))
-    solar_pd=pd.DataFrame(solar,columns=('Zone','Time','Value'))
-    wind_pd=pd.DataFrame(wind,columns=('Zone','Time','Value'))
-    shadow_price=pd.DataFrame(Duals,columns=('Constraint','Time','Value'))
-    objective = pd.DataFrame(System_cost)
-    
-    #sum curtailment every 24 hours to get a daily value
-    for i in range(365):
-        wind_curtailment_daily.append(sum(wind_curtailment[i*24:24*(1+i)]))
-        solar_curtailment_daily.append(sum(solar_curtailment[i*24:24*(1+i)]))
-    
-    #output curtailment to dataframe and then csv
-    wind_curtailment_pd = pd.DataFrame(wind_curtailment_daily)
-    solar_curtailment_pd = pd.DataFrame(solar_curtailment_daily)
-    wind_curtailment_pd.to_csv('wind_curtailment_daily.csv')
-    solar_curtailment_pd.to_csv('solar_curtailment_daily.csv')
-        
-    mwh_1_pd.to_csv('mwh_1.csv')
-    mwh_2_pd.to_csv('mwh_2.csv')
-    mwh_3_pd.to_csv('mwh_3.csv')
-    on_pd.to_csv('on.csv')
-    battery_charge_pd.to_csv('battery_charge.csv')
-    battery_discharge_pd.to_csv('battery_discharge.csv')
-    battery_state_pd.to_csv('battery_state.csv')
-    switch_pd.to_csv('switch.csv')
-    srsv_pd.to_csv('srsv.csv')
-    nrsv_pd.to_csv('nrsv.csv')
-    solar_pd.to_csv('solar_out.csv')
-    wind_pd.to_csv('wind_out.csv')
-    shadow_price.to_csv('shadow_price.csv')
-    objective.to_csv('obj_function.csv')
+    results_store.write_hdf5('results.hdf5',buffers,meta)
+    results_store.export_csv(buffers,meta)
+
+    instrument.checkpoint('write')
+
+    # the run is complete, so a later resume should start over
+    if os.path.exists('checkpoint.npz'):
+        os.remove('checkpoint.npz')
     
     return None
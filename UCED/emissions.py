@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:47:10 2026
+
+@author: jdkern
+
+Emissions accounting for UC/ED dispatch results. Generation (mwh_1 + mwh_2 +
+mwh_3) of every generator is matched to its emission rates
+(CA_emissions_generator.csv / PNW_emissions_generator.csv) once by name, and
+emissions are computed as array products for all hours at once, with hourly,
+monthly and annual rollups by zone.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import h5py
+
+# (output column, emission rate column)
+pollutants = [('NOX lb','NOX lb/MWh'),
+              ('SO2 lb','SO2 lb/MWh'),
+              ('CO2 lb','CO2 lb/MWh'),
+              ('N2O lb','N2O lb/MWh'),
+              ('CO2_equivelent lb','CO2 equivalent lb/MWh')]
+
+days_in_month = [31,28,31,30,31,30,31,31,30,31,30,31]
+
+
+def dispatch_from_store(filename):
+
+    # generators, zones and (generators x hours) total generation from
+    # results.hdf5, reported generators only
+    with h5py.File(filename,'r') as f:
+        m = f['meta']
+        T = int(m.attrs['hours'])
+        names = np.array([x.decode() for x in m['generators'][:]],dtype=object)
+        zones = np.array([x.decode() for x in m['mwh_zone'][:]],dtype=object)
+        keep = zones != ''
+        gen = f['mwh_1'][:,:T] + f['mwh_2'][:,:T] + f['mwh_3'][:,:T]
+
+    return names[keep],zones[keep],gen[keep]
+
+
+def dispatch_from_csv(path):
+
+    # same as dispatch_from_store, from the long-format mwh_1/2/3.csv
+    # tables (all three share the row layout of mwh_1.csv)
+    df = pd.read_csv(os.path.join(path,'mwh_1.csv'),header=0)
+    total = df['Value'].values.copy()
+    for s in [2,3]:
+        total += pd.read_csv(os.path.join(path,'mwh_%d.csv' % s),header=0)['Value'].values
+
+    # one row per generator, in order of first appearance
+    codes,names = pd.factorize(df['Generator'])
+    first = np.unique(codes,return_index=True)[1]
+    zones = df['Zones'].values[first]
+    T = int(df['Time'].max())
+    gen = np.zeros((len(names),T))
+    np.add.at(gen,(codes,df['Time'].values-1),total)
+
+    return np.array(names,dtype=object),np.array(zones,dtype=object),gen
+
+
+def rates(emission_file,names):
+
+    # (generators x pollutants) emission rates in lb/MWh, joined by name once;
+    # generators without an entry (e.g. imports) emit nothing
+    table = pd.read_csv(emission_file,header=0)
+    table = table.drop_duplicates('name').set_index('name')
+    return table.reindex(names)[[r for c,r in pollutants]].fillna(0).values
+
+
+def month_of_hour(T):
+
+    # month (0-11) of each simulated hour, 365 day years
+    days = np.repeat(np.arange(12),days_in_month)
+    days = np.tile(days,int(np.ceil(T/8760.0)))
+    return np.repeat(days,24)[:T]
+
+
+def rollups(names,zones,gen,rate):
+
+    # hourly, monthly and annual emissions by zone
+    T = gen.shape[1]
+    columns = [c for c,r in pollutants]
+    month = month_of_hour(T)
+
+    hourly = []
+    for z in pd.unique(zones):
+        rows = zones == z
+        e = gen[rows].T.dot(rate[rows])
+        h = pd.DataFrame(e,columns=columns)
+        h.insert(0,'Time',np.arange(1,T+1))
+        h.insert(0,'Zone',z)
+        hourly.append(h)
+    hourly = pd.concat(hourly,ignore_index=True)
+
+    # hourly holds one block of T hours per zone
+    monthly = hourly.assign(Month=np.tile(month+1,len(pd.unique(zones))))
+    monthly = monthly.groupby(['Zone','Month'],sort=False)[columns].sum().reset_index()
+    annual = hourly.groupby('Zone',sort=False)[columns].sum()
+    annual.loc['Total'] = annual.sum()
+
+    return hourly,monthly,annual
+
+
+def detail(names,zones,gen,rate):
+
+    # generator-hour table (Emission_calculation.csv), in the row order of
+    # mwh_1.csv: day, then generator, then hour of the day
+    n,T = gen.shape
+    D = int(T/24)
+    e = gen[:,:,None]*rate[:,None,:]
+    e = e[:,:D*24].reshape(n,D,24,-1).transpose(1,0,2,3).reshape(-1,len(pollutants))
+    shape = (D,n,24)
+    df = pd.DataFrame({'Generator': np.broadcast_to(names.reshape(1,n,1),shape).ravel(),
+                       'Zone': np.broadcast_to(zones.reshape(1,n,1),shape).ravel(),
+                       'Time': np.broadcast_to(np.arange(1,D*24+1).reshape(D,1,24),shape).ravel()})
+    for k,(c,r) in enumerate(pollutants):
+        df[c] = e[:,k]
+    return df
+
+
+def load(path,emission_file):
+
+    # dispatch and matching emission rates of one model year directory
+    store = os.path.join(path,'results.hdf5')
+    if os.path.exists(store):
+        names,zones,gen = dispatch_from_store(store)
+    else:
+        names,zones,gen = dispatch_from_csv(path)
+
+    # older model year directories hold their own copy of the emission rates,
+    # otherwise the table next to this module is used
+    filename = os.path.join(path,emission_file)
+    if not os.path.exists(filename):
+        filename = os.path.join(os.path.dirname(os.path.abspath(__file__)),emission_file)
+    return names,zones,gen,rates(filename,names)
+
+
+def calculate(path,emission_file,generator_hours=True):
+
+    # emission tables of one model year directory; the generator-hour table
+    # can be skipped for large ensembles
+    names,zones,gen,rate = load(path,emission_file)
+    hourly,monthly,annual = rollups(names,zones,gen,rate)
+
+    if generator_hours:
+        detail(names,zones,gen,rate).to_csv(os.path.join(path,'Emission_calculation.csv'))
+    hourly.to_csv(os.path.join(path,'Emission_hourly.csv'),index=False)
+    monthly.to_csv(os.path.join(path,'Emission_monthly.csv'),index=False)
+    annual.to_csv(os.path.join(path,'Emission_annual.csv'))
+    np.savetxt(os.path.join(path,'TotalCO2.txt'),[1,annual.loc['Total','CO2_equivelent lb']])
+
+    return annual
+
+
+def ensemble(paths,emission_file):
+
+    # annual and monthly totals of many model years, one year in memory at a
+    # time
+    annual = []
+    monthly = []
+    for p in paths:
+        names,zones,gen,rate = load(p,emission_file)
+        h,m,a = rollups(names,zones,gen,rate)
+        annual.append(a.assign(path=p).reset_index())
+        monthly.append(m.assign(path=p))
+
+    return pd.concat(annual,ignore_index=True),pd.concat(monthly,ignore_index=True)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:20:07 2026
+
+@author: jdkern
+
+Builds the CAISO UC/ED instances once per generator fleet. Every model year
+directory written by CA_data_setup holds its model inputs as a binary bundle
+(model.npz, see model_bundle.py) tagged with a fleet key; directories that
+share a key share one pair of concrete instances and only swap in their own
+time series, instead of loading the whole bundle into new instances.
+
+Only the CAISO model is covered. PNW_wrapper still reads each day's inputs
+from the Sim* parameters of its own instance rather than from a swappable
+series, so PNW model years are built from their directories as before
+(run_job.py, parallel_simulation.py); reusing PNW instances is out of scope.
+
+e.g. from the UCED folder
+
+    import fleet
+    fleet.run(['LR/<scenario>/CA2020','LR/<scenario>/CA2021'],365)
+"""
+
+import os
+import numpy as np
+import horizon
+import model_bundle
+
+# fleet key -> (instance, instance2)
+_models = {}
+
+
+def load_series(path='.'):
+
+    # full year time series and the fleet key of a model year directory;
+    # series.npz in directories written before the bundle existed
+    if model_bundle.exists(path):
+        return model_bundle.series(path)
+    data = np.load(os.path.join(path,'series.npz'))
+    series = {k: data[k] for k in data.files if k != 'fleet'}
+    return str(data['fleet']), series
+
+
+def reset(instance):
+
+    # free the hour 0 variables carried over from the previous simulation
+    for v in horizon.initial_vars(instance):
+        v.fixed = False
+        v.value = None
+    for j in instance.Generators:
+        for t in instance.hh_periods:
+            instance.on[j,t].fixed = False
+            instance.switch[j,t].fixed = False
+
+    return None
+
+
+def models(path='.'):
+
+    # (instance, instance2, series) for the model year in 'path'; the
+    # instances are only created the first time a fleet is seen
+    from CA_dispatch import model as m1
+    from CA_dispatchLP import model as m2
+
+    key,series = load_series(path)
+
+    if key in _models:
+        instance,instance2 = _models[key]
+        reset(instance)
+        reset(instance2)
+    else:
+        instance,instance2 = model_bundle.instances(m1,m2,path)
+        _models[key] = (instance,instance2)
+
+    return instance,instance2,series
+
+
+def run(paths,days,solver='gurobi',persistent=False):
+
+    # simulate several model years (and scenarios) in one process; results
+    # are written into each directory as usual
+    import CA_wrapper
+
+    home = os.getcwd()
+    for path in paths:
+        m = models(path)
+        os.chdir(path)
+        try:
+            CA_wrapper.sim(days,solver=solver,persistent=persistent,models=m)
+        finally:
+            os.chdir(home)
+
+    return None
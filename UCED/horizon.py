@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:12:41 2026
+
+@author: jdkern
+
+Rolling-horizon helpers for the UC/ED wrappers. The full-year (Sim*) time
+series are pulled out of a model instance once as NumPy arrays, and each day
+the matching operating horizon (Horizon*) parameters are pushed back in as a
+batch instead of one index at a time.
+
+When a persistent solver interface is used, the solver model is built once and
+only what depends on the day is refreshed: the right-hand sides of rows whose
+horizon parameters only enter the constant term (set in place), the rows whose
+coefficients depend on them (removed and added again), the bounds of fixed
+variables and the objective.
+"""
+
+import numpy as np
+from pyomo.environ import value
+from pyomo.core import Constraint
+from pyomo.opt import SolverFactory
+from pyomo.core.expr.visitor import identify_mutable_parameters
+from pyomo.core.expr.numvalue import native_numeric_types
+from pyomo.repn import generate_standard_repn
+
+############################################################################
+# (horizon parameter, simulation parameter) pairs for each model
+
+CA_params = {
+    # zone x hour
+    'zonal': [('HorizonDemand','SimDemand'),
+              ('HorizonWind','SimWind'),
+              ('HorizonSolar','SimSolar'),
+              ('HorizonMustRun','SimMustRun')],
+    # hour
+    'hourly': [('HorizonReserves','SimReserves'),
+               ('HorizonPath42_exports','SimPath42_exports'),
+               ('HorizonPath24_exports','SimPath24_exports'),
+               ('HorizonPath45_exports','SimPath45_exports'),
+               ('HorizonPath66_exports','SimPath66_exports'),
+               ('HorizonPath46_SCE_minflow','SimPath46_SCE_imports_minflow'),
+               ('HorizonPath66_minflow','SimPath66_imports_minflow'),
+               ('HorizonPath42_minflow','SimPath42_imports_minflow'),
+               ('HorizonPath61_minflow','SimPath61_imports_minflow'),
+               ('HorizonPGE_valley_hydro_minflow','SimPGE_valley_hydro_minflow'),
+               ('HorizonSCE_hydro_minflow','SimSCE_hydro_minflow')],
+    # day
+    'daily': [('HorizonPath66_imports','SimPath66_imports'),
+              ('HorizonPath46_SCE_imports','SimPath46_SCE_imports'),
+              ('HorizonPath61_imports','SimPath61_imports'),
+              ('HorizonPath42_imports','SimPath42_imports'),
+              ('HorizonPath24_imports','SimPath24_imports'),
+              ('HorizonPath45_imports','SimPath45_imports'),
+              ('HorizonPGE_valley_hydro','SimPGE_valley_hydro'),
+              ('HorizonSCE_hydro','SimSCE_hydro')],
+}
+
+# initial condition (hour 0) variables carried over from one day to the next
+carried_vars = ['on','switch','mwh_1','mwh_2','mwh_3','srsv','nrsv']
+carried_battery_vars = ['bat_SoC']
+
+
+def sim_series(instance,params):
+
+    # read the full simulation period time series out of an instance once
+    zones = list(instance.zones)
+    hours = list(instance.SH_periods)
+    days = list(instance.SD_periods)
+
+    series = {}
+    for h,s in params['zonal']:
+        p = getattr(instance,s)
+        series[s] = np.array([[value(p[z,t]) for t in hours] for z in zones])
+    for h,s in params['hourly']:
+        p = getattr(instance,s)
+        series[s] = np.array([value(p[t]) for t in hours])
+    for h,s in params['daily']:
+        p = getattr(instance,s)
+        series[s] = np.array([value(p[d]) for d in days])
+    series['SimGasPrice'] = np.array([[value(instance.SimGasPrice[z,d]) for d in days] for z in zones])
+
+    return series
+
+
+def store(param,values,rows=None):
+
+    # push an array of horizon values into a mutable parameter; values is
+    # (horizon,) for time indexed parameters or (len(rows),horizon) for
+    # parameters indexed by zone and time
+    values = np.asarray(values,dtype=float)
+    if values.ndim == 1:
+        keys = range(1,len(values)+1)
+    else:
+        keys = [(r,t) for r in rows for t in range(1,values.shape[1]+1)]
+    param.store_values(dict(zip(keys,values.ravel().tolist())))
+
+
+def load_horizon(instance,series,day,params):
+
+    # load the operating horizon that starts on simulation day 'day'
+    H = value(instance.HorizonHours)
+    D = value(instance.HorizonDays)
+    zones = list(instance.zones)
+    hours = slice((day-1)*24,(day-1)*24+H)
+    days = slice(day-1,day-1+D)
+
+    gas = series['SimGasPrice'][:,day-1]
+    instance.GasPrice.store_values(dict(zip(zones,gas.tolist())))
+
+    for h,s in params['zonal']:
+        store(getattr(instance,h),series[s][:,hours],zones)
+    for h,s in params['hourly']:
+        store(getattr(instance,h),series[s][hours])
+    for h,s in params['daily']:
+        store(getattr(instance,h),series[s][days])
+
+    return None
+
+
+############################################################################
+# persistent solver support
+
+def persistent_solver(solver):
+
+    # e.g. 'gurobi' -> 'gurobi_persistent', 'cplex' -> 'cplex_persistent'
+    return SolverFactory(solver + '_persistent')
+
+
+def persistent_available(solver):
+
+    # whether the solver has a working persistent interface here (python
+    # bindings installed and licensed)
+    try:
+        return bool(persistent_solver(solver).available(exception_flag=False))
+    except Exception:
+        return False
+
+
+def horizon_constraints(instance,params):
+
+    # constraints that depend on the horizon parameters, split into
+    # rhs: [(constraint, constant term, bound)] for rows where they only enter
+    # the constant term, so only the right-hand side changes from day to day
+    # rows: constraints where they enter a coefficient (or a range), which
+    # have to be built again
+    names = [h for group in ('zonal','hourly','daily') for h,s in params[group]]
+    ids = set()
+    for n in names:
+        ids.update(id(p) for p in getattr(instance,n).values())
+
+    def depends(e):
+        if type(e) in native_numeric_types:
+            return False
+        return any(id(p) in ids for p in identify_mutable_parameters(e))
+
+    rhs = []
+    rows = []
+    for c in instance.component_data_objects(Constraint,active=True):
+        if not depends(c.expr):
+            continue
+        repn = generate_standard_repn(c.body,compute_values=False)
+        coefs = list(repn.linear_coefs) + list(repn.quadratic_coefs)
+        if repn.nonlinear_expr is not None or any(depends(a) for a in coefs):
+            rows.append(c)
+        elif c.equality or not c.has_lb():
+            rhs.append((c,repn.constant,c.upper))
+        elif not c.has_ub():
+            rhs.append((c,repn.constant,c.lower))
+        else:
+            rows.append(c)
+
+    return rhs,rows
+
+
+def initial_vars(instance):
+
+    # hour 0 variables that are fixed to the end of the previous day
+    v = []
+    for name in carried_vars:
+        var = getattr(instance,name)
+        v.extend(var[j,0] for j in instance.Generators)
+    for name in carried_battery_vars:
+        if hasattr(instance,name):
+            var = getattr(instance,name)
+            v.extend(var[j,t] for j,t in var if t == 0)
+    return v
+
+
+def initial_state(fixed):
+
+    # values of the hour 0 variables, e.g. for a checkpoint
+    return np.array([x.value for x in fixed],dtype=float)
+
+
+def restore_state(fixed,state):
+
+    # fix the hour 0 variables to a saved state
+    for x,s in zip(fixed,state):
+        x.fix(float(s))
+
+    return None
+
+
+def set_instance(opt,instance,fixed,params):
+
+    # load the model into the solver with the given variables free, so they
+    # become columns rather than constants folded into the rows, then fix
+    # them again through their bounds; later changes to their values then
+    # only need update_var. Returns the horizon constraints, split while the
+    # variables are free so the constant terms match the solver's rows
+    values = [(v,v.value) for v in fixed if v.fixed]
+    for v,x in values:
+        v.unfix()
+    opt.set_instance(instance,symbolic_solver_labels=True)
+    cons = horizon_constraints(instance,params)
+    for v,x in values:
+        v.fix(x)
+        opt.update_var(v)
+
+    # without in-place right-hand sides (e.g. cplex_persistent) every
+    # dependent row is built again
+    if not hasattr(opt,'set_linear_constraint_attr'):
+        cons = [],[c for c,constant,bound in cons[0]] + cons[1]
+
+    return cons
+
+
+def update_persistent(opt,instance,cons,fixed):
+
+    # refresh the right-hand sides and rows that depend on the day, the bounds
+    # of the fixed variables and the (gas price dependent) objective
+    rhs,rows = cons
+    for c,constant,bound in rhs:
+        opt.set_linear_constraint_attr(c,'RHS',value(bound) - value(constant))
+    for c in rows:
+        opt.remove_constraint(c)
+        opt.add_constraint(c)
+    for v in fixed:
+        opt.update_var(v)
+    opt.set_objective(instance.SystemCost)
+
+    return None
+
+
+############################################################################
+# fixed-commitment LP (price pass)
+
+def commitment_pairs(instance,instance2,hours):
+
+    # (MILP variable, LP variable) pairs of the unit commitment decisions
+    pairs = []
+    for name in ['on','switch']:
+        v1 = getattr(instance,name)
+        v2 = getattr(instance2,name)
+        pairs.extend((v1[j,t],v2[j,t]) for j in instance.Generators for t in hours)
+    return pairs
+
+
+def fix_commitment(pairs):
+
+    # fix the LP commitment to the (rounded) MILP solution and return the LP
+    # variables whose bounds actually changed
+    changed = []
+    for v1,v2 in pairs:
+        x = int(round(v1.value))
+        if not v2.fixed or v2.value != x:
+            v2.fix(x)
+            changed.append(v2)
+    return changed
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:02:41 2026
+
+@author: jdkern
+
+Timing, memory and I/O counters of the stages of a run, collected into one
+JSON report. A stage is a block (stage), a function (timed) or the stretch
+between two checkpoints inside a timed function. Stages nest ('wind_sim/fit')
+and a stage entered several times (e.g. one solve per day) keeps one record
+with its number of calls.
+
+Per stage: wall and CPU seconds, the peak resident set size of the process at
+its end (a high water mark, so it only grows) and the bytes read and written
+(/proc/self/io, Linux only; None elsewhere). Worker processes are counted by
+their parent only through children_peak_rss_mb of the report.
+
+    import instrument
+
+    @instrument.timed('wind_sim')
+    def wind_sim(sim_years):
+        ...
+        instrument.checkpoint('read')
+        ...
+        instrument.checkpoint('fit')
+
+    with instrument.stage('solve'):
+        ...
+
+    instrument.report('run_report.json')
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import functools
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# stage records by full name, in order of first use
+records = {}
+# open stages: [name, snapshot at start, snapshot at last checkpoint]
+stack = []
+started = time.time()
+
+
+def peak_rss_mb(who=None):
+
+    # peak resident set size in MB (ru_maxrss is in kB on Linux, bytes on macOS)
+    if resource is None:
+        return None
+    if who is None:
+        who = resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    return peak/1024**2 if sys.platform == 'darwin' else peak/1024
+
+
+def io_bytes():
+
+    # bytes read and written by the process, storage and otherwise
+    try:
+        with open('/proc/self/io') as f:
+            counters = dict(line.split(': ') for line in f.read().splitlines())
+    except (OSError,ValueError):
+        return None
+    return {'read': int(counters['rchar']),'written': int(counters['wchar']),
+            'disk_read': int(counters['read_bytes']),'disk_written': int(counters['write_bytes'])}
+
+
+def snapshot():
+
+    return {'wall': time.perf_counter(),'cpu': time.process_time(),'io': io_bytes()}
+
+
+def add(name,a,b):
+
+    # adds the interval a..b to the record of a stage
+    r = records.get(name)
+    if r is None:
+        r = records[name] = {'name': name,'calls': 0,'seconds': 0.0,'cpu_seconds': 0.0,'max_seconds': 0.0,
+                             'peak_rss_mb': None,'read_bytes': None,'written_bytes': None,
+                             'disk_read_bytes': None,'disk_written_bytes': None}
+    seconds = b['wall'] - a['wall']
+    r['calls'] += 1
+    r['seconds'] += seconds
+    r['cpu_seconds'] += b['cpu'] - a['cpu']
+    r['max_seconds'] = max(r['max_seconds'],seconds)
+    r['peak_rss_mb'] = peak_rss_mb()
+    if a['io'] is not None and b['io'] is not None:
+        for k in ['read','written','disk_read','disk_written']:
+            r[k + '_bytes'] = (r[k + '_bytes'] or 0) + b['io'][k] - a['io'][k]
+
+    return r
+
+
+def full_name(name):
+
+    return '/'.join([s[0] for s in stack] + [name])
+
+
+@contextmanager
+def stage(name):
+
+    s = snapshot()
+    stack.append([full_name(name),s,s])
+    try:
+        yield
+    finally:
+        path,start,last = stack.pop()
+        end = snapshot()
+        # time after the last checkpoint of the stage
+        if last is not start:
+            add(path + '/rest',last,end)
+        add(path,start,end)
+
+
+def timed(name=None):
+
+    # decorator; the stage is named after the function by default
+    def wrap(f):
+        @functools.wraps(f)
+        def inner(*args,**kwargs):
+            with stage(name or f.__module__ + '.' + f.__name__):
+                return f(*args,**kwargs)
+        return inner
+
+    return wrap
+
+
+def checkpoint(name):
+
+    # closes the part of the current stage since its last checkpoint (or
+    # start) under name; does nothing outside a stage
+    if not stack:
+        return None
+    s = snapshot()
+    add(stack[-1][0] + '/' + name,stack[-1][2],s)
+    stack[-1][2] = s
+
+    return None
+
+
+def reset():
+
+    global started
+    records.clear()
+    del stack[:]
+    started = time.time()
+
+    return None
+
+
+def report(filename,extra=None):
+
+    # run report as JSON, written atomically; extra is added as is
+    out = {'started': time.strftime('%Y-%m-%d %H:%M:%S',time.localtime(started)),
+           'seconds': time.time() - started,
+           'host': socket.gethostname(),
+           'pid': os.getpid(),
+           'argv': sys.argv,
+           'cwd': os.getcwd(),
+           'peak_rss_mb': peak_rss_mb(),
+           'children_peak_rss_mb': peak_rss_mb(resource.RUSAGE_CHILDREN) if resource is not None else None,
+           'io': io_bytes(),
+           'stages': list(records.values())}
+    if extra is not None:
+        out['extra'] = extra
+
+    with open(filename + '.tmp','w') as f:
+        json.dump(out,f,indent=1)
+    os.replace(filename + '.tmp',filename)
+
+    return out
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:05:12 2026
+
+@author: jdkern
+
+Compares the minimum up/down time formulations: the original dense form (a
+rule over Generators x HH x HH returning Constraint.Skip outside the window,
+rebuilt here since the models no longer carry it), the pairwise form over
+valid triples and the compact (turn-on/turn-off window) form. Reports
+instance build time and problem size for one operating horizon. Run from the
+UCED folder with a model year directory (binary model inputs, see
+model_bundle.py) or a .dat file, e.g.
+
+    python minupdown_benchmark.py CA LR/<scenario>/CA2020
+    python minupdown_benchmark.py PNW LR/<scenario>/PNW2020/data.dat
+"""
+
+import sys
+import time
+import os
+import tempfile
+from pyomo.core import Constraint
+from pyomo.environ import value
+from pyomo.core.expr.visitor import identify_variables
+import model_bundle
+
+
+def with_option(data_file,compact):
+
+    # copy of the .dat file with the formulation switch set
+    f = open(data_file,'r')
+    text = f.read()
+    f.close()
+    handle,path = tempfile.mkstemp(suffix='.dat')
+    os.close(handle)
+    f = open(path,'w')
+    f.write(text)
+    f.write('\nparam CompactMinUpDown := %d;\n' % compact)
+    f.close()
+    return path
+
+
+def create(model,data,compact):
+
+    # instance with the formulation switch set, and its build time
+    if os.path.isdir(data):
+        d = model_bundle.pyomo_data(*model_bundle.load(data),model=model)
+        d[None]['CompactMinUpDown'] = {None: compact}
+        start = time.time()
+        instance = model.create_instance(data=d)
+        return instance,time.time() - start
+
+    path = with_option(data,compact)
+    try:
+        start = time.time()
+        instance = model.create_instance(path)
+        build = time.time() - start
+    finally:
+        os.remove(path)
+    return instance,build
+
+
+def legacy(model):
+
+    # copy of the model with the original dense min up/down constraints in
+    # place of the pairwise and compact ones
+    m = model.clone()
+    for name in ['MinimumUp','MinimumDown','MinimumUpWindow','MinimumDownWindow',
+                 'MinUpTriples','MinDownTriples','MinUpPairs','MinDownPairs']:
+        m.del_component(name)
+
+    def MinUp(model,j,i,k):
+        if i > 0 and k > i and k < min(i+value(model.minu[j])-1,value(model.HorizonHours)):
+            return model.on[j,i] - model.on[j,i-1] <= model.on[j,k]
+        else:
+            return Constraint.Skip
+    m.MinimumUp = Constraint(m.Generators,m.HH_periods,m.HH_periods,rule=MinUp)
+
+    def MinDown(model,j,i,k):
+        if i > 0 and k > i and k < min(i+value(model.mind[j])-1,value(model.HorizonHours)):
+            return model.on[j,i-1] - model.on[j,i] <= 1 - model.on[j,k]
+        else:
+            return Constraint.Skip
+    m.MinimumDown = Constraint(m.Generators,m.HH_periods,m.HH_periods,rule=MinDown)
+
+    return m
+
+
+def size(instance,names):
+
+    # rows and nonzeros, total and for the min up/down blocks only
+    rows = 0
+    nnz = 0
+    mrows = 0
+    mnnz = 0
+    for c in instance.component_objects(Constraint,active=True):
+        for k in c:
+            n = len(list(identify_variables(c[k].body,include_fixed=False)))
+            rows += 1
+            nnz += n
+            if c.name in names:
+                mrows += 1
+                mnnz += n
+    return rows,nnz,mrows,mnnz
+
+
+def benchmark(system='CA',data='.'):
+
+    if system == 'CA':
+        from CA_dispatch import model
+    else:
+        from PNW_dispatch import model
+
+    names = ['MinimumUp','MinimumDown','MinimumUpWindow','MinimumDownWindow']
+    results = []
+
+    for form,compact,label in [(legacy(model),0,'dense'),(model,0,'pairwise'),(model,1,'compact')]:
+        instance,build = create(form,data,compact)
+        rows,nnz,mrows,mnnz = size(instance,names)
+        results.append((label,build,rows,nnz,mrows,mnnz))
+
+    print('%-10s %10s %10s %12s %12s %12s' % ('form','build (s)','rows','nonzeros','minud rows','minud nnz'))
+    for r in results:
+        print('%-10s %10.2f %10d %12d %12d %12d' % r)
+
+    return results
+
+
+if __name__ == '__main__':
+    system = sys.argv[1] if len(sys.argv) > 1 else 'CA'
+    data = sys.argv[2] if len(sys.argv) > 2 else '.'
+    benchmark(system,data)
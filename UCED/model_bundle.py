@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:53:51 2026
+
+@author: jdkern
+
+Binary model inputs of a UC/ED model year. CA_data_setup/PNW_data_setup put
+every set and parameter that used to go into data.dat/dataLP.dat into
+model.npz, described by a small manifest (model.json). The concrete model is
+populated straight from the arrays, without writing or parsing AMPL text.
+
+Manifest components are
+    {'name', 'kind': 'set', 'key'}                 members in arrays[key]
+    {'name', 'kind': 'scalar', 'value'}
+    {'name', 'kind': 'param', 'key', 'index'}      values in arrays[key]
+where each entry of 'index' is either the name of a label array
+(arrays['index_<name>']) or an integer, for 1-based (or 0-based) periods.
+Components marked 'uc_only' (batteries) are left out of dataLP.dat.
+
+export_dat writes the old .dat files from a bundle, for debugging only.
+"""
+
+import os
+import json
+import itertools
+import numpy as np
+
+
+############################################################################
+# writing
+
+def new(fleet=''):
+
+    return {'fleet': fleet,'components': [],'arrays': {}}
+
+
+def add_index(b,name,labels):
+
+    b['arrays']['index_' + name] = np.array([str(x) for x in labels])
+    return None
+
+
+def add_set(b,name,members,uc_only=False):
+
+    b['arrays']['set_' + name] = np.array([str(x) for x in members])
+    b['components'].append({'name': name,'kind': 'set','key': 'set_' + name,'uc_only': uc_only})
+    return None
+
+
+def add_scalar(b,name,value):
+
+    b['components'].append({'name': name,'kind': 'scalar','value': value,'uc_only': False})
+    return None
+
+
+def add_param(b,name,values,index,uc_only=False):
+
+    # values laid out along the axes in 'index'; text columns are kept as text
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = values.astype(str)
+    b['arrays'][name] = values
+    b['components'].append({'name': name,'kind': 'param','key': name,'index': list(index),'uc_only': uc_only})
+    return None
+
+
+def save(path,b,name='model'):
+
+    np.savez_compressed(os.path.join(path,name + '.npz'),**b['arrays'])
+    with open(os.path.join(path,name + '.json'),'w') as f:
+        json.dump({'fleet': b['fleet'],'components': b['components']},f,indent=1)
+
+    return None
+
+
+############################################################################
+# reading
+
+def exists(path='.',name='model'):
+
+    return os.path.exists(os.path.join(path,name + '.json'))
+
+
+def load(path='.',name='model'):
+
+    with open(os.path.join(path,name + '.json')) as f:
+        manifest = json.load(f)
+    with np.load(os.path.join(path,name + '.npz')) as data:
+        arrays = dict((k,data[k]) for k in data.files)
+
+    return manifest,arrays
+
+
+def axis(arrays,index,n):
+
+    # keys along one axis of a parameter
+    if isinstance(index,int):
+        return list(range(index,index+n))
+    return arrays['index_' + index].tolist()
+
+
+def entries(arrays,c):
+
+    # {key: value} of an indexed parameter, keys as Pyomo expects them
+    values = arrays[c['key']]
+    axes = [axis(arrays,i,n) for i,n in zip(c['index'],values.shape)]
+    keys = axes[0] if len(axes) == 1 else itertools.product(*axes)
+    return dict(zip(keys,values.ravel().tolist()))
+
+
+def pyomo_data(manifest,arrays,model=None):
+
+    # data dictionary for model.create_instance; components the model does not
+    # have (e.g. batteries in the LP model) are skipped
+    data = {}
+    for c in manifest['components']:
+        if model is not None and model.component(c['name']) is None:
+            continue
+        if c['kind'] == 'set':
+            data[c['name']] = {None: arrays[c['key']].tolist()}
+        elif c['kind'] == 'scalar':
+            data[c['name']] = {None: c['value']}
+        else:
+            data[c['name']] = entries(arrays,c)
+
+    return {None: data}
+
+
+def create_instance(model,path='.',name='model'):
+
+    manifest,arrays = load(path,name)
+    return model.create_instance(data=pyomo_data(manifest,arrays,model))
+
+
+def instances(m1,m2,path='.'):
+
+    # UC and LP instances of a model year directory, from the bundle or, for
+    # directories written before it existed, from data.dat/dataLP.dat
+    if exists(path):
+        manifest,arrays = load(path)
+        return (m1.create_instance(data=pyomo_data(manifest,arrays,m1)),
+                m2.create_instance(data=pyomo_data(manifest,arrays,m2)))
+
+    return (m1.create_instance(os.path.join(path,'data.dat')),
+            m2.create_instance(os.path.join(path,'dataLP.dat')))
+
+
+def series(path='.',name='model'):
+
+    # fleet key and the full simulation period (Sim*) time series as arrays
+    # (zone x hour, zone x day, hour or day)
+    manifest,arrays = load(path,name)
+    sim = dict((c['name'],arrays[c['key']]) for c in manifest['components']
+               if c['kind'] == 'param' and c['name'].startswith('Sim'))
+
+    return manifest['fleet'],sim
+
+
+############################################################################
+# debugging
+
+def export_dat(path='.',name='model'):
+
+    # data.dat and dataLP.dat equivalent to the bundle
+    manifest,arrays = load(path,name)
+    for filename,uc in [('data.dat',True),('dataLP.dat',False)]:
+        with open(os.path.join(path,filename),'w') as f:
+            for c in manifest['components']:
+                if c['uc_only'] and not uc:
+                    continue
+                if c['kind'] == 'set':
+                    f.write('set %s :=\n%s ;\n\n' % (c['name'],' '.join(arrays[c['key']].tolist())))
+                elif c['kind'] == 'scalar':
+                    f.write('param %s := %s;\n\n' % (c['name'],c['value']))
+                else:
+                    f.write('param %s :=\n' % c['name'])
+                    for k,v in entries(arrays,c).items():
+                        k = k if isinstance(k,tuple) else (k,)
+                        f.write('\t'.join([str(x) for x in k]) + '\t' + str(v) + '\n')
+                    f.write(';\n\n')
+
+    return None
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:42:01 2026
+
+@author: jdkern
+
+Runs UC/ED model years side by side on one machine, as an alternative to the
+SLURM job arrays. Each (system, scenario, year) job simulates the model year
+directory written by CA_data_setup/PNW_data_setup (LR/<scenario>/CA<year> or
+LR/<scenario>/PNW<year>) in its own worker process, and the result tables of
+all finished jobs are gathered into one HDF5 store.
+
+e.g. a pathway on a 64 core node, 16 workers x 4 solver threads
+
+    python parallel_simulation.py <scenario> 0 49 16 4
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import h5py
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import run_job as run_job_module
+
+# result tables written by the wrappers in each model year directory
+results = {'CA': ['mwh_1','mwh_2','mwh_3','on','switch','srsv','nrsv','solar_out',
+                  'wind_out','flow','battery_charge','battery_discharge','battery_state',
+                  'shadow_price','obj_function','wind_curtailment_daily','solar_curtailment_daily'],
+           'PNW': ['mwh_1','mwh_2','mwh_3','on','switch','srsv','nrsv','solar_out',
+                   'wind_out','battery_charge','battery_discharge','battery_state',
+                   'shadow_price','obj_function','wind_curtailment_daily','solar_curtailment_daily']}
+
+UCED = os.path.dirname(os.path.abspath(__file__))
+
+
+def job_path(system,scenario,year):
+
+    return os.path.join(UCED,'LR',str(scenario),system + str(year))
+
+
+def run_job(system,scenario,year,days,solver,threads,persistent=False):
+
+    # one model year, run inside its own directory
+    start = time.time()
+    run_job_module.run(job_path(system,scenario,year),days,solver=solver,threads=threads,emissions=False,persistent=persistent)
+
+    return system,scenario,year,time.time() - start
+
+
+def collect(f,system,scenario,year):
+
+    # copy the result tables of one job into the store, one dataset per
+    # column under /<system>/<scenario>/<year>/<table>
+    path = job_path(system,scenario,year)
+    group = f.require_group('%s/%s/%s' % (system,scenario,year))
+
+    for name in results[system]:
+        filename = os.path.join(path,name + '.csv')
+        if not os.path.exists(filename):
+            continue
+        df = pd.read_csv(filename,header=0,index_col=0)
+        if name in group:
+            del group[name]
+        g = group.create_group(name)
+        for c in df.columns:
+            if df[c].dtype == object:
+                g.create_dataset(str(c),data=np.array(df[c].astype(str).values,dtype='S'),compression='gzip')
+            else:
+                g.create_dataset(str(c),data=df[c].values,compression='gzip')
+
+    return None
+
+
+def run(jobs,days=365,workers=None,threads=1,solver='gurobi',store=None,persistent=False):
+
+    # jobs = [(system, scenario, year), ...] with system 'CA' or 'PNW'; by
+    # default the node is filled with workers x threads = number of cores
+    if workers is None:
+        workers = max(1,int(os.cpu_count()/threads))
+    if store is None:
+        store = os.path.join(UCED,'LR','results.hdf5')
+
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job,system,scenario,year,days,solver,threads,persistent): (system,scenario,year) for system,scenario,year in jobs}
+
+        # results are gathered by the parent only, so the store has one writer
+        with h5py.File(store,'a') as f:
+            for future in as_completed(futures):
+                system,scenario,year = futures[future]
+                try:
+                    seconds = future.result()[3]
+                except Exception as e:
+                    print('%s %s %s failed: %s' % (system,scenario,year,e))
+                    failed.append(futures[future])
+                    continue
+                collect(f,system,scenario,year)
+                f.flush()
+                print('%s %s %s done in %.0f s' % (system,scenario,year,seconds))
+
+    return failed
+
+
+if __name__ == '__main__':
+    scenario = sys.argv[1]
+    first = int(sys.argv[2])
+    last = int(sys.argv[3])
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+    threads = int(sys.argv[5]) if len(sys.argv) > 5 else 1
+
+    jobs = [(system,scenario,year) for year in range(first,last+1) for system in ['CA','PNW']]
+    run(jobs,workers=workers,threads=threads)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:46:18 2026
+
+@author: jdkern
+
+Zonal wholesale prices from UC/ED dispatch results. The price of a zone in a
+given hour is the highest marginal cost ($/MWh) of any generator segment in
+that zone that is dispatched (> 0 MWh) in that hour, or 0 if none is.
+
+Prices are computed with array reductions over all hours at once, either from
+the columnar results (results.hdf5) or, for older runs, from the long-format
+mwh_1/2/3.csv tables.
+
+Price tables are written under a temporary name and moved into place, and
+prices_done.json (row counts of the tables) is written last, so that
+price_merge.py never picks up a half-written year.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import h5py
+import json
+
+# written after the price tables of a model year are complete
+done_file = 'prices_done.json'
+
+
+def hourly_from_store(filename,zones):
+
+    # (hours x zones) prices from results.hdf5
+    with h5py.File(filename,'r') as f:
+        m = f['meta']
+        T = int(m.attrs['hours'])
+        D = int(T/24)
+        mwh_zone = [x.decode() for x in m['mwh_zone'][:]]
+        fixed = m['fixed_cost'][:]
+        coef = m['gas_coef'][:]
+        gas = f['gas_price'][:,:D][m['gas_zone'][:]]
+
+        # zone of each reported generator (-1 = not part of any zone)
+        rows = np.array([zones.index(z) if z in zones else -1 for z in mwh_zone])
+
+        prices = np.full((T,len(zones)),-np.inf)
+        for s in range(3):
+            mwh = f['mwh_%d' % (s+1)][:,:T]
+            cost = np.repeat(fixed[:,s,None] + coef[:,s,None]*gas,24,axis=1)
+            cost = np.where(mwh > 0,cost,-np.inf)
+            for k in range(len(zones)):
+                if (rows == k).any():
+                    prices[:,k] = np.maximum(prices[:,k],cost[rows == k].max(axis=0))
+
+    prices[np.isinf(prices)] = 0
+    return prices
+
+
+def hourly_from_csv(path,zones):
+
+    # (hours x zones) prices from mwh_1/2/3.csv; all three tables share the
+    # row layout of mwh_1.csv
+    frames = [pd.read_csv(os.path.join(path,'mwh_%d.csv' % (s+1)),header=0) for s in range(3)]
+    last_hour = int(frames[0]['Time'].iloc[-1])
+    zone = frames[0]['Zones'].values
+
+    df = pd.concat([pd.DataFrame({'Zones': zone,'Time': f['Time'].values,'Value': f['Value'].values,'cost': f['$/MWh'].values}) for f in frames])
+    df = df.loc[df['Value'] > 0]
+    prices = df.groupby(['Time','Zones'])['cost'].max().unstack()
+    prices = prices.reindex(index=range(1,last_hour+1),columns=zones).fillna(0)
+
+    return prices.values
+
+
+def daily(hourly):
+
+    # daily average of (hours x zones) prices
+    D = int(len(hourly)/24)
+    return hourly[:D*24].reshape(D,24,-1).mean(axis=1)
+
+
+def prices(path,zones):
+
+    # hourly and daily zonal prices (DataFrames) of one model year directory
+    store = os.path.join(path,'results.hdf5')
+    if os.path.exists(store):
+        hourly = hourly_from_store(store,zones)
+    else:
+        hourly = hourly_from_csv(path,zones)
+
+    return pd.DataFrame(hourly,columns=zones),pd.DataFrame(daily(hourly),columns=zones)
+
+
+def write(df,filename):
+
+    # csv or xlsx table, moved into place once complete
+    root,ext = os.path.splitext(filename)
+    tmp = root + '.tmp' + ext
+    if ext == '.csv':
+        df.to_csv(tmp)
+    else:
+        df.to_excel(tmp)
+    os.replace(tmp,filename)
+
+    return None
+
+
+def mark_done(path,hourly,daily):
+
+    # row counts of the finished price tables of a model year
+    tmp = os.path.join(path,done_file + '.tmp')
+    with open(tmp,'w') as f:
+        json.dump({'hourly': len(hourly),'daily': len(daily)},f)
+    os.replace(tmp,os.path.join(path,done_file))
+
+    return None
+
+
+def years(paths,zones):
+
+    # hourly and daily prices of several model years, keyed by directory
+    return dict((p,prices(p,zones)) for p in paths)
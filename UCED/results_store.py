@@ -0,0 +1,345 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:44:54 2026
+
+@author: jdkern
+
+Columnar results for the UC/ED wrappers. Instead of growing lists of
+(generator, hour, value, zone, type, cost) tuples, every recorded variable
+gets a preallocated (rows x hours) array that is filled one day at a time
+from prebuilt lists of variables. Generator, zone, type and marginal cost
+information is worked out once and kept as metadata.
+
+The arrays are written to one HDF5 file (results.hdf5); export_csv still
+writes the long-format csv files (mwh_1.csv, on.csv, shadow_price.csv, ...)
+that the price and emission scripts read.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import h5py
+from pyomo.environ import value
+
+############################################################################
+# model layouts
+
+# fuel type -> (fixed $/MWh, $/MWh per unit of segment heat rate, gas price
+# multiplier per unit of segment heat rate); same marginal costs as the
+# tables the wrappers used to write
+fuel_costs = {'Gas': (0,0,1),
+              'Coal': (0,2,0),
+              'Oil': (0,20,0),
+              'Nuclear': (10,0,0),
+              'PSH': (10,0,0),
+              'Slack': (700,0,0),
+              'Hydro': (0,0,0)}
+
+CA_layout = {
+    # (zone, generator set, battery set)
+    'zones': [('PGE_valley','Zone1Generators','Zone1Battery'),
+              ('PGE_bay','Zone2Generators','Zone2Battery'),
+              ('SCE','Zone3Generators','Zone3Battery'),
+              ('SDGE','Zone4Generators','Zone4Battery')],
+    # fuel types reported in each zone, in order of precedence
+    'types': {'PGE_valley': ['Gas','Coal','Oil','PSH','Slack','Hydro'],
+              'PGE_bay': ['Gas','Coal','Oil','PSH','Slack'],
+              'SCE': ['Gas','Coal','Oil','PSH','Slack','Hydro'],
+              'SDGE': ['Gas','Coal','Oil','PSH','Slack']},
+    # (import set, zone, fixed $/MWh, gas price multiplier)
+    'imports': [('WECCImportsSDGE','SDGE',14.5,2.76),
+                ('WECCImportsSCE','SCE',14.5,2.76),
+                ('WECCImportsPGEV','PGE_valley',5,0)],
+    'balance': ['Bal1Constraint','Bal2Constraint','Bal3Constraint','Bal4Constraint'],
+    'flow': True,
+    # column names of the daily curtailment tables
+    'curtailment': ['PGE_Valley','PGE_Bay','SCE','SDGE'],
+}
+
+PNW_layout = {
+    'zones': [('PNW','Zone5Generators','Zone5Battery')],
+    'types': {'PNW': ['Gas','Coal','Oil','Nuclear','PSH','Slack','Hydro']},
+    'imports': [('WECCImports','WECC',0,0)],
+    'balance': ['Bal5Constraint'],
+    'flow': False,
+    'curtailment': None,
+}
+
+generator_vars = ['mwh_1','mwh_2','mwh_3','on','switch','srsv','nrsv']
+battery_vars = ['bat_charge','bat_discharge','bat_SoC']
+zonal_vars = ['solar','wind']
+
+
+############################################################################
+# buffers
+
+def allocate(instance,instance2,days,layout):
+
+    # metadata and empty (rows x hours) arrays for a run of 'days' - 1
+    # simulated days (the wrappers loop over range(1,days))
+    T = max(days-1,0)*24
+    hours = range(1,25)
+    zones = list(instance.zones)
+    generators = list(instance.Generators)
+
+    gen_zone = dict()
+    gen_type = dict()
+    for z,gset,bset in layout['zones']:
+        for j in getattr(instance,gset):
+            gen_zone[j] = z
+            for t in layout['types'][z]:
+                if j in getattr(instance,t):
+                    gen_type[j] = (z,t)
+                    break
+    for iset,z,fixed,gas in layout['imports']:
+        for j in getattr(instance,iset):
+            if j not in gen_zone:
+                gen_type[j] = (z,'imports')
+
+    # marginal cost of each segment = fixed + coef*gas price of the zone
+    fixed = np.zeros((len(generators),3))
+    coef = np.zeros((len(generators),3))
+    gas_zone = np.zeros(len(generators),dtype=int)
+    imports = dict((z,(f,g)) for iset,z,f,g in layout['imports'])
+    for n,j in enumerate(generators):
+        if j not in gen_type:
+            continue
+        z,t = gen_type[j]
+        gas_zone[n] = zones.index(z) if z in zones else 0
+        for s in range(3):
+            if t == 'imports':
+                fixed[n,s],coef[n,s] = imports[z]
+            else:
+                seg = value(getattr(instance,'seg%d' % (s+1))[j])
+                a,b,c = fuel_costs[t]
+                fixed[n,s] = a + b*seg
+                coef[n,s] = c*seg
+
+    batteries = []
+    battery_zone = []
+    for z,gset,bset in layout['zones']:
+        for j in getattr(instance,bset):
+            batteries.append(j)
+            battery_zone.append(z)
+
+    meta = {'generators': generators,
+            'generator_zone': [gen_zone.get(j,'') for j in generators],
+            'mwh_zone': [gen_type[j][0] if j in gen_type else '' for j in generators],
+            'type': [gen_type[j][1] if j in gen_type else '' for j in generators],
+            'fixed_cost': fixed,
+            'gas_coef': coef,
+            'gas_zone': gas_zone,
+            'batteries': batteries,
+            'battery_zone': battery_zone,
+            'zones': zones,
+            'balance': layout['balance'],
+            'curtailment': layout['curtailment'],
+            'hours': 0}
+
+    buffers = {}
+    data = {}
+    for name in generator_vars:
+        var = getattr(instance,name)
+        buffers[name] = np.zeros((len(generators),T))
+        data[name] = [var[j,t] for j in generators for t in hours]
+    for name in battery_vars:
+        var = getattr(instance,name)
+        buffers[name] = np.zeros((len(batteries),T))
+        data[name] = [var[j,t] for j in batteries for t in hours]
+    for name in zonal_vars:
+        var = getattr(instance,name)
+        buffers[name] = np.zeros((len(zones),T))
+        data[name] = [var[z,t] for z in zones for t in hours]
+    if layout['flow']:
+        pairs = [(s,k) for s in instance.sources for k in instance.sinks]
+        meta['flow'] = pairs
+        buffers['flow'] = np.zeros((len(pairs),T))
+        data['flow'] = [instance.flow[s,k,t] for s,k in pairs for t in hours]
+
+    # LP side: curtailment (available - dispatched) and zonal prices
+    buffers['wind_curtailment'] = np.zeros((len(zones),T))
+    buffers['solar_curtailment'] = np.zeros((len(zones),T))
+    data['wind_available'] = [instance2.HorizonWind[z,t] for z in zones for t in hours]
+    data['solar_available'] = [instance2.HorizonSolar[z,t] for z in zones for t in hours]
+    data['wind_lp'] = [instance2.wind[z,t] for z in zones for t in hours]
+    data['solar_lp'] = [instance2.solar[z,t] for z in zones for t in hours]
+    buffers['duals'] = np.zeros((len(layout['balance']),T))
+    data['duals'] = [getattr(instance2,c)[t] for c in layout['balance'] for t in hours]
+
+    buffers['gas_price'] = np.zeros((len(zones),max(days-1,0)))
+    buffers['system_cost'] = np.zeros(max(days-1,0))
+
+    return buffers,data,meta
+
+
+def values(data,rows):
+
+    # current values of a list of variables/parameters as a (rows x 24) array
+    return np.array([v.value for v in data],dtype=float).reshape(rows,24)
+
+
+def record(buffers,data,meta,day,instance,instance2,cost):
+
+    # copy the first 24 hours of the day's solution into the buffers
+    h = slice((day-1)*24,day*24)
+    for name in generator_vars + battery_vars + zonal_vars + ['flow']:
+        if name in data:
+            buffers[name][:,h] = values(data[name],buffers[name].shape[0])
+
+    Z = len(meta['zones'])
+    buffers['wind_curtailment'][:,h] = values(data['wind_available'],Z) - values(data['wind_lp'],Z)
+    buffers['solar_curtailment'][:,h] = values(data['solar_available'],Z) - values(data['solar_lp'],Z)
+
+    # missing duals are reported as -999, as before
+    duals = [instance2.dual.get(c,-999) for c in data['duals']]
+    buffers['duals'][:,h] = np.array(duals,dtype=float).reshape(-1,24)
+
+    buffers['gas_price'][:,day-1] = [instance.GasPrice[z].value for z in meta['zones']]
+    buffers['system_cost'][day-1] = cost
+    meta['hours'] = day*24
+
+    return None
+
+
+############################################################################
+# output
+
+def write_hdf5(filename,buffers,meta,chunk=24*31):
+
+    # one dataset per variable (rows x hours), written a month at a time;
+    # names, zones and cost coefficients are stored once
+    T = meta['hours']
+    with h5py.File(filename,'w') as f:
+        m = f.create_group('meta')
+        for k in ['generators','generator_zone','mwh_zone','type','batteries','battery_zone','zones','balance']:
+            m.create_dataset(k,data=np.array([str(x) for x in meta[k]],dtype='S'))
+        for k in ['fixed_cost','gas_coef','gas_zone']:
+            m.create_dataset(k,data=meta[k])
+        if 'flow' in meta:
+            m.create_dataset('flow',data=np.array([[str(s),str(k)] for s,k in meta['flow']],dtype='S'))
+        m.attrs['hours'] = T
+
+        for name,b in buffers.items():
+            if b.ndim == 1 or name == 'gas_price':
+                f.create_dataset(name,data=b[...,:int(T/24)])
+                continue
+            if b.shape[0] == 0 or T == 0:
+                f.create_dataset(name,shape=(b.shape[0],T))
+                continue
+            d = f.create_dataset(name,shape=(b.shape[0],T),dtype='float',
+                                 chunks=(b.shape[0],min(chunk,max(T,1))),compression='gzip')
+            for start in range(0,T,chunk):
+                d[:,start:start+chunk] = b[:,start:min(start+chunk,T)]
+
+    return None
+
+
+def long_format(buffer,names,zones,T):
+
+    # (rows x hours) -> legacy row order: day, then row, then hour of the day
+    D = int(T/24)
+    n = len(names)
+    v = buffer[:,:T].reshape(n,D,24).transpose(1,0,2).ravel()
+    time = np.broadcast_to(np.arange(1,T+1).reshape(D,1,24),(D,n,24)).ravel()
+    name = np.broadcast_to(np.array(names,dtype=object).reshape(1,n,1),(D,n,24)).ravel()
+    frame = {'name': name,'Time': time,'Value': v}
+    if zones is not None:
+        frame['Zones'] = np.broadcast_to(np.array(zones,dtype=object).reshape(1,n,1),(D,n,24)).ravel()
+    return frame
+
+
+def export_csv(buffers,meta):
+
+    # legacy csv tables, same columns and row order as the old tuple lists
+    T = meta['hours']
+    D = int(T/24)
+    gens = np.array(meta['generators'],dtype=object)
+
+    # generation by segment, with marginal costs
+    keep = np.array([t != '' for t in meta['type']])
+    cost = meta['fixed_cost'][:,:,None] + meta['gas_coef'][:,:,None]*buffers['gas_price'][meta['gas_zone'],None,:D]
+    for s in range(3):
+        name = 'mwh_%d' % (s+1)
+        f = long_format(buffers[name][keep],gens[keep],np.array(meta['mwh_zone'],dtype=object)[keep],T)
+        n = int(keep.sum())
+        types = np.broadcast_to(np.array(meta['type'],dtype=object)[keep].reshape(1,n,1),(D,n,24)).ravel()
+        mc = np.repeat(cost[keep,s,:].T[:,:,None],24,axis=2).ravel()
+        df = pd.DataFrame({'Generator': f['name'],'Time': f['Time'],'Value': f['Value'],
+                           'Zones': f['Zones'],'Type': types,'$/MWh': mc},
+                          columns=('Generator','Time','Value','Zones','Type','$/MWh'))
+        df.to_csv(name + '.csv')
+
+    # commitment and reserves, generators in a zone only
+    keep = np.array([z != '' for z in meta['generator_zone']])
+    for name in ['on','switch','srsv','nrsv']:
+        f = long_format(buffers[name][keep],gens[keep],np.array(meta['generator_zone'],dtype=object)[keep],T)
+        df = pd.DataFrame({'Generator': f['name'],'Time': f['Time'],'Value': f['Value'],'Zones': f['Zones']},
+                          columns=('Generator','Time','Value','Zones'))
+        df.to_csv(name + '.csv')
+
+    for name,filename in [('bat_charge','battery_charge'),('bat_discharge','battery_discharge'),('bat_SoC','battery_state')]:
+        f = long_format(buffers[name],meta['batteries'],meta['battery_zone'],T)
+        df = pd.DataFrame({'Generator': f['name'],'Time': f['Time'],'Value': f['Value'],'Zones': f['Zones']},
+                          columns=('Generator','Time','Value','Zones'))
+        df.to_csv(filename + '.csv')
+
+    for name,filename in [('solar','solar_out'),('wind','wind_out')]:
+        f = long_format(buffers[name],meta['zones'],None,T)
+        df = pd.DataFrame({'Zone': f['name'],'Time': f['Time'],'Value': f['Value']},columns=('Zone','Time','Value'))
+        df.to_csv(filename + '.csv')
+
+    if 'flow' in meta:
+        pairs = meta['flow']
+        f = long_format(buffers['flow'],list(range(len(pairs))),None,T)
+        source = np.array([s for s,k in pairs],dtype=object)[f['name'].astype(int)]
+        sink = np.array([k for s,k in pairs],dtype=object)[f['name'].astype(int)]
+        df = pd.DataFrame({'Source': source,'Sink': sink,'Time': f['Time'],'Value': f['Value']},
+                          columns=('Source','Sink','Time','Value'))
+        df.to_csv('flow.csv')
+
+    f = long_format(buffers['duals'],meta['balance'],None,T)
+    df = pd.DataFrame({'Constraint': f['name'],'Time': f['Time'],'Value': f['Value']},columns=('Constraint','Time','Value'))
+    df.to_csv('shadow_price.csv')
+
+    pd.DataFrame(buffers['system_cost'][:D]).to_csv('obj_function.csv')
+
+    # daily curtailment, over a full 365 day year as before
+    for name in ['wind','solar']:
+        daily = np.zeros((len(meta['zones']),365))
+        daily[:,:D] = buffers[name + '_curtailment'][:,:T].reshape(-1,D,24).sum(axis=2)
+        if meta['curtailment'] is None:
+            df = pd.DataFrame(daily[0])
+        else:
+            df = pd.DataFrame(daily.T,columns=meta['curtailment'])
+        df.to_csv(name + '_curtailment_daily.csv')
+
+    return None
+
+
+############################################################################
+# checkpoints
+
+def save_checkpoint(filename,buffers,meta,day,state):
+
+    # buffers, carried-over state and the last finished day; written to a
+    # temporary file first so a crash mid-write keeps the previous checkpoint
+    tmp = filename + '.tmp'
+    with open(tmp,'wb') as f:
+        np.savez(f,checkpoint_day=day,checkpoint_hours=meta['hours'],checkpoint_state=state,**buffers)
+    os.replace(tmp,filename)
+
+    return None
+
+
+def load_checkpoint(filename,buffers,meta):
+
+    # refill the buffers from a checkpoint; returns the last finished day and
+    # the carried-over state
+    data = np.load(filename)
+    for k in buffers:
+        if data[k].shape != buffers[k].shape:
+            raise ValueError('%s does not match this run (%s has shape %s, expected %s)' % (filename,k,data[k].shape,buffers[k].shape))
+        buffers[k][...] = data[k]
+    meta['hours'] = int(data['checkpoint_hours'])
+
+    return int(data['checkpoint_day']),data['checkpoint_state']
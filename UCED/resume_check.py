@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:05:24 2026
+
+@author: jdkern
+
+Checks that a resumed CA run reproduces the uninterrupted one. The model
+year is simulated once with a checkpoint on day 'stop', then again from that
+checkpoint (resume = True), and every dataset of the two results.hdf5 files
+(prices, dispatch, costs, ...) is compared. Run from the UCED folder, e.g.
+
+    python resume_check.py LR/<scenario>/CA2020 60 40
+    python resume_check.py LR/<scenario>/CA2020 60 40 persistent
+"""
+
+import sys
+import os
+import shutil
+import numpy as np
+import h5py
+
+
+def results(filename):
+
+    # every dataset of a results file except the meta group
+    out = {}
+    with h5py.File(filename,'r') as f:
+        for name in f:
+            if name != 'meta':
+                out[name] = f[name][...]
+    return out
+
+
+def compare(a,b,rtol=1e-6,atol=1e-4):
+
+    # (dataset, largest absolute difference) of the datasets that differ
+    a,b = results(a),results(b)
+    diffs = []
+    for name in sorted(set(a) | set(b)):
+        if name not in a or name not in b or a[name].shape != b[name].shape:
+            diffs.append((name,np.inf))
+        elif not np.allclose(a[name],b[name],rtol=rtol,atol=atol):
+            diffs.append((name,float(np.max(np.abs(a[name]-b[name])))))
+    return diffs
+
+
+def check(path,days,stop,solver='gurobi',persistent=False):
+
+    # the full run leaves its checkpoint of day 'stop' behind as long as no
+    # later day is a multiple of it
+    if stop < 1 or 2*stop < days:
+        raise ValueError('stop must be at least half of days (%d), got %d' % (days,stop))
+    import CA_wrapper
+
+    home = os.getcwd()
+    os.chdir(path)
+    try:
+        if os.path.exists('checkpoint.npz'):
+            os.remove('checkpoint.npz')
+        CA_wrapper.sim(days,solver=solver,persistent=persistent,checkpoint=stop)
+        shutil.copyfile('results.hdf5','results_uninterrupted.hdf5')
+        CA_wrapper.sim(days,solver=solver,persistent=persistent,resume=True,checkpoint=0)
+        diffs = compare('results_uninterrupted.hdf5','results.hdf5')
+    finally:
+        os.chdir(home)
+
+    for name,d in diffs:
+        print('%s differs (max abs difference %g)' % (name,d))
+    if not diffs:
+        print('resumed run matches the uninterrupted run')
+
+    return diffs
+
+
+if __name__ == '__main__':
+    persistent = len(sys.argv) > 4 and sys.argv[4] == 'persistent'
+    diffs = check(sys.argv[1],int(sys.argv[2]),int(sys.argv[3]),persistent=persistent)
+    sys.exit(1 if diffs else 0)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:56:17 2026
+
+@author: jdkern
+
+Runs a UC/ED job from its manifest. A job directory (LR/<scenario>/CA<year>
+or PNW<year>) only holds the model inputs of its year (model.npz/model.json)
+and a small job.json written by CA_data_setup/PNW_data_setup; the model code
+and the static tables are taken from this folder, so they exist once instead
+of once per job. Results are written into the job directory as before.
+
+    python run_job.py LR/<scenario>/CA2020
+    python run_job.py LR/<scenario>/PNW2020 365
+"""
+
+import os
+import sys
+import json
+import instrument
+
+manifest_file = 'job.json'
+# timing/memory/io of the last run of a job (see instrument.py)
+report_file = 'run_report.json'
+
+
+def write(path,system,scenario,year,days=365):
+
+    # manifest of a job directory
+    job = {'system': system,'scenario': str(scenario),'year': int(year),'days': int(days),'inputs': 'model'}
+    with open(os.path.join(path,manifest_file),'w') as f:
+        json.dump(job,f,indent=1)
+
+    return job
+
+
+def read(path):
+
+    # directories written before job manifests existed are recognised by
+    # their name (CA<year>/PNW<year>)
+    if not os.path.exists(os.path.join(path,manifest_file)):
+        name = os.path.basename(os.path.normpath(path))
+        return {'system': 'PNW' if name.startswith('PNW') else 'CA','days': 365}
+    with open(os.path.join(path,manifest_file)) as f:
+        return json.load(f)
+
+
+def run(path,days=None,solver='gurobi',threads=None,resume=False,emissions=True,persistent=False):
+
+    # simulate one job and, unless emissions = False, compute its emissions;
+    # persistent is passed on to CA_wrapper.sim (False = solve from scratch)
+    job = read(path)
+    if days is None:
+        days = job['days']
+
+    home = os.getcwd()
+    os.chdir(path)
+    instrument.reset()
+    try:
+        if job['system'] == 'CA':
+            import CA_wrapper
+            import CA_emission_calculation
+            CA_wrapper.sim(days,solver=solver,threads=threads,resume=resume,persistent=persistent)
+            if emissions:
+                with instrument.stage('emissions'):
+                    CA_emission_calculation.calculate()
+        else:
+            import PNW_wrapper
+            import PNW_emission_calculation
+            PNW_wrapper.sim(days,solver=solver,threads=threads,resume=resume)
+            if emissions:
+                with instrument.stage('emissions'):
+                    PNW_emission_calculation.calculate()
+    finally:
+        instrument.report(report_file,extra=job)
+        os.chdir(home)
+
+    return job
+
+
+if __name__ == '__main__':
+    path = sys.argv[1]
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    run(path,days)
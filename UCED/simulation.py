@@ -30,10 +30,13 @@ PNW_wrapper.sim(days)
 #                    WHOLESALE ELECTRICITY PRICES
 # 
 import CA_price_calculation
-import emission_calculation
+CA_price_calculation.calculate()
+import CA_emission_calculation
+CA_emission_calculation.calculate()
 
 # Prices in California need to be translated to a CAISO average price from 
 # prices at the four zones. This is done using a regression among historical
 # zonal prices.
 
-import PNW_price_calculation
\ No newline at end of file
+import PNW_price_calculation
+PNW_price_calculation.calculate()
\ No newline at end of file